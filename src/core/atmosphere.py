@@ -3,12 +3,33 @@ Enhanced Atmospheric Model with NRLMSISE-00 Integration
 Task 2-6: High-fidelity atmospheric density model for improved drag calculations
 """
 
+import math
 import numpy as np
 import logging
 from typing import Tuple, Optional
 from datetime import datetime
 import json
 
+# ISA constants
+ISA_GRAVITY = 9.80665             # m/s²
+ISA_GAS_CONSTANT = 287.0          # J/(kg·K) - specific gas constant for air
+ISA_SEA_LEVEL_TEMPERATURE = 288.15  # K
+ISA_SEA_LEVEL_PRESSURE = 101325   # Pa
+
+# Per-layer terms folded once at import (scalar math.exp, no per-call recomputation)
+_TROPOSPHERE_EXPONENT = ISA_GRAVITY / (ISA_GAS_CONSTANT * 0.0065)
+_UPPER_STRATOSPHERE_EXPONENT = ISA_GRAVITY / (ISA_GAS_CONSTANT * 0.001)
+_STRATOSPHERE_EXPONENT = ISA_GRAVITY / (ISA_GAS_CONSTANT * 0.0028)
+_MESOSPHERE_EXPONENT = ISA_GRAVITY / (ISA_GAS_CONSTANT * -0.0028)
+_UPPER_MESOSPHERE_EXPONENT = ISA_GRAVITY / (ISA_GAS_CONSTANT * -0.002)
+_RT_216 = ISA_GAS_CONSTANT * 216.65
+_RT_270 = ISA_GAS_CONSTANT * 270.65
+_TEMPERATURE_32KM = 216.65 + 0.001 * (32000 - 20000)
+_TEMPERATURE_71KM = 270.65 - 0.0028 * (71000 - 51000)
+_PRESSURE_11KM = ISA_SEA_LEVEL_PRESSURE * ((ISA_SEA_LEVEL_TEMPERATURE - 0.0065 * 11000)
+                                           / ISA_SEA_LEVEL_TEMPERATURE) ** _TROPOSPHERE_EXPONENT
+_PRESSURE_20KM = _PRESSURE_11KM * math.exp(-ISA_GRAVITY * (20000 - 11000) / _RT_216)
+
 
 class AtmosphereModel:
     """
@@ -63,7 +84,7 @@ class AtmosphereModel:
         """
         if altitude < 0:
             # Below sea level - extrapolate sea level density
-            return self._get_sea_level_density() * np.exp(altitude / 8500)
+            return self._get_sea_level_density() * math.exp(altitude / 8500)
         
         if altitude > 1000e3:  # Above 1000 km
             return 1e-15  # Essentially vacuum
@@ -109,118 +130,75 @@ class AtmosphereModel:
         Enhanced International Standard Atmosphere (ISA) model
         Provides more accurate density profile than simple exponential
         """
-        # Sea level conditions
-        rho_0 = 1.225     # kg/m³
-        T_0 = 288.15      # K
-        p_0 = 101325      # Pa
-        g = 9.80665       # m/s²
-        R = 287.0         # J/(kg·K) - specific gas constant for air
+        g, R = ISA_GRAVITY, ISA_GAS_CONSTANT
         
         if altitude <= 11000:  # Troposphere (0-11 km)
             # Linear temperature decrease: T = T₀ - L·h
-            L = 0.0065  # K/m (temperature lapse rate)
-            T = T_0 - L * altitude
+            T = ISA_SEA_LEVEL_TEMPERATURE - 0.0065 * altitude
             
             # Pressure: p = p₀ * (T/T₀)^(g·M₀/(R*L))
-            exponent = g / (R * L)
-            p = p_0 * (T / T_0) ** exponent
+            p = ISA_SEA_LEVEL_PRESSURE * (T / ISA_SEA_LEVEL_TEMPERATURE) ** _TROPOSPHERE_EXPONENT
             
             # Density: ρ = p / (R·T)
             return p / (R * T)
         
         elif altitude <= 20000:  # Lower Stratosphere (11-20 km)
             # Isothermal layer: T = constant = 216.65 K
-            T = 216.65  # K
-            h_11 = 11000  # m
-            
-            # Pressure at 11 km
-            T_11 = T_0 - 0.0065 * h_11
-            p_11 = p_0 * (T_11 / T_0) ** (g / (R * 0.0065))
-            
             # Exponential decrease: p = p₁₁ * exp(-g·(h-h₁₁)/(R·T))
-            p = p_11 * np.exp(-g * (altitude - h_11) / (R * T))
+            p = _PRESSURE_11KM * math.exp(-g * (altitude - 11000) / _RT_216)
             
-            return p / (R * T)
+            return p / _RT_216
         
         elif altitude <= 32000:  # Upper Stratosphere (20-32 km)
             # Temperature increases linearly: L = +0.001 K/m
-            L = 0.001  # K/m
-            h_20 = 20000  # m
-            T_20 = 216.65  # K
-            
-            # Temperature at current altitude
-            T = T_20 + L * (altitude - h_20)
-            
-            # Pressure at 20 km (from isothermal calculation)
-            T_11 = 288.15 - 0.0065 * 11000
-            p_11 = p_0 * (T_11 / 288.15) ** (g / (R * 0.0065))
-            p_20 = p_11 * np.exp(-g * (20000 - 11000) / (R * 216.65))
+            T = 216.65 + 0.001 * (altitude - 20000)
             
-            # Pressure with positive lapse rate
-            p = p_20 * (T / T_20) ** (g / (R * L))
+            # Pressure with positive lapse rate (p₂₀ from the isothermal layer)
+            p = _PRESSURE_20KM * (T / 216.65) ** _UPPER_STRATOSPHERE_EXPONENT
             
             return p / (R * T)
         
         elif altitude <= 47000:  # Stratosphere (32-47 km)
             # Temperature increases linearly: L = +0.0028 K/m
-            L = 0.0028  # K/m
-            h_32 = 32000  # m
-            T_32 = 216.65 + 0.001 * (32000 - 20000)  # K
-            
-            T = T_32 + L * (altitude - h_32)
+            T = _TEMPERATURE_32KM + 0.0028 * (altitude - 32000)
             
             # Calculate pressure at 32 km
             p_32 = self._calculate_pressure_at_32km()
-            p = p_32 * (T / T_32) ** (g / (R * L))
+            p = p_32 * (T / _TEMPERATURE_32KM) ** _STRATOSPHERE_EXPONENT
             
             return p / (R * T)
         
         elif altitude <= 51000:  # Mesosphere lower (47-51 km)
-            # Isothermal: T = constant
-            T = 270.65  # K (temperature at 47 km)
-            h_47 = 47000  # m
-            
+            # Isothermal: T = constant = 270.65 K (temperature at 47 km)
             p_47 = self._calculate_pressure_at_47km()
-            p = p_47 * np.exp(-g * (altitude - h_47) / (R * T))
+            p = p_47 * math.exp(-g * (altitude - 47000) / _RT_270)
             
-            return p / (R * T)
+            return p / _RT_270
         
         elif altitude <= 71000:  # Mesosphere (51-71 km)
             # Temperature decreases: L = -0.0028 K/m
-            L = -0.0028  # K/m
-            h_51 = 51000  # m
-            T_51 = 270.65  # K
-            
-            T = T_51 + L * (altitude - h_51)
+            T = 270.65 - 0.0028 * (altitude - 51000)
             
             p_51 = self._calculate_pressure_at_51km()
-            p = p_51 * (T / T_51) ** (g / (R * L))
+            p = p_51 * (T / 270.65) ** _MESOSPHERE_EXPONENT
             
             return p / (R * T)
         
         elif altitude <= 84852:  # Mesosphere upper (71-84.852 km)
             # Temperature decreases: L = -0.002 K/m
-            L = -0.002  # K/m
-            h_71 = 71000  # m
-            T_71 = 270.65 - 0.0028 * (71000 - 51000)
-            
-            T = T_71 + L * (altitude - h_71)
+            T = _TEMPERATURE_71KM - 0.002 * (altitude - 71000)
             
             p_71 = self._calculate_pressure_at_71km()
-            p = p_71 * (T / T_71) ** (g / (R * L))
+            p = p_71 * (T / _TEMPERATURE_71KM) ** _UPPER_MESOSPHERE_EXPONENT
             
             return p / (R * T)
         
         else:  # Above 84.852 km - Thermosphere
-            # Exponential decay with scale height variation
-            h_scale_base = 6000  # m (base scale height)
-            h_ref = 85000  # m (reference altitude)
-            rho_ref = 6e-6  # kg/m³ (reference density at 85 km)
-            
-            # Scale height increases with altitude in thermosphere
-            scale_height = h_scale_base * (1 + (altitude - h_ref) / 100000)
+            # Exponential decay from 6e-6 kg/m³ at 85 km;
+            # scale height increases with altitude (6 km base)
+            scale_height = 6000 * (1 + (altitude - 85000) / 100000)
             
-            return rho_ref * np.exp(-(altitude - h_ref) / scale_height)
+            return 6e-6 * math.exp(-(altitude - 85000) / scale_height)
     
     def _calculate_pressure_at_32km(self) -> float:
         """Calculate pressure at 32 km boundary"""
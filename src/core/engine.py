@@ -17,10 +17,14 @@ class EnginePerformanceModel:
     Uses cubic spline interpolation for smooth performance curves
     """
     
+    MAX_ALTITUDE = 150000  # Performance curves are clamped above this altitude [m]
+    
     def __init__(self, engine_data_path: str = "engine_curve.json"):
         self.logger = logging.getLogger(__name__)
         self.engine_data = self._load_engine_data(engine_data_path)
         self.interpolators = self._build_interpolators()
+        self._vacuum_performance = {}  # Empty while building so the getters evaluate the splines
+        self._vacuum_performance = self._build_vacuum_performance()
         
     def _load_engine_data(self, data_path: str) -> Dict:
         """Load engine performance data from JSON file"""
@@ -134,6 +138,18 @@ class EnginePerformanceModel:
         
         return interpolators
     
+    def _build_vacuum_performance(self) -> Dict[str, Tuple[float, float, float]]:
+        """
+        Full-throttle (thrust, Isp, mass flow) per stage at and above MAX_ALTITUDE
+        Altitude is clamped there, so these are constants: evaluate the splines once
+        """
+        return {
+            stage_name: (self.get_thrust(stage_name, self.MAX_ALTITUDE),
+                         self.get_specific_impulse(stage_name, self.MAX_ALTITUDE),
+                         self.get_mass_flow_rate(stage_name, self.MAX_ALTITUDE))
+            for stage_name in self.interpolators
+        }
+    
     def get_thrust(self, stage_name: str, altitude: float, throttle: float = 1.0) -> float:
         """
         Get thrust for a specific stage at given altitude and throttle setting
@@ -146,12 +162,15 @@ class EnginePerformanceModel:
         Returns:
             Thrust in Newtons
         """
+        if throttle == 1.0 and altitude >= self.MAX_ALTITUDE and stage_name in self._vacuum_performance:
+            return self._vacuum_performance[stage_name][0]
+        
         if stage_name not in self.interpolators:
             self.logger.warning(f"Unknown stage {stage_name}, using fallback")
             return self._get_fallback_thrust(stage_name, altitude) * throttle
         
         # Constrain altitude to reasonable bounds
-        altitude = max(0, min(altitude, 150000))  # 0 to 150 km
+        altitude = max(0, min(altitude, self.MAX_ALTITUDE))  # 0 to 150 km
         
         # Get interpolated thrust
         thrust_interpolator = self.interpolators[stage_name]['thrust']
@@ -176,12 +195,15 @@ class EnginePerformanceModel:
         Returns:
             Specific impulse in seconds
         """
+        if throttle == 1.0 and altitude >= self.MAX_ALTITUDE and stage_name in self._vacuum_performance:
+            return self._vacuum_performance[stage_name][1]
+        
         if stage_name not in self.interpolators:
             self.logger.warning(f"Unknown stage {stage_name}, using fallback")
             return self._get_fallback_isp_variable(stage_name, altitude, throttle)
         
         # Constrain inputs to reasonable bounds
-        altitude = max(0, min(altitude, 150000))  # 0 to 150 km
+        altitude = max(0, min(altitude, self.MAX_ALTITUDE))  # 0 to 150 km
         throttle = max(0.4, min(throttle, 1.0))   # 40% to 100% throttle (Professor v42: extended range)
         
         stage_data = self.interpolators[stage_name]
@@ -332,6 +354,9 @@ class EnginePerformanceModel:
         Returns:
             Mass flow rate in kg/s
         """
+        if throttle == 1.0 and altitude >= self.MAX_ALTITUDE and stage_name in self._vacuum_performance:
+            return self._vacuum_performance[stage_name][2]
+        
         thrust = self.get_thrust(stage_name, altitude, throttle)
         isp = self.get_specific_impulse(stage_name, altitude, throttle)
         
@@ -0,0 +1,110 @@
+"""
+History Buffers - Append-only mission histories backed by NumPy arrays
+Replaces per-step list.append of floats / Vector3 / MissionPhase objects in Mission
+"""
+
+import numpy as np
+from vehicle import Vector3, MissionPhase
+
+
+class HistoryBuffer:
+    """Growable float64 history stored in one contiguous preallocated array"""
+
+    def __init__(self, capacity: int = 4096, width: int = 0, dtype=np.float64):
+        shape = (capacity, width) if width else (capacity,)
+        self._data = np.empty(shape, dtype=dtype)
+        self._size = 0
+
+    def reserve(self, capacity: int):
+        """Grow storage to hold at least `capacity` entries"""
+        if capacity > len(self._data):
+            grown = np.empty((capacity,) + self._data.shape[1:], dtype=self._data.dtype)
+            grown[:self._size] = self._data[:self._size]
+            self._data = grown
+
+    def append(self, value):
+        if self._size == len(self._data):
+            self.reserve(2 * len(self._data))
+        self._data[self._size] = self._encode(value)
+        self._size += 1
+
+    @property
+    def array(self) -> np.ndarray:
+        """View of the recorded entries (no copy)"""
+        return self._data[:self._size]
+
+    def tolist(self) -> list:
+        return self.array.tolist()
+
+    def _encode(self, value):
+        return value
+
+    def _decode(self, item):
+        return float(item)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._decode(item) for item in self.array[index]]
+        return self._decode(self.array[index])
+
+    def __iter__(self):
+        return (self._decode(item) for item in self.array)
+
+
+class VectorHistory(HistoryBuffer):
+    """History of Vector3 states stored as an (N, 3) array"""
+
+    def __init__(self, capacity: int = 4096):
+        super().__init__(capacity, width=3)
+
+    def _encode(self, value: Vector3):
+        return value.data
+
+    def _decode(self, item) -> Vector3:
+        return Vector3.from_array(item.copy())
+
+
+class PhaseHistory(HistoryBuffer):
+    """History of MissionPhase values stored as int8 codes, with running per-phase counts"""
+
+    _PHASES = list(MissionPhase)
+    _CODES = {phase: code for code, phase in enumerate(_PHASES)}
+    _VALUES = np.array([phase.value for phase in _PHASES])
+
+    def __init__(self, capacity: int = 4096):
+        super().__init__(capacity, dtype=np.int8)
+        self._counts = [0] * len(self._PHASES)
+
+    def append(self, value: MissionPhase):
+        super().append(value)
+        self._counts[self._CODES[value]] += 1
+
+    def append_repeated(self, value: MissionPhase, count: int):
+        """Record `value` for `count` consecutive steps"""
+        if count <= 0:
+            return
+        if self._size + count > len(self._data):
+            self.reserve(max(self._size + count, 2 * len(self._data)))
+        self._data[self._size:self._size + count] = self._CODES[value]
+        self._size += count
+        self._counts[self._CODES[value]] += count
+
+    def count(self, phase: MissionPhase) -> int:
+        """Number of recorded steps spent in `phase` (O(1), no history scan)"""
+        return self._counts[self._CODES[phase]]
+
+    def tolist(self, stride: int = 1) -> list:
+        """Phase values; with stride > 1 only every `stride`-th entry plus the last one"""
+        codes = self.array
+        if stride > 1:
+            codes = np.concatenate((codes[:-1:stride], codes[-1:]))
+        return self._VALUES[codes].tolist()
+
+    def _encode(self, value: MissionPhase) -> int:
+        return self._CODES[value]
+
+    def _decode(self, item) -> MissionPhase:
+        return self._PHASES[int(item)]
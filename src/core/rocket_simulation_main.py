@@ -10,7 +10,10 @@ Features:
 - 修正済み：軌道速度計算、重力ターン最適化、フェーズ遷移
 """
 
+import math
 import numpy as np
+from scipy.integrate import solve_ivp
+from scipy.optimize import OptimizeResult
 import json
 import csv
 from dataclasses import dataclass, field
@@ -18,6 +21,7 @@ from typing import List, Tuple, Dict, Optional
 from enum import Enum
 import logging
 import guidance
+from guidance import should_end_circularization_burn
 from config_flags import get_flag, is_enabled  # Professor v17: Feature flag support
 from constants import MAX_Q_OPERATIONAL  # Max-Q operational limit
 from vehicle import Vector3, Rocket, RocketStage, MissionPhase, create_saturn_v_rocket
@@ -28,6 +32,20 @@ from patched_conic_solver import check_soi_transition, convert_to_lunar_frame
 from launch_window_calculator import LaunchWindowCalculator
 from mid_course_correction import MidCourseCorrection
 from leo_state_schema import LEOStateSchema
+from history_buffer import HistoryBuffer, VectorHistory, PhaseHistory
+
+# Optional JIT compilation for the scalar physics kernels
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+if NUMBA_AVAILABLE:
+    _jit = njit(cache=True, fastmath=True)
+else:
+    def _jit(func):
+        return func
 
 # 物理定数
 G = 6.67430e-11  # 万有引力定数 [m^3/kg/s^2]
@@ -37,8 +55,11 @@ M_MOON = 7.34767309e22  # 月質量 [kg]
 R_MOON = 1737e3  # 月半径 [m]
 EARTH_MOON_DIST = 384400e3  # 地球-月平均距離 [m]
 MOON_ORBIT_PERIOD = 27.321661 * 24 * 3600  # 月の公転周期 [s]
+MOON_ANGULAR_RATE = 2 * np.pi / MOON_ORBIT_PERIOD  # 月の公転角速度 [rad/s]
 EARTH_ROTATION_PERIOD = 24 * 3600  # 地球自転周期 [s]
 STANDARD_GRAVITY = 9.80665  # 標準重力加速度 [m/s^2]
+GM_EARTH = G * M_EARTH  # 地球の重力定数 G·M [m^3/s^2]（ホットパスで毎回掛け算しない）
+GM_MOON = G * M_MOON  # 月の重力定数 G·M [m^3/s^2]（MU_MOON は公称値、こちらは M_MOON と整合）
 
 # 追加の月軌道定数
 MU_MOON = 4.904e12  # 月の標準重力パラメータ [m^3/s^2]
@@ -50,6 +71,280 @@ SEA_LEVEL_PRESSURE = 101325  # 海面気圧 [Pa]
 SEA_LEVEL_DENSITY = 1.225  # 海面大気密度 [kg/m^3]
 SCALE_HEIGHT = 8500  # 大気のスケールハイト [m]
 
+# 大気密度テーブル（対数密度を等間隔高度で事前計算）
+DENSITY_TABLE_STEP = 100.0  # 高度刻み [m]
+DENSITY_TABLE_MAX_ALT = 300e3  # テーブル上限高度 [m]
+VACUUM_DENSITY = 1e-15  # 真空とみなす密度 [kg/m^3]
+VACUUM_ALTITUDE = 1000e3  # これより上はどの大気モデルでも VACUUM_DENSITY [m]
+
+# 旧大気モデルの層境界密度（呼び出し毎に再計算しない）
+_LEGACY_DENSITY_100KM = SEA_LEVEL_DENSITY * math.exp(-100e3 / SCALE_HEIGHT)
+_LEGACY_DENSITY_150KM = SEA_LEVEL_DENSITY * math.exp(-100e3 / SCALE_HEIGHT) * math.exp(-50e3 / 10000)
+_LEGACY_STRATOSPHERE_SCALE_HEIGHT = 287.0 * 216.65 / 9.80665  # R·T/g [m]
+
+DRAG_CUTOFF_ALTITUDE = 150e3  # これより上では空気抵抗を無視 [m]（密度 ≲1e-8 kg/m^3）
+# ステージ別の断面積 [m^2]: S-IC, S-II, S-IVB（それ以降は着陸機 LANDER_CROSS_SECTION）
+STAGE_CROSS_SECTIONS = (80.0, 30.0, 18.0)
+LANDER_CROSS_SECTION = 8.0
+
+# 慣性飛行の記号積分（drift/kick 分解）: drift 係数は kick 係数より1つ多い
+SYMPLECTIC_COAST_COEFFICIENTS = {
+    "leapfrog": ((0.5, 0.5), (1.0,)),
+    # SABA2 (Laskar & Robutel 2001): c1 = 1/2 - √3/6, c2 = √3/3, d1 = 1/2
+    "SABA2": ((0.5 - math.sqrt(3) / 6, math.sqrt(3) / 3, 0.5 - math.sqrt(3) / 6), (0.5, 0.5)),
+}
+COAST_STEP_FACTOR = 1e-3  # 記号積分の刻み = 係数 × 局所力学時間 √(r³/GM)（近地点ほど細かく）
+
+LANDING_PHASES = frozenset({MissionPhase.TERMINAL_DESCENT, MissionPhase.LUNAR_TOUCHDOWN})  # 月面接近を許容するフェーズ
+TERMINAL_PHASES = frozenset({MissionPhase.LANDED, MissionPhase.FAILED})  # ミッション終了（以降のステップは不要）
+# 月中心からの距離の二乗での接近判定（毎ステップの判定で平方根を取らない）[m^2]
+LUNAR_TOUCHDOWN_RADIUS_SQ = (R_MOON + 100)**2  # 月面から100m以内
+LUNAR_PROXIMITY_RADIUS_SQ = (R_MOON + 1000)**2  # 月面から1km以内
+LUNAR_PDI_RADIUS_SQ = (R_MOON + 50e3)**2  # 月面から50km以内で動力降下を開始
+
+# 駐機軌道・円化燃焼の判定しきい値（地球中心からの半径 [m]、フェーズ判定の毎ステップで足し算しない）
+STAGE2_TARGET_APOAPSIS_R = R_EARTH + 80e3  # 第2段で上げる遠地点（円化の時間を確保）
+STAGE3_TARGET_APOAPSIS_R = R_EARTH + 45e3  # 第3段での最低遠地点
+MIN_PARKING_PERIAPSIS_R = R_EARTH + 120e3  # 大気圏外とみなす近地点
+CIRCULARIZATION_TARGET_PERIAPSIS_R = R_EARTH + 180e3  # 円化燃焼の目標近地点
+STAGE3_INITIAL_PROPELLANT = 160000.0  # S-IVB の初期推進剤質量 [kg]（燃料残量比の分母）
+
+# ログ出力
+CSV_FLUSH_ROWS = 4096  # CSV行のバッファ上限（log_stride=1でも書き出しは4096ステップに1回）
+CSV_FILE_BUFFER_BYTES = 1 << 20  # ファイル側のバッファ（既定8KiBではwriterows 1回で数十回のwriteになる）
+LOG_COLUMNS = ("time", "altitude", "velocity", "mass", "delta_v", "phase", "stage", "apoapsis", "periapsis",
+               "eccentricity", "flight_path_angle", "pitch_angle", "remaining_propellant", "dynamic_pressure",
+               "max_dynamic_pressure")
+
+
+@_jit
+def _point_mass_gravity(rx: float, ry: float, rz: float, gm: float, radius: float) -> Tuple[float, float, float]:
+    """天体中心からの相対位置 r での重力加速度 (ax, ay, az)（天体内部は表面重力）"""
+    r2 = rx * rx + ry * ry + rz * rz
+    if r2 == 0.0:
+        return 0.0, 0.0, 0.0
+    if r2 <= radius * radius:
+        scale = -(gm / radius**2) / math.sqrt(r2)
+    else:
+        # a = -GM r / |r|³: 1/|r|³ は r2**-1.5 の一回の累乗で（平方根・除算を別々に取らない）
+        scale = -gm * r2**-1.5
+    return rx * scale, ry * scale, rz * scale
+
+
+@_jit
+def _quadratic_drag(vx: float, vy: float, vz: float, density: float, drag_area: float,
+                    inv_mass: float) -> Tuple[float, float, float]:
+    """空気抵抗による加速度 -(½ρ|v|²·CdA/m)·v̂（drag_area = Cd·A、静止時・真空では 0）"""
+    speed = math.sqrt(vx * vx + vy * vy + vz * vz)
+    if speed == 0.0 or density == 0.0:
+        return 0.0, 0.0, 0.0
+    # v̂ = v/|v| の除算を係数にまとめる: -(½ρ|v|²CdA/m)/|v| = -½ρ|v|CdA/m
+    scale = -0.5 * density * speed * drag_area * inv_mass
+    return vx * scale, vy * scale, vz * scale
+
+
+@_jit
+def _gravity_gradient(rx: float, ry: float, rz: float, gm: float) -> np.ndarray:
+    """質点重力の位置微分 ∂g/∂r = GM (3 r rᵀ/|r|⁵ − I/|r|³)（3×3）"""
+    r = np.array([rx, ry, rz])
+    distance = math.sqrt(rx * rx + ry * ry + rz * rz)
+    inv_r3 = 1.0 / distance**3
+    inv_r5 = inv_r3 / (distance * distance)
+    grad = np.empty((3, 3))
+    for i in range(3):
+        for j in range(3):
+            grad[i, j] = 3.0 * gm * r[i] * r[j] * inv_r5
+        grad[i, i] -= gm * inv_r3
+    return grad
+
+
+@_jit
+def _moon_position(t: float) -> Tuple[float, float]:
+    """時刻 t [s] の月位置 (x, y)（円軌道、t=0 で +X 軸上）"""
+    angle = MOON_ANGULAR_RATE * t
+    return EARTH_MOON_DIST * math.cos(angle), EARTH_MOON_DIST * math.sin(angle)
+
+
+@_jit
+def _patched_conic_gravity(px: float, py: float, pz: float, moon_x: float, moon_y: float, moon_z: float,
+                           moon_soi: float) -> Tuple[float, float, float, bool]:
+    """パッチドコニック重み付けの重力加速度 (ax, ay, az, 地球支配か)（地球は原点）"""
+    ex, ey, ez = _point_mass_gravity(px, py, pz, GM_EARTH, R_EARTH)
+    dx, dy, dz = px - moon_x, py - moon_y, pz - moon_z
+    mx, my, mz = _point_mass_gravity(dx, dy, dz, GM_MOON, R_MOON)
+    earth_distance2 = px * px + py * py + pz * pz
+    moon_distance2 = dx * dx + dy * dy + dz * dz
+    
+    # 月SOI外かつ地球引力が強ければ地球支配: 月の影響は10%に抑制
+    # （距離は二乗のまま比較して平方根を省き、引力比較は割り算を避けて交差乗算: 原点でもゼロ除算しない）
+    if moon_distance2 > moon_soi * moon_soi and GM_EARTH * moon_distance2 > GM_MOON * earth_distance2:
+        return ex + mx * 0.1, ey + my * 0.1, ez + mz * 0.1, True
+    
+    # 月支配: 地球の影響は遠距離では減衰
+    earth_factor = min(1.0, (2 * R_EARTH)**2 / earth_distance2)
+    return mx + ex * earth_factor, my + ey * earth_factor, mz + ez * earth_factor, False
+
+
+@_jit
+def _symplectic_coast(y: np.ndarray, duration: float, steps: int, drifts: Tuple[float, ...],
+                      kicks: Tuple[float, ...], moon_x0: float, moon_y0: float) -> Tuple[float, bool]:
+    """
+    重力のみの慣性飛行を drift/kick 分解の記号積分で伝搬（y = [r, v] をin-placeで更新）
+    
+    1ステップ h ごとに drifts[i]·h の等速移動と kicks[i]·h の重力加速を交互に行い、
+    月位置は drift 後の時刻で回転させる。月SOI進入・地表到達のステップで止めて (経過時間, 停止したか) を返す。
+    """
+    h = duration / steps
+    px, py, pz, vx, vy, vz = y[0], y[1], y[2], y[3], y[4], y[5]
+    moon_distance2 = (px - moon_x0)**2 + (py - moon_y0)**2 + pz * pz
+    tau = 0.0
+    stopped = False
+    for _ in range(steps):
+        sub_tau = tau
+        for i in range(len(kicks)):
+            drift = drifts[i] * h
+            px += vx * drift
+            py += vy * drift
+            pz += vz * drift
+            sub_tau += drift
+            cos_a, sin_a = math.cos(MOON_ANGULAR_RATE * sub_tau), math.sin(MOON_ANGULAR_RATE * sub_tau)
+            moon_x, moon_y = moon_x0 * cos_a - moon_y0 * sin_a, moon_x0 * sin_a + moon_y0 * cos_a
+            ax, ay, az, _ = _patched_conic_gravity(px, py, pz, moon_x, moon_y, 0.0, MOON_SOI_RADIUS)
+            kick = kicks[i] * h
+            vx += ax * kick
+            vy += ay * kick
+            vz += az * kick
+        drift = drifts[-1] * h
+        px += vx * drift
+        py += vy * drift
+        pz += vz * drift
+        tau += h
+        
+        # solve_ivp 版のイベント（外→内の向きのみ）と同じ判定をステップ末で行う
+        cos_a, sin_a = math.cos(MOON_ANGULAR_RATE * tau), math.sin(MOON_ANGULAR_RATE * tau)
+        moon_x, moon_y = moon_x0 * cos_a - moon_y0 * sin_a, moon_x0 * sin_a + moon_y0 * cos_a
+        previous_moon_distance2 = moon_distance2
+        moon_distance2 = (px - moon_x)**2 + (py - moon_y)**2 + pz * pz
+        soi2 = MOON_SOI_RADIUS * MOON_SOI_RADIUS
+        if px * px + py * py + pz * pz <= R_EARTH * R_EARTH or (previous_moon_distance2 > soi2 >= moon_distance2):
+            stopped = True
+            break
+    
+    y[0], y[1], y[2], y[3], y[4], y[5] = px, py, pz, vx, vy, vz
+    return tau, stopped
+
+
+@_jit
+def _orbital_elements(r: float, v: float, velocity_radial: float, mu: float) -> Tuple[float, float, float]:
+    """軌道要素 (apoapsis, periapsis, eccentricity) [m, m, -]（双曲線軌道は (inf, r, 1)）"""
+    # 動径方向と接線方向の速度成分
+    velocity_tangential = math.sqrt(max(0.0, v**2 - velocity_radial**2))
+    
+    # 軌道角運動量
+    h = r * velocity_tangential
+    
+    # 軌道エネルギー
+    energy = 0.5 * v**2 - mu / r
+    
+    # 軌道長半径
+    if energy >= 0:
+        # 放物線・双曲線軌道の場合
+        return math.inf, r, 1.0
+    
+    a = -mu / (2 * energy)
+    
+    # 離心率
+    e_squared = 1 + 2 * energy * h**2 / mu**2
+    if e_squared < 0:
+        e_squared = 0.0
+    e = math.sqrt(e_squared)
+    
+    # 遠地点・近地点距離
+    return a * (1 + e), a * (1 - e), e
+
+
+@_jit
+def _flight_path_angle(r: float, v: float, velocity_radial: float) -> float:
+    """飛行経路角 γ = arcsin(v_r / |v|) [rad]（停止中・原点では 0）"""
+    if v == 0.0 or r == 0.0:
+        return 0.0
+    # アークサインの定義域制限
+    return math.asin(max(-1.0, min(1.0, velocity_radial / v)))
+
+
+@_jit
+def _legacy_atmospheric_density(altitude: float) -> float:
+    """区分的標準大気モデル（拡張大気モデルが使えない場合のフォールバック）"""
+    if altitude < 0:
+        return SEA_LEVEL_DENSITY
+    elif altitude <= 11e3:
+        # 0-11km: 対流圈（線形温度変化）
+        temp = 288.15 - 6.5e-3 * altitude  # K
+        pressure = SEA_LEVEL_PRESSURE * (temp / 288.15) ** 5.256
+        return pressure / (287.0 * temp)  # 理想気体の状態方程式
+    elif altitude <= 25e3:
+        # 11-25km: 成層圈下部（一定温度）
+        pressure = 22632 * math.exp(-(altitude - 11e3) / _LEGACY_STRATOSPHERE_SCALE_HEIGHT)
+        return pressure / (287.0 * 216.65)  # 一定温度 216.65 K
+    elif altitude <= 100e3:
+        # 25-100km: 成層圈上部（指数関数近似）
+        return SEA_LEVEL_DENSITY * math.exp(-altitude / SCALE_HEIGHT)
+    elif altitude <= 150e3:
+        # 100-150km: 熱圈下部（急激な減衰）
+        # 指数関数的減衰
+        return _LEGACY_DENSITY_100KM * math.exp(-(altitude - 100e3) / 10000)  # 10kmスケール
+    elif altitude <= 300e3:
+        # 150-300km: 極薄大気（安定性のため残留）
+        factor = math.exp(-(altitude - 150e3) / 50000)  # 50kmスケール
+        return max(_LEGACY_DENSITY_150KM * factor, 1e-12)  # 最小値を設定
+    else:
+        # 300km以上: ほぼ真空（安定性のため最小値を維持）
+        return VACUUM_DENSITY
+
+
+@_jit
+def _rk4_substate(y0: np.ndarray, k: np.ndarray, h: float, out: np.ndarray):
+    """RK4中間状態 out = y0 + h·k（状態 y = [r, v] の6成分を一括、出力バッファへ書き込み）"""
+    for i in range(y0.shape[0]):
+        out[i] = y0[i] + k[i] * h
+
+
+@_jit
+def _rk4_combine(y0: np.ndarray, k1: np.ndarray, k2: np.ndarray, k3: np.ndarray, k4: np.ndarray,
+                 weight: float) -> np.ndarray:
+    """RK4最終結合 y0 + (k1 + 2·k2 + 2·k3 + k4)·weight（weight = dt/6 は呼び出し側で事前計算、新しい配列を返す）"""
+    out = np.empty_like(y0)
+    for i in range(y0.shape[0]):
+        out[i] = y0[i] + (k1[i] + k2[i] * 2 + k3[i] * 2 + k4[i]) * weight
+    return out
+
+
+if not NUMBA_AVAILABLE:
+    # numba が無い環境では要素ごとのPythonループより NumPy の一括演算の方が速い（演算順は同じで結果も一致）
+    def _rk4_substate(y0: np.ndarray, k: np.ndarray, h: float, out: np.ndarray):
+        """RK4中間状態 out = y0 + h·k（NumPy版）"""
+        np.multiply(k, h, out=out)
+        np.add(y0, out, out=out)
+    
+    def _rk4_combine(y0: np.ndarray, k1: np.ndarray, k2: np.ndarray, k3: np.ndarray, k4: np.ndarray,
+                     weight: float) -> np.ndarray:
+        """RK4最終結合 y0 + (k1 + 2·k2 + 2·k3 + k4)·weight（NumPy版、一時配列を作らずin-placeで累積）"""
+        out = np.multiply(k2, 2)
+        out += k1
+        scratch = np.multiply(k3, 2)
+        out += scratch
+        out += k4
+        out *= weight
+        out += y0
+        return out
+
+
+def _kahan_add(total: float, compensation: float, value: float) -> Tuple[float, float]:
+    """補償付き加算（Kahan）: total + value を丸め誤差を繰り越して計算し (新しい和, 補償項) を返す"""
+    y = value - compensation
+    new_total = total + y
+    return new_total, (new_total - total) - y
+
 
 @dataclass
 class CelestialBody:
@@ -60,41 +355,56 @@ class CelestialBody:
     position: Vector3
     velocity: Vector3 = field(default_factory=lambda: Vector3(0, 0))
     soi_radius: float = 0.0  # 影響圏半径 [m]
+    mu: float = field(init=False)  # 重力定数 G·M [m^3/s^2]（構築時に一度だけ計算）
+    
+    def __post_init__(self):
+        self.mu = G * self.mass
     
     def get_gravitational_acceleration(self, position: Vector3) -> Vector3:
         """指定位置での重力加速度を計算"""
-        r = position - self.position
-        distance = r.magnitude()
-        if distance <= self.radius:
-            if distance < 0.1:
-                distance = 0.1
-            surface_gravity = G * self.mass / self.radius**2
-            return r.normalized() * (-surface_gravity)
-        return r.normalized() * (-G * self.mass / distance**2)
+        return Vector3(*_point_mass_gravity(*self._offset(position), self.mu, self.radius))
     
     def is_in_soi(self, position: Vector3) -> bool:
         """指定位置が影響圏内かどうか判定"""
         if self.soi_radius <= 0:
             return False
-        distance = (position - self.position).magnitude()
-        return distance <= self.soi_radius
+        return self._distance_squared(position) <= self.soi_radius**2
+    
+    def _offset(self, position: Vector3) -> Tuple[float, float, float]:
+        """天体中心から見た相対位置（スカラー成分で計算し、一時配列を作らない）"""
+        px, py, pz = position.data.tolist()
+        cx, cy, cz = self.position.data.tolist()
+        return px - cx, py - cy, pz - cz
+    
+    def _distance_squared(self, position: Vector3) -> float:
+        """中心からの距離の二乗（平方根を取らずに比較に使う）"""
+        dx, dy, dz = self._offset(position)
+        return dx * dx + dy * dy + dz * dz
     
     def get_dominant_body(self, position: Vector3, other_body: 'CelestialBody') -> 'CelestialBody':
         """より強い重力影響を持つ天体を返す"""
-        distance_self = (position - self.position).magnitude()
-        distance_other = (position - other_body.position).magnitude()
-        
         # 影響圏による判定を優先
         if self.is_in_soi(position):
             return self
         elif other_body.is_in_soi(position):
             return other_body
         
-        # 重力の強さで判定
-        gravity_self = G * self.mass / distance_self**2
-        gravity_other = G * other_body.mass / distance_other**2
-        
-        return self if gravity_self > gravity_other else other_body
+        # 重力の強さで判定（GM/d² の比較を交差乗算で: 平方根も割り算も不要）
+        return (self if self.mu * other_body._distance_squared(position)
+                > other_body.mu * self._distance_squared(position) else other_body)
+
+
+@dataclass
+class StepContext:
+    """1ステップ分の派生量（ステップ冒頭で一度だけ計算し、フェーズ判定・加速度・ログへ渡す）[s, m, m/s, m, m, -, kg]"""
+    t: float
+    kinematics: Tuple[float, float, float]  # (|r|, |v|, 動径速度)
+    altitude: float
+    velocity: float
+    apoapsis: float
+    periapsis: float
+    eccentricity: float
+    mass: Optional[float] = None  # フェーズ更新（段分離）後に確定、None なら未確定
 
 
 class Mission:
@@ -108,19 +418,30 @@ class Mission:
         
         # A2: Add mission clock
         self.time = 0.0  # Mission time [s]
+        self._time_compensation = 0.0  # 時刻の積算誤差（Kahan補償項）
+        # 同じ状態への再問い合わせ用のメモ（時刻ではなく状態の値で照合: 積分中は t が同じでも状態が変わる）
+        self._kinematics_memo = (None, None)  # ((px, py, pz, vx, vy, vz), (|r|, |v|, 動径速度))
+        self._elements_memo = (None, None)  # (kinematics タプル, 軌道要素)
         
         # 打ち上げパラメータ
         self.launch_azimuth = config.get("launch_azimuth", 90)  # 打ち上げ方位角 [度]
         self.target_parking_orbit = config.get("target_parking_orbit", 200e3)  # 駐機軌道高度 [m]
         self.gravity_turn_altitude = config.get("gravity_turn_altitude", 1500)  # Professor v7: start at 1500m
         
+        # 慣性飛行の適応刻み伝搬（無効にすると全区間を固定刻みRK4で積分）
+        self.adaptive_coast = config.get("adaptive_coast", True)
+        self.coast_method = config.get("coast_method", "DOP853")  # solve_ivp の手法名 または leapfrog / SABA2
+        self.coast_rtol = config.get("coast_rtol", 1e-8)
+        self.coast_atol = config.get("coast_atol", 1.0)  # [m]
+        
         # データ記録
-        self.time_history: List[float] = []
-        self.position_history: List[Vector3] = []
-        self.velocity_history: List[Vector3] = []
-        self.altitude_history: List[float] = []
-        self.mass_history: List[float] = []
-        self.phase_history: List[MissionPhase] = []
+        self.time_history = HistoryBuffer()
+        self.position_history = VectorHistory()
+        self.velocity_history = VectorHistory()
+        self.altitude_history = HistoryBuffer()
+        self.mass_history = HistoryBuffer()
+        self.phase_history = PhaseHistory()
+        self._history_stride = 1  # 状態履歴の記録間隔 [ステップ]
         
         # ミッション統計
         self.max_altitude = 0.0
@@ -140,27 +461,81 @@ class Mission:
         self.total_delta_v_limit = 15000  # m/s
         self.phase_delta_v_used = {'launch': 0, 'tli': 0, 'loi': 0, 'descent': 0}
         
-        # CSVログ設定
-        self.csv_file = open("mission_log.csv", "w", newline="")
-        self.csv_writer = csv.writer(self.csv_file)
-        self.csv_writer.writerow(["time", "altitude", "velocity", "mass", "delta_v", "phase", "stage", "apoapsis", "periapsis", "eccentricity", "flight_path_angle", "pitch_angle", "remaining_propellant", "dynamic_pressure", "max_dynamic_pressure"])
+        # ミッションログ設定（"csv": mission_log.csv に逐次書き出し、"npz": 数値のまま保持し終了時に mission_log.npz）
+        self.log_format = config.get("log_format", "csv")
+        self._csv_row_buffer: List[list] = []  # 行をまとめて writerows で書き出す（npz では全行を保持）
+        if self.log_format == "npz":
+            self.csv_file = None
+        else:
+            self.csv_file = open("mission_log.csv", "w", newline="", buffering=CSV_FILE_BUFFER_BYTES)
+            self.csv_writer = csv.writer(self.csv_file)
+            self.csv_writer.writerow(LOG_COLUMNS)
 
         # ロガー設定 (logging.basicConfig is now handled in main)
         self.logger = logging.getLogger(__name__)
         
         # Initialize missing attributes
         self.leo_target_altitude = self.target_parking_orbit
-        
+
+        # フェーズ遷移ハンドラ（_update_mission_phase は現在フェーズの1つだけを呼ぶ）
+        self._phase_handlers = {
+            MissionPhase.LAUNCH: self._phase_launch,
+            MissionPhase.APOAPSIS_RAISE: self._phase_apoapsis_raise,
+            MissionPhase.STAGE_SEPARATION: self._phase_stage_separation,
+            MissionPhase.CIRCULARIZATION: self._phase_circularization,
+            MissionPhase.COAST_TO_APOAPSIS: self._phase_coast_to_apoapsis,
+            MissionPhase.LEO: self._phase_leo,
+            MissionPhase.LEO_STABLE: self._phase_leo_stable,
+            MissionPhase.TLI_BURN: self._phase_tli_burn,
+            MissionPhase.COAST_TO_MOON: self._phase_coast_to_moon,
+            MissionPhase.LOI_BURN: self._phase_loi_burn,
+            MissionPhase.LUNAR_ORBIT: self._phase_lunar_orbit,
+            MissionPhase.PDI: self._phase_pdi,
+            MissionPhase.TERMINAL_DESCENT: self._phase_terminal_descent,
+            MissionPhase.LUNAR_TOUCHDOWN: self._phase_lunar_touchdown,
+        }
+        self._last_logged_phase = None  # 直前の更新で見たフェーズ（遷移ログ用）
+        self._debug_counter = 0
+
         # Professor v27: Initialize orbital monitor and guidance system
         self.orbital_monitor = create_orbital_monitor(update_interval=0.1)
+        self._leo_check = (-1, False)  # (判定した軌道状態の state_version, 判定結果)
         self.guidance_context = GuidanceFactory.create_context(config)
+        self._guidance_target = (None, {})  # (leo_target_altitude, 誘導の target_state)
         
         # Initialize mission components
         self._initialize_mission_components()
+        
+        # 大気モデル（import・インスタンス取得・緯度経度の参照はここで一度だけ、失敗時は従来モデル）
+        self._density_latitude = config.get('launch_latitude', 28.573)
+        self._density_longitude = config.get('launch_longitude', -80.649)
+        try:
+            from atmosphere import get_atmosphere_model
+            self._atmosphere_model = get_atmosphere_model()
+        except Exception as e:
+            self.logger.debug("Enhanced atmosphere model not available: %s", e)
+            self._atmosphere_model = None
+        
+        # 大気密度の対数テーブル（ホットパスでは補間のみ）
+        self._log_density_table, self._density_direct_bins = self._build_log_density_table()
+
+    def _flush_csv_rows(self):
+        """バッファ済みのCSV行を一括書き出し（npz ログでは終了時にまとめて保存するので何もしない）"""
+        if self._csv_row_buffer and self.csv_file is not None:
+            self.csv_writer.writerows(self._csv_row_buffer)
+            self._csv_row_buffer.clear()
+
+    def _save_log_npz(self, filename: str = "mission_log.npz"):
+        """数値のまま保持したログ行を列ごとの配列にして圧縮NPZで保存（列名は LOG_COLUMNS）"""
+        columns = list(zip(*self._csv_row_buffer)) or [()] * len(LOG_COLUMNS)
+        arrays = {name: np.asarray(column, dtype=str if name == "phase" else np.float64)
+                  for name, column in zip(LOG_COLUMNS, columns)}
+        arrays["stage"] = arrays["stage"].astype(np.int64)
+        np.savez_compressed(filename, **arrays)
 
     def step(self, dt: float):
         """A2: Step mission clock"""
-        self.time += dt
+        self.time, self._time_compensation = _kahan_add(self.time, self._time_compensation, dt)
 
     def check_delta_v_budget(self) -> bool:
         """A7: Check global ΔV & mass budget guard"""
@@ -189,6 +564,13 @@ class Mission:
         self.tli_executed = False
         self.mcc_executed = False
         self.loi_executed = False
+        self.tli_delta_v_calculated = False
+        self._loi_burn_started = False
+        self.circularization_start_time: Optional[float] = None  # 円化燃焼の開始時刻 [s]（未開始なら None）
+        self.tli_analysis: Dict = {}
+        self.max_dynamic_pressure = 0.0  # [Pa]
+        self._max_q_warning_shown = False
+        self._stage3_debug_counter = 0
         self.mission_start_time = 0.0
         self.total_mission_delta_v = 0.0
         
@@ -235,6 +617,11 @@ class Mission:
         if not self.orbital_monitor.current_state:
             return False
         
+        # 軌道状態が前回の判定から更新されていなければ結果も同じ（ログ・JSON出力も済んでいる）
+        state_version = self.orbital_monitor.state_version
+        if state_version == self._leo_check[0]:
+            return self._leo_check[1]
+        
         orbital_state = self.orbital_monitor.current_state
         
         # Success criteria:
@@ -261,6 +648,7 @@ class Mission:
             self.logger.info(f"   Eccentricity: {orbital_state.eccentricity:.4f}")
             self.logger.info(f"   Altitude difference: {abs(apoapsis_km - periapsis_km):.1f} km")
         
+        self._leo_check = (state_version, success)
         return success
     
     def _emit_leo_state_json(self, orbital_state) -> None:
@@ -327,6 +715,7 @@ class Mission:
     
     def _initialize_moon(self) -> CelestialBody:
         """月の初期位置を設定（影響圏設定含む）"""
+        self._moon_time = 0.0  # 月位置の基準時刻 [s]（位置は時刻から解析的に求める）
         moon_pos = Vector3(EARTH_MOON_DIST, 0)
         moon_vel = Vector3(0, 2 * np.pi * EARTH_MOON_DIST / MOON_ORBIT_PERIOD)
         moon = CelestialBody("Moon", M_MOON, R_MOON, moon_pos, moon_vel)
@@ -337,847 +726,920 @@ class Mission:
         """高度を取得 [m]"""
         return self.rocket.position.magnitude() - R_EARTH
 
-    def get_orbital_elements(self) -> Tuple[float, float, float]:
-        """軌道要素を計算: (apoapsis, periapsis, eccentricity) [m, m, -]"""
-        r = self.rocket.position.magnitude()
-        v = self.rocket.velocity.magnitude()
-        
-        # 動径方向と接線方向の速度成分
-        radial_unit = self.rocket.position.normalized()
-        velocity_radial = self.rocket.velocity.data @ radial_unit.data
-        velocity_tangential = np.sqrt(max(0, v**2 - velocity_radial**2))
-        
-        # 軌道角運動量
-        h = r * velocity_tangential
-        
-        # 軌道エネルギー
-        energy = 0.5 * v**2 - G * M_EARTH / r
-        
-        # 軌道長半径
-        if energy >= 0:
-            # 放物線・双曲線軌道の場合
-            return float('inf'), r, 1.0
-        
-        a = -G * M_EARTH / (2 * energy)
-        
-        # 離心率
-        e_squared = 1 + 2 * energy * h**2 / (G * M_EARTH)**2
-        if e_squared < 0:
-            e_squared = 0
-        e = np.sqrt(e_squared)
-        
-        # 遠地点・近地点距離
-        apoapsis = a * (1 + e)
-        periapsis = a * (1 - e)
-        
-        return apoapsis, periapsis, e
+    def _radial_kinematics(self) -> Tuple[float, float, float]:
+        """現在状態の (|r|, |v|, 動径速度) を一度だけ計算（同じ状態なら前回のタプルをそのまま返す）"""
+        state = (*self.rocket.position.data.tolist(), *self.rocket.velocity.data.tolist())
+        if state == self._kinematics_memo[0]:
+            return self._kinematics_memo[1]
+        px, py, pz, vx, vy, vz = state
+        r = math.hypot(px, py, pz)
+        v = math.hypot(vx, vy, vz)
+        velocity_radial = (vx * px + vy * py + vz * pz) / r if r > 0 else 0.0
+        kinematics = (r, v, velocity_radial)
+        self._kinematics_memo = (state, kinematics)
+        return kinematics
+
+    def _moon_relative_state(self) -> Tuple[float, float, float]:
+        """
+        月中心基準の (|r|², |v|², r·v)（月フェーズの毎ステップで Vector3 の差分を作らない）
+        r·v は動径速度 × |r| なので符号判定はそのまま、平方根は必要な時だけ呼び出し側で取る
+        """
+        px, py, pz = self.rocket.position.data.tolist()
+        mx, my, mz = self.moon.position.data.tolist()
+        vx, vy, vz = self.rocket.velocity.data.tolist()
+        ux, uy, uz = self.moon.velocity.data.tolist()
+        dx, dy, dz = px - mx, py - my, pz - mz
+        dvx, dvy, dvz = vx - ux, vy - uy, vz - uz
+        return (dx * dx + dy * dy + dz * dz, dvx * dvx + dvy * dvy + dvz * dvz,
+                dvx * dx + dvy * dy + dvz * dz)
+
+    def get_orbital_elements(self, kinematics: Optional[Tuple[float, float, float]] = None) -> Tuple[float, float, float]:
+        """軌道要素を計算: (apoapsis, periapsis, eccentricity) [m, m, -]（同じ kinematics なら再計算しない）"""
+        kinematics = kinematics or self._radial_kinematics()
+        if kinematics is self._elements_memo[0]:
+            return self._elements_memo[1]
+        elements = _orbital_elements(*kinematics, GM_EARTH)
+        self._elements_memo = (kinematics, elements)
+        return elements
 
-    def get_flight_path_angle(self) -> float:
+    def get_flight_path_angle(self, kinematics: Optional[Tuple[float, float, float]] = None) -> float:
         """飛行経路角を取得 [rad] - 速度ベクトルと局所水平面の角度"""
-        # 地心方向（動径方向）の単位ベクトル
-        radial_unit = self.rocket.position.normalized()
-        
-        # 速度ベクトルの動径成分
-        velocity_radial = self.rocket.velocity.data @ radial_unit.data  # ドット積
-        
-        # 飛行経路角 = arcsin(v_radial / |v|)
-        velocity_magnitude = self.rocket.velocity.magnitude()
-        if velocity_magnitude == 0:
-            return 0.0
-        
-        sin_gamma = velocity_radial / velocity_magnitude
-        # アークサインの定義域制限
-        sin_gamma = max(-1.0, min(1.0, sin_gamma))
-        
-        return np.arcsin(sin_gamma)
+        return _flight_path_angle(*(kinematics or self._radial_kinematics()))
 
     def get_cross_sectional_area(self) -> float:
-        """ステージに応じた断面積を取得（月ミッション対応）"""
-        if self.rocket.current_stage == 0:
-            return 80.0  # 第1段 S-IC: 大型
-        elif self.rocket.current_stage == 1:
-            return 30.0  # 第2段 S-II: 中型
-        elif self.rocket.current_stage == 2:
-            return 18.0  # 第3段 S-IVB: 小型
-        else:
-            return 8.0   # 第4段 着陸機: 最小
+        """ステージに応じた断面積を取得（月ミッション対応、大気圏内の毎評価で呼ばれるので表引き）"""
+        stage = self.rocket.current_stage
+        return STAGE_CROSS_SECTIONS[stage] if 0 <= stage < len(STAGE_CROSS_SECTIONS) else LANDER_CROSS_SECTION
 
-    def get_thrust_vector(self, t: float) -> Vector3:
+    def get_thrust_vector(self, t: float, altitude: Optional[float] = None,
+                          mass: Optional[float] = None) -> Vector3:
         """
         推力ベクトルを取得（Professor v27: New guidance system）
         Uses strategy pattern guidance instead of legacy guidance module
+        altitude / mass: 呼び出し側で計算済みなら渡して再計算を省く
         """
-        altitude = self.get_altitude()
+        return Vector3(*self._thrust_components(t, altitude, mass))
+    
+    def _thrust_components(self, t: float, altitude: Optional[float] = None,
+                           mass: Optional[float] = None) -> Tuple[float, float, float]:
+        """推力ベクトルの成分 (x, y, z)（毎ステップの Vector3 生成を避けるためスカラーで返す）"""
+        if altitude is None:
+            altitude = self.get_altitude()
         if not self.rocket.is_thrusting(t, altitude):
-            return Vector3(0, 0)
+            return 0.0, 0.0, 0.0
         
         stage = self.rocket.stages[self.rocket.current_stage]
         thrust_magnitude = stage.get_thrust(altitude)
         
         # Professor v27: Use new strategy-based guidance system
         try:
-            # Create vehicle state for guidance
+            # Create vehicle state for guidance（位置引数: position, velocity, altitude, mass, mission_phase, time）
             vehicle_state = VehicleState(
-                position=self.rocket.position,
-                velocity=self.rocket.velocity,
-                altitude=altitude,
-                mass=self.rocket.get_current_mass(t, altitude),
-                mission_phase=self.rocket.phase,
-                time=t
+                self.rocket.position, self.rocket.velocity, altitude,
+                mass if mass is not None else self.rocket.get_current_mass(t, altitude),
+                self.rocket.phase, t
             )
             
-            # Target state (for LEO mission)
-            target_state = {
-                'target_apoapsis': self.leo_target_altitude + R_EARTH,
-                'target_altitude': self.leo_target_altitude
-            }
-            
             # Compute guidance command
-            guidance_command = self.guidance_context.compute_guidance(vehicle_state, target_state)
+            guidance_command = self.guidance_context.compute_guidance(vehicle_state, self._guidance_target_state())
             
             # Apply thrust magnitude to guidance direction
-            thrust_direction = guidance_command.thrust_direction
+            dx, dy, dz = guidance_command.thrust_direction.data.tolist()
             actual_thrust_magnitude = thrust_magnitude * guidance_command.thrust_magnitude
             
-            return thrust_direction * actual_thrust_magnitude
+            return dx * actual_thrust_magnitude, dy * actual_thrust_magnitude, dz * actual_thrust_magnitude
             
         except Exception as e:
             self.logger.warning(f"Guidance system error: {e}, falling back to legacy guidance")
             # Fallback to legacy guidance
-            import guidance
-            return guidance.compute_thrust_direction(self, t, thrust_magnitude)
+            return tuple(guidance.compute_thrust_direction(self, t, thrust_magnitude).data.tolist())
+    
+    def _guidance_target_state(self) -> Dict:
+        """誘導の目標状態（LEO mission）: leo_target_altitude が変わった時だけ作り直す"""
+        if self._guidance_target[0] != self.leo_target_altitude:
+            self._guidance_target = (self.leo_target_altitude, {
+                'target_apoapsis': self.leo_target_altitude + R_EARTH,
+                'target_altitude': self.leo_target_altitude
+            })
+        return self._guidance_target[1]
     
     def _update_moon_position(self, dt: float):
-        """月の位置を更新"""
-        # 簡単な円運動として計算
-        omega = 2 * np.pi / MOON_ORBIT_PERIOD
-        angle = omega * dt
-        cos_a, sin_a = np.cos(angle), np.sin(angle)
-        
-        # 回転行列による位置更新
-        x = self.moon.position.x * cos_a - self.moon.position.y * sin_a
-        y = self.moon.position.x * sin_a + self.moon.position.y * cos_a
-        self.moon.position = Vector3(x, y)
-        
-        # 速度も更新
-        vx = self.moon.velocity.x * cos_a - self.moon.velocity.y * sin_a
-        vy = self.moon.velocity.x * sin_a + self.moon.velocity.y * cos_a
-        self.moon.velocity = Vector3(vx, vy)
+        """月の位置を dt 秒進める"""
+        self._set_moon_time(self._moon_time + dt)
+    
+    def _set_moon_time(self, t: float):
+        """月の位置・速度を時刻 t の円軌道上に設定（時刻から解析的に求め、微小回転の積み重ね誤差を避ける）"""
+        self._moon_time = t
+        moon_x, moon_y = _moon_position(t)
+        # 毎ステップ呼ばれるため Vector3 を作り直さず既存の配列へ書き込む（z は常に0）
+        position, velocity = self.moon.position.data, self.moon.velocity.data
+        position[0], position[1] = moon_x, moon_y
+        
+        # 速度は位置に直交（大きさ R·ω）
+        velocity[0], velocity[1] = -moon_y * MOON_ANGULAR_RATE, moon_x * MOON_ANGULAR_RATE
+    
+    def _coast_acceleration(self, y: np.ndarray, moon_x: float, moon_y: float) -> Tuple[float, float, float]:
+        """慣性飛行中の重力加速度（_calculate_total_acceleration と同じパッチドコニック重み付け）"""
+        return _patched_conic_gravity(y[0], y[1], y[2], moon_x, moon_y, 0.0, MOON_SOI_RADIUS)[:3]
+
+    def _coast_jacobian(self, y: np.ndarray, moon_x: float, moon_y: float) -> np.ndarray:
+        """慣性飛行の状態 [r, v] に対する解析ヤコビアン（6×6）: [[0, I], [∂a/∂r, 0]]"""
+        px, py, pz = y[0], y[1], y[2]
+        earth_grad = _gravity_gradient(px, py, pz, GM_EARTH)
+        moon_grad = _gravity_gradient(px - moon_x, py - moon_y, pz, GM_MOON)
+        moon_distance = math.sqrt((px - moon_x)**2 + (py - moon_y)**2 + pz * pz)
+        if moon_distance <= MOON_SOI_RADIUS:
+            # 重み係数の位置依存は無視（ステップ制御用の近似で十分）
+            earth_distance = math.sqrt(px * px + py * py + pz * pz)
+            accel_grad = moon_grad + earth_grad * min(1.0, (2 * R_EARTH / earth_distance)**2)
+        else:
+            accel_grad = earth_grad + 0.1 * moon_grad
+        
+        jac = np.zeros((6, 6))
+        jac[0:3, 3:6] = np.eye(3)
+        jac[3:6, 0:3] = accel_grad
+        return jac
+
+    def propagate_coast(self, duration: float, rtol: float = 1e-8, atol: float = 1.0,
+                        method: str = 'DOP853', advance_clock: bool = True):
+        """
+        推力なし区間を適応刻み積分器 (scipy solve_ivp, 既定 DOP853) で伝搬する
+        
+        月SOI進入・地表到達をイベントとして検出し、そこで停止する。
+        陰的解法 (Radau/BDF/LSODA) には解析ヤコビアンを渡す。
+        method に 'leapfrog' / 'SABA2' を指定すると記号積分で伝搬する（rtol/atol は使わない）。
+        ロケットと月の状態（advance_clock ならミッション時計も）を更新して solve_ivp の結果を返す。
+        """
+        omega = MOON_ANGULAR_RATE
+        moon_x0, moon_y0 = self.moon.position.x, self.moon.position.y
+        y0 = np.concatenate([self.rocket.position.data, self.rocket.velocity.data])
+        
+        if method in SYMPLECTIC_COAST_COEFFICIENTS:
+            sol = self._propagate_coast_symplectic(y0, duration, method, moon_x0, moon_y0)
+            return self._finish_coast(sol, advance_clock)
+        
+        def moon_xy(tau):
+            cos_a, sin_a = math.cos(omega * tau), math.sin(omega * tau)
+            return moon_x0 * cos_a - moon_y0 * sin_a, moon_x0 * sin_a + moon_y0 * cos_a
+        
+        def derivatives(tau, y):
+            ax, ay, az = self._coast_acceleration(y, *moon_xy(tau))
+            return [y[3], y[4], y[5], ax, ay, az]
+        
+        def soi_entry(tau, y):
+            mx, my = moon_xy(tau)
+            return math.sqrt((y[0] - mx)**2 + (y[1] - my)**2 + y[2]**2) - MOON_SOI_RADIUS
+        soi_entry.terminal = True
+        soi_entry.direction = -1
+        
+        def earth_impact(tau, y):
+            return math.sqrt(y[0]**2 + y[1]**2 + y[2]**2) - R_EARTH
+        earth_impact.terminal = True
+        earth_impact.direction = -1
+        
+        options = {}
+        if method in ('Radau', 'BDF', 'LSODA'):
+            options['jac'] = lambda tau, y: self._coast_jacobian(y, *moon_xy(tau))
+        
+        sol = solve_ivp(derivatives, (0.0, duration), y0, method=method,
+                        events=[soi_entry, earth_impact], rtol=rtol, atol=atol, **options)
+        return self._finish_coast(sol, advance_clock)
+    
+    def _propagate_coast_symplectic(self, y0: np.ndarray, duration: float, method: str,
+                                    moon_x0: float, moon_y0: float) -> OptimizeResult:
+        """
+        記号積分による慣性飛行の伝搬（solve_ivp と同じ形の結果を返す）
+        
+        刻みは開始時の局所力学時間 √(r³/GM) に比例させ、呼び出し内では固定（固定刻みで記号性を保つ）。
+        """
+        drifts, kicks = SYMPLECTIC_COAST_COEFFICIENTS[method]
+        r = math.sqrt(y0[0]**2 + y0[1]**2 + y0[2]**2)
+        step = COAST_STEP_FACTOR * math.sqrt(r**3 / GM_EARTH)
+        steps = max(1, math.ceil(duration / step))
+        
+        y = y0.copy()
+        elapsed, stopped = _symplectic_coast(y, duration, steps, drifts, kicks, moon_x0, moon_y0)
+        return OptimizeResult(t=np.array([0.0, elapsed]), y=np.column_stack([y0, y]),
+                              nfev=round(elapsed * steps / duration) * len(kicks),
+                              status=1 if stopped else 0, success=True,
+                              message="A termination event occurred." if stopped else "Reached end of span.")
+    
+    def _finish_coast(self, sol, advance_clock: bool):
+        """慣性飛行の伝搬結果をロケット・月の状態（advance_clock ならミッション時計も）に反映"""
+        elapsed = sol.t[-1]
+        self.rocket.position = Vector3.from_array(sol.y[:3, -1].copy())
+        self.rocket.velocity = Vector3.from_array(sol.y[3:, -1].copy())
+        self._update_moon_position(elapsed)
+        if advance_clock:
+            self.step(elapsed)
+        return sol
+    
+    def _is_ballistic_coast(self, t: float, altitude: float) -> bool:
+        """月遷移軌道の慣性飛行中（推力なし・空気抵抗圏外）で重力のみの伝搬が可能か（RHSの重力のみ条件と同じ）"""
+        return (self.rocket.phase == MissionPhase.COAST_TO_MOON and t >= 10.0 and altitude > DRAG_CUTOFF_ALTITUDE
+                and not self.rocket.is_thrusting(t, altitude))
+    
+    def _build_log_density_table(self) -> Tuple[List[float], List[bool]]:
+        """
+        0〜300kmの対数密度を100m刻みで事前計算（スカラー参照用にリストで保持）
+        
+        モデルの層境界で不連続になる区間は補間せずモデルを直接評価するよう印を付ける。
+        """
+        altitudes = np.arange(0.0, DENSITY_TABLE_MAX_ALT + DENSITY_TABLE_STEP, DENSITY_TABLE_STEP)
+        log_density = np.log([self._model_atmospheric_density(alt) for alt in altitudes])
+        midpoints = altitudes[:-1] + 0.5 * DENSITY_TABLE_STEP
+        log_mid = np.log([self._model_atmospheric_density(alt) for alt in midpoints])
+        interpolated = 0.5 * (log_density[:-1] + log_density[1:])
+        direct_bins = np.abs(interpolated - log_mid) > 1e-4
+        return log_density.tolist(), direct_bins.tolist()
     
     def _calculate_atmospheric_density(self, altitude: float) -> float:
+        """大気密度 [kg/m^3]: テーブル範囲内は対数線形補間、真空域は定数、それ以外はモデルを直接評価"""
+        if altitude > VACUUM_ALTITUDE:
+            # 月遷移中のCSV記録などで毎回モデル（import・ディスパッチ込み）を呼ばない
+            return VACUUM_DENSITY
+        if 0.0 <= altitude < DENSITY_TABLE_MAX_ALT:
+            x = altitude / DENSITY_TABLE_STEP
+            i = int(x)
+            if not self._density_direct_bins[i]:
+                log_lo = self._log_density_table[i]
+                return math.exp(log_lo + (self._log_density_table[i + 1] - log_lo) * (x - i))
+        return self._model_atmospheric_density(altitude)
+    
+    def _model_atmospheric_density(self, altitude: float) -> float:
         """Calculate atmospheric density using enhanced model with NRLMSISE-00 support"""
-        try:
-            # Try to use enhanced atmospheric model
-            from atmosphere import get_atmosphere_model
-            atm_model = get_atmosphere_model()
-            
-            # Get density at current position
-            # Use mission configuration for latitude/longitude if available
-            latitude = getattr(self.config, 'launch_latitude', 28.573)
-            longitude = getattr(self.config, 'launch_longitude', -80.649)
-            
-            return atm_model.get_density(altitude, latitude, longitude)
-            
-        except (ImportError, Exception) as e:
-            # Fallback to legacy atmospheric model
-            self.logger.debug(f"Enhanced atmosphere model not available: {e}")
-            
+        if self._atmosphere_model is not None:
+            try:
+                # Get density at the launch site latitude/longitude from the mission configuration
+                return self._atmosphere_model.get_density(altitude, self._density_latitude, self._density_longitude)
+            except Exception as e:
+                # 一度失敗したら以降は従来モデルのみ（毎回例外を投げ直さない）
+                self.logger.debug("Enhanced atmosphere model failed, using legacy model: %s", e)
+                self._atmosphere_model = None
+        
         # Legacy atmospheric model (fallback)
-        if altitude < 0:
-            return SEA_LEVEL_DENSITY
-        elif altitude <= 11e3:
-            # 0-11km: 対流圈（線形温度変化）
-            temp = 288.15 - 6.5e-3 * altitude  # K
-            pressure = SEA_LEVEL_PRESSURE * (temp / 288.15) ** 5.256
-            return pressure / (287.0 * temp)  # 理想気体の状態方程式
-        elif altitude <= 25e3:
-            # 11-25km: 成層圈下部（一定温度）
-            temp = 216.65  # K
-            pressure = 22632 * np.exp(-(altitude - 11e3) / (287.0 * temp / 9.80665))
-            return pressure / (287.0 * temp)
-        elif altitude <= 100e3:
-            # 25-100km: 成層圈上部（指数関数近似）
-            return SEA_LEVEL_DENSITY * np.exp(-altitude / SCALE_HEIGHT)
-        elif altitude <= 150e3:
-            # 100-150km: 熱圈下部（急激な減衰）
-            density_100km = SEA_LEVEL_DENSITY * np.exp(-100e3 / SCALE_HEIGHT)
-            # 指数関数的減衰
-            return density_100km * np.exp(-(altitude - 100e3) / 10000)  # 10kmスケール
-        elif altitude <= 300e3:
-            # 150-300km: 極薄大気（安定性のため残留）
-            density_150km = SEA_LEVEL_DENSITY * np.exp(-100e3 / SCALE_HEIGHT) * np.exp(-50e3 / 10000)
-            factor = np.exp(-(altitude - 150e3) / 50000)  # 50kmスケール
-            return max(density_150km * factor, 1e-12)  # 最小値を設定
-        else:
-            # 300km以上: ほぼ真空（安定性のため最小値を維持）
-            return 1e-15  # kg/m^3
+        return _legacy_atmospheric_density(altitude)
     
-    def _calculate_drag_force(self) -> Vector3:
+    def _calculate_drag_force(self, altitude: Optional[float] = None) -> Vector3:
         """空気抵抗を計算"""
-        altitude = self.get_altitude()
-        density = self._calculate_atmospheric_density(altitude)
-        
-        if density == 0:
-            return Vector3(0, 0)
-        
-        velocity_magnitude = self.rocket.velocity.magnitude()
-        if velocity_magnitude == 0:
+        if altitude is None:
+            altitude = self.get_altitude()
+        if altitude > DRAG_CUTOFF_ALTITUDE:
             return Vector3(0, 0)
-        
-        # F_drag = 0.5 * ρ * v^2 * C_d * A（ステージ対応断面積使用）
-        cross_sectional_area = self.get_cross_sectional_area()
-        drag_magnitude = 0.5 * density * velocity_magnitude**2 * \
-                        self.rocket.drag_coefficient * cross_sectional_area
-        
-        # 速度と逆方向
-        return self.rocket.velocity.normalized() * (-drag_magnitude)
+        # F_drag = 0.5 * ρ * v^2 * C_d * A（ステージ対応断面積使用）、速度と逆方向
+        return Vector3(*self._drag_acceleration(altitude, 1.0))
+    
+    def _drag_acceleration(self, altitude: float, inv_mass: float) -> Tuple[float, float, float]:
+        """空気抵抗加速度の成分（inv_mass = 1/質量、高度判定は呼び出し側）"""
+        density = float(self._calculate_atmospheric_density(altitude))
+        vx, vy, vz = self.rocket.velocity.data.tolist()
+        return _quadratic_drag(vx, vy, vz, density,
+                               self.rocket.drag_coefficient * self.get_cross_sectional_area(), inv_mass)
     
-    def _calculate_total_acceleration(self, t: float) -> Vector3:
-        """総加速度を計算（Patched-Conic対応）"""
-        # 主支配天体を決定（パッチドコニック法）
-        dominant_body = self.earth.get_dominant_body(self.rocket.position, self.moon)
-        
-        # 主支配天体の重力
-        if dominant_body == self.earth:
-            # 地球支配: 地球重力と月の影響
-            g_primary = self.earth.get_gravitational_acceleration(self.rocket.position)
-            g_secondary = self.moon.get_gravitational_acceleration(self.rocket.position)
-            # 月の影響は地球引力が強い場合は10%に抑制
-            g_moon_factor = 0.1 if not self.moon.is_in_soi(self.rocket.position) else 1.0
-            g_secondary = g_secondary * g_moon_factor
+    def _calculate_total_acceleration(self, t: float, out: Optional[np.ndarray] = None,
+                                      context: Optional[StepContext] = None) -> Vector3:
+        """総加速度を計算（Patched-Conic対応）
+
+        out: 結果を書き込む長さ3のバッファ（RK4スクラッチ用、指定時はそれをラップして返す）
+        context: 現在状態・時刻 t の StepContext（RK4の k1 用、高度・質量の再計算を省く）
+        """
+        # 主支配天体の重力（パッチドコニック法、スカラーカーネルで一括計算）
+        # 月位置は評価時刻から解析的に求める（RK4の各段で月も動く）
+        px, py, pz = self.rocket.position.data.tolist()
+        moon_x, moon_y = _moon_position(t)
+        gx, gy, gz, earth_dominant = _patched_conic_gravity(px, py, pz, moon_x, moon_y, 0.0,
+                                                            self.moon.soi_radius)
+        
+        # 推力（高度・質量はこの評価内で一度だけ計算して使い回す）
+        altitude = context.altitude if context is not None else self.get_altitude()
+        
+        # 慣性飛行（エンジン停止・空気抵抗圏外）は重力のみ：質量・推力・抗力の評価を省く
+        if t >= 10.0 and altitude > DRAG_CUTOFF_ALTITUDE and not self.rocket.is_thrusting(t, altitude):
+            return self._acceleration_result(gx, gy, gz, out)
+        
+        # 推力・抗力加速度はスカラー成分で合成（Vector3の一時オブジェクトを作らない）
+        if context is not None and context.mass is not None:
+            current_mass = context.mass
         else:
-            # 月支配: 月重力と地球の影響
-            g_primary = self.moon.get_gravitational_acceleration(self.rocket.position)
-            g_secondary = self.earth.get_gravitational_acceleration(self.rocket.position)
-            # 地球の影響は遠距離では減衰
-            earth_distance = (self.rocket.position - self.earth.position).magnitude()
-            earth_factor = min(1.0, (2 * R_EARTH / earth_distance)**2)
-            g_secondary = g_secondary * earth_factor
-        
-        total_gravity = g_primary + g_secondary
-        
-        # 推力
-        thrust = self.get_thrust_vector(t)
-        altitude = self.get_altitude()
-        current_mass = self.rocket.get_current_mass(t, altitude)
-        thrust_acceleration = thrust * (1.0 / current_mass) if current_mass > 0 else Vector3(0, 0)
+            current_mass = self.rocket.get_current_mass(t, altitude)
+        inv_mass = 1.0 / current_mass if current_mass > 0 else 0.0  # 質量0以下では推力・抗力加速度が0になる
+        tx, ty, tz = self._thrust_components(t, altitude, current_mass)
+        thrust_ax, thrust_ay, thrust_az = tx * inv_mass, ty * inv_mass, tz * inv_mass
         
         # A5: Thrust vector sign check - Ensure vertical acceleration > 4 m/s² for first 10 seconds
         if t < 10.0:  # First 10 seconds
-            # Calculate vertical component of total acceleration
-            position_unit = self.rocket.position.normalized()
-            vertical_acc = (thrust_acceleration + total_gravity).data @ position_unit.data
+            # Calculate vertical component of total acceleration（動径方向の単位ベクトルはスカラーで）
+            r = math.hypot(px, py, pz)
+            ux, uy, uz = (px / r, py / r, pz / r) if r > 0 else (0.0, 0.0, 0.0)
+            gravity_vertical = gx * ux + gy * uy + gz * uz
+            vertical_acc = (thrust_ax + gx) * ux + (thrust_ay + gy) * uy + (thrust_az + gz) * uz
             
             # Ensure vertical acceleration is positive and > 4 m/s²
             if vertical_acc < 4.0:
                 # Adjust thrust to meet minimum acceleration requirement
-                required_thrust_acc = 4.0 - (total_gravity.data @ position_unit.data)
+                required_thrust_acc = 4.0 - gravity_vertical
                 if required_thrust_acc > 0:
-                    thrust_magnitude = required_thrust_acc * current_mass
-                    thrust_correction = position_unit * thrust_magnitude
-                    thrust_acceleration = thrust_correction * (1.0 / current_mass)
-        
-        # 空気抵抗（地球支配時のみ）
-        if dominant_body == self.earth:
-            drag = self._calculate_drag_force()
-            drag_acceleration = drag * (1.0 / current_mass) if current_mass > 0 else Vector3(0, 0)
-        else:
-            drag_acceleration = Vector3(0, 0)  # 月には大気なし
+                    thrust_ax, thrust_ay, thrust_az = (ux * required_thrust_acc, uy * required_thrust_acc,
+                                                       uz * required_thrust_acc)
+        
+        # 空気抵抗（地球支配時のみ、月には大気なし）
+        # 支配天体はカーネルが返す bool で判定済み。推力区間の多く（軌道投入・TLI）は高度だけで外れるので先に見る
+        drag_ax = drag_ay = drag_az = 0.0
+        if altitude <= DRAG_CUTOFF_ALTITUDE and earth_dominant and current_mass > 0:
+            drag_ax, drag_ay, drag_az = self._drag_acceleration(altitude, inv_mass)
         
-        return total_gravity + thrust_acceleration + drag_acceleration
+        return self._acceleration_result(gx + thrust_ax + drag_ax, gy + thrust_ay + drag_ay,
+                                         gz + thrust_az + drag_az, out)
     
-    def _update_mission_phase(self):
+    @staticmethod
+    def _acceleration_result(ax: float, ay: float, az: float, out: Optional[np.ndarray]) -> Vector3:
+        """加速度成分を Vector3 で返す（out 指定時はバッファへ書き込みそれをラップ）"""
+        if out is None:
+            return Vector3(ax, ay, az)
+        out[0], out[1], out[2] = ax, ay, az
+        return Vector3.from_array(out)
+    
+    def _step_context(self, t: float) -> StepContext:
+        """現在状態から StepContext を作る（|r|, |v|, 軌道要素をまとめて一度だけ計算）"""
+        kinematics = self._radial_kinematics()
+        return StepContext(t, kinematics, kinematics[0] - R_EARTH, kinematics[1],
+                           *self.get_orbital_elements(kinematics))
+
+    def _update_mission_phase(self, context: Optional[StepContext] = None):
         """
         ミッションフェーズを更新 (修正版 - LEO投入の安定性を最優先)
+        現在フェーズのハンドラだけを self._phase_handlers から引いて呼ぶ
+        context: ステップ冒頭で計算済みの状態（省略時はここで計算）
         """
-        # 現在の状態を取得
-        altitude = self.get_altitude()
-        velocity = self.rocket.velocity.magnitude()
-        apoapsis, periapsis, eccentricity = self.get_orbital_elements()
+        if context is None:
+            context = self._step_context(self.time)
         current_phase = self.rocket.phase
         
-        # Debug: basic function entry (removed early return to fix staging issue)
-        
         # Debug logging for phase transitions
-        if hasattr(self, '_last_logged_phase') and self._last_logged_phase != current_phase:
+        if self._last_logged_phase is not None and self._last_logged_phase != current_phase:
             self.logger.info(f"Phase changed: {self._last_logged_phase} -> {current_phase}")
         self._last_logged_phase = current_phase
         
-        # Debug: always log current phase when in STAGE_SEPARATION
-        if str(current_phase) == "MissionPhase.STAGE_SEPARATION" or current_phase.value == "stage_separation":
-            self.logger.debug(f"Found STAGE_SEPARATION! current_stage = {self.rocket.current_stage}, type={type(current_phase)}")
-        
-        if current_phase == MissionPhase.STAGE_SEPARATION:
-            self.logger.debug(f"ENUM comparison worked! current_stage = {self.rocket.current_stage}")
-        
         # Additional debug for all phases
-        if hasattr(self, '_debug_counter'):
-            self._debug_counter += 1
-        else:
-            self._debug_counter = 1
-        
-        if self._debug_counter % 1000 == 0:  # Every 100 seconds
-            self.logger.debug(f"Phase debug: t={len(self.time_history)*0.1:.1f}s, phase={current_phase.value}, stage={self.rocket.current_stage}")
+        self._debug_counter += 1
+        
+        if self.logger.isEnabledFor(logging.DEBUG):
+            if current_phase == MissionPhase.STAGE_SEPARATION:
+                self.logger.debug("Found STAGE_SEPARATION! current_stage = %d", self.rocket.current_stage)
+            if self._debug_counter % 1000 == 0:  # Every 100 seconds
+                self.logger.debug("Phase debug: t=%.1fs, phase=%s, stage=%d",
+                                  len(self.phase_history) * 0.1, current_phase.value, self.rocket.current_stage)
 
-        # Professor v19: Realistic MECO conditions for current ΔV capability
-        # Start with achievable intermediate targets, then improve progressively
-        
-        # Professor v19: Much more achievable progressive targets
-        # Based on current capability: max 49.9km apoapsis, max 3041 m/s velocity
-        basic_apoapsis = R_EARTH + 45e3     # 45 km - easily achievable
-        intermediate_apoapsis = R_EARTH + 80e3  # 80 km intermediate target  
-        final_target_apoapsis = R_EARTH + self.target_parking_orbit  # 185 km final target
-        min_periapsis = R_EARTH + 120e3  # 120 km (above atmosphere)
-        
-        # Progressive targeting system - Professor v19: Stage-specific targeting
+        # GRAVITY_TURN（ステージ分離で自動遷移）や終端フェーズにはハンドラがなく、何もしない
+        handler = self._phase_handlers.get(current_phase)
+        if handler is not None:
+            handler(context)
+
+    def _parking_orbit_targets(self, apoapsis: float, periapsis: float) -> Tuple[float, float, bool]:
+        """
+        Professor v19: Stage-specific progressive targeting
+        Returns (target_apoapsis, velocity_threshold, is_stable_parking_orbit)
+        """
         # Stage-2 should raise apoapsis higher, Stage-3 handles circularization
-        current_stage = self.rocket.current_stage
-        
-        if current_stage == 1:  # Stage-2 burning
-            # Stage-2 should achieve higher apoapsis for effective circularization
+        if self.rocket.current_stage == 1:  # Stage-2 burning
             # Need at least 80km apoapsis to have time for circularization
-            target_apoapsis = R_EARTH + 80e3  # 80 km - higher target for circularization time
+            target_apoapsis = STAGE2_TARGET_APOAPSIS_R  # 80 km - higher target for circularization time
             velocity_threshold = 2600  # Higher velocity needed for 80km apoapsis
         else:  # Stage-3 or later
-            # Use basic target for final circularization
-            target_apoapsis = basic_apoapsis  # 45 km minimum for Stage-3
+            target_apoapsis = STAGE3_TARGET_APOAPSIS_R  # 45 km minimum for Stage-3
             velocity_threshold = 2200  # Achievable threshold for Stage-3
         
         # Two-phase approach: 1) Get apoapsis, 2) Get periapsis
-        has_target_apoapsis = apoapsis >= target_apoapsis
-        has_safe_periapsis = periapsis >= min_periapsis
-        
-        # Success: both conditions met
-        is_stable_parking_orbit = has_target_apoapsis and has_safe_periapsis
-        
+        return target_apoapsis, velocity_threshold, apoapsis >= target_apoapsis and periapsis >= MIN_PARKING_PERIAPSIS_R
+
+    def _phase_launch(self, state: StepContext):
+        """LAUNCH: 重力ターン高度に達したら GRAVITY_TURN へ"""
+        altitude = state.altitude
+        if altitude >= self.gravity_turn_altitude:
+            self.rocket.phase = MissionPhase.GRAVITY_TURN
+            self.logger.info(f"Gravity turn initiated at altitude {altitude/1000:.1f} km")
+
+    def _phase_apoapsis_raise(self, state: StepContext):
+        """APOAPSIS_RAISE: 第3段点火トリガ / 駐機軌道到達 / 燃料切れを判定"""
+        altitude, velocity = state.altitude, state.velocity
+        current_time = len(self.phase_history) * 0.1
+        apoapsis, periapsis, eccentricity = state.apoapsis, state.periapsis, state.eccentricity
+        target_apoapsis, velocity_threshold, is_stable_parking_orbit = self._parking_orbit_targets(apoapsis, periapsis)
+
         # Stop condition: target apoapsis achieved with sufficient velocity
         should_stop_burning = False  # Rely on PEG for MECO
-        
+
         # Professor v19: Debug the exact condition values
-        current_time = len(self.time_history) * 0.1
-        if current_phase == MissionPhase.APOAPSIS_RAISE and current_time > 160 and current_time < 200:
-            self.logger.debug(f"Burn stop debug t={current_time:.1f}s: apo={apoapsis:.0f}m (target={target_apoapsis:.0f}m, has={has_target_apoapsis}), "
-                           f"v={velocity:.0f}m/s (threshold={velocity_threshold:.0f}, ok={velocity > velocity_threshold}), "
-                           f"should_stop={should_stop_burning}")
-
-        # ----------------------------------------------------------------
-        # 地球周回軌道投入までのフェーズ管理 (修正済みロジック)
-        # ----------------------------------------------------------------
-
-        if current_phase == MissionPhase.LAUNCH:
-            if altitude >= self.gravity_turn_altitude:
-                self.rocket.phase = MissionPhase.GRAVITY_TURN
-                self.logger.info(f"Gravity turn initiated at altitude {altitude/1000:.1f} km")
-
-        elif current_phase == MissionPhase.GRAVITY_TURN:
-            # ステージ分離時に自動で次のフェーズに遷移するため、ここでは何もしない
-            pass
+        if 160 < current_time < 200 and self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Burn stop debug t=%.1fs: apo=%.0fm (target=%.0fm, has=%s), "
+                              "v=%.0fm/s (threshold=%.0f, ok=%s), should_stop=%s",
+                              current_time, apoapsis, target_apoapsis, apoapsis >= target_apoapsis,
+                              velocity, velocity_threshold, velocity > velocity_threshold, should_stop_burning)
 
-        elif current_phase == MissionPhase.APOAPSIS_RAISE:
-            # 遠地点上昇と円環フェーズのロジックを統合
+        # 遠地点上昇と円環フェーズのロジックを統合
+        
+        # Professor v17: Velocity-triggered Stage-3 ignition (MOVED FROM COAST_TO_APOAPSIS)
+        if is_enabled("VELOCITY_TRIGGERED_STAGE3"):
+            velocity_trigger = velocity >= 3500.0  # m/s - achievable by Stage 2
+            altitude_trigger = altitude >= 30e3   # 30 km - much lower altitude requirement
+            stage3_velocity_trigger = velocity_trigger and altitude_trigger and self.rocket.current_stage == 1  # Trigger while in Stage 2
             
-            # Professor v17: Velocity-triggered Stage-3 ignition (MOVED FROM COAST_TO_APOAPSIS)
-            if is_enabled("VELOCITY_TRIGGERED_STAGE3"):
-                velocity_trigger = velocity >= 3500.0  # m/s - achievable by Stage 2
-                altitude_trigger = altitude >= 30e3   # 30 km - much lower altitude requirement
-                stage3_velocity_trigger = velocity_trigger and altitude_trigger and self.rocket.current_stage == 1  # Trigger while in Stage 2
+            # Debug logging for trigger conditions
+            if velocity >= 3400.0 and self.rocket.current_stage == 1:  # Debug when close (Stage 2)
+                self._stage3_debug_counter += 1
                 
-                # Debug logging for trigger conditions
-                if velocity >= 3400.0 and self.rocket.current_stage == 1:  # Debug when close (Stage 2)
-                    if hasattr(self, '_stage3_debug_counter'):
-                        self._stage3_debug_counter += 1
-                    else:
-                        self._stage3_debug_counter = 1
-                    
-                    if self._stage3_debug_counter % 50 == 0:  # Every 5 seconds when close
-                        self.logger.debug(f"Stage-3 debug: v={velocity:.0f}m/s (≥3500?), alt={altitude/1000:.1f}km (≥30?), stage={self.rocket.current_stage} (==1?)")
-                        self.logger.debug(f"Stage-3 debug: triggers: vel={velocity_trigger}, alt={altitude_trigger}, combined={stage3_velocity_trigger}")
+                # Every 5 seconds when close
+                if self._stage3_debug_counter % 50 == 0 and self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug("Stage-3 debug: v=%.0fm/s (≥3500?), alt=%.1fkm (≥30?), stage=%d (==1?)",
+                                      velocity, altitude / 1000, self.rocket.current_stage)
+                    self.logger.debug("Stage-3 debug: triggers: vel=%s, alt=%s, combined=%s",
+                                      velocity_trigger, altitude_trigger, stage3_velocity_trigger)
+            
+            if stage3_velocity_trigger:
+                # Trigger Stage-2 separation and Stage-3 ignition
+                self.logger.info(f"*** VELOCITY-TRIGGERED STAGE-3 IGNITION ***")
+                self.logger.info(f" -> Velocity: {velocity:.0f} m/s (≥3500 m/s) ✓")
+                self.logger.info(f" -> Altitude: {altitude/1000:.1f} km (≥30 km) ✓")
+                self.logger.info(f" -> Forcing Stage-2 separation for Stage-3 ignition")
                 
-                if stage3_velocity_trigger:
-                    # Trigger Stage-2 separation and Stage-3 ignition
-                    self.logger.info(f"*** VELOCITY-TRIGGERED STAGE-3 IGNITION ***")
-                    self.logger.info(f" -> Velocity: {velocity:.0f} m/s (≥3500 m/s) ✓")
-                    self.logger.info(f" -> Altitude: {altitude/1000:.1f} km (≥30 km) ✓")
-                    self.logger.info(f" -> Forcing Stage-2 separation for Stage-3 ignition")
-                    
-                    # Force Stage 2 separation to trigger Stage 3
-                    if self.rocket.separate_stage(current_time):
-                        self.rocket.phase = MissionPhase.STAGE_SEPARATION
-                        self.logger.info(f"Stage separated: now at stage {self.rocket.current_stage}")
-                    return  # Exit early to allow stage separation to occur
-            
-            # ケース1: 完全成功（安定軌道）に到達したか？
-            if is_stable_parking_orbit:
-                self.rocket.phase = MissionPhase.LEO
-                self.logger.info(f"SUCCESS: Stable parking orbit achieved!")
-                self.logger.info(f" -> Apoapsis: {(apoapsis-R_EARTH)/1000:.1f} km, "
-                               f"Periapsis: {(periapsis-R_EARTH)/1000:.1f} km, e={eccentricity:.3f}")
-            
-            # ケース2: 燃焼停止条件（目標遠地点達成）- Professor v12  
-            elif should_stop_burning:
-                self.rocket.phase = MissionPhase.COAST_TO_APOAPSIS
-                self.logger.info(f"MECO: Target apoapsis achieved, coasting to apoapsis for circularization")
-                self.logger.info(f" -> Apoapsis: {(apoapsis-R_EARTH)/1000:.1f} km (target: {(target_apoapsis-R_EARTH)/1000:.1f} km), "
-                               f"Periapsis: {(periapsis-R_EARTH)/1000:.1f} km, v={velocity:.0f} m/s (threshold: {velocity_threshold:.0f})")
-            
-            # ケース3: ゴール未達のまま燃料が尽きたか？
-            elif not self.rocket.is_thrusting:
-                self.rocket.phase = MissionPhase.FAILED
-                self.logger.error(f"FAILURE: Out of fuel before achieving stable orbit.")
-                self.logger.error(f" -> Final Apoapsis: {(apoapsis-R_EARTH)/1000:.1f} km, "
-                                 f"Final Periapsis: {(periapsis-R_EARTH)/1000:.1f} km")
-            
-            # ケース4: それ以外（ゴール未達で燃料はまだある）の場合は、燃焼を継続
-            # 何もせず、現在のフェーズを維持する
-
-        elif current_phase == MissionPhase.STAGE_SEPARATION or current_phase.value == "stage_separation":
-            # ステージ分離後の正しい遷移
-            self.logger.info(f"*** Processing stage separation: current_stage = {self.rocket.current_stage} ***")
-            if self.rocket.current_stage == 1:  # 第1段分離後 -> 第2段点火
-                self.rocket.phase = MissionPhase.APOAPSIS_RAISE
-                self.logger.info(f"*** Stage 2 ignition for apoapsis raise ***")
-            elif self.rocket.current_stage == 2:  # 第2段分離後 -> Professor v17: velocity-triggered Stage-3
-                # Professor v17: Wait for velocity-triggered ignition instead of immediate Stage-3 ignition
-                self.rocket.phase = MissionPhase.COAST_TO_APOAPSIS
-                self.logger.info(f"*** Stage 2 separation complete. Coasting for velocity-triggered Stage-3 ignition ***")
-                self.logger.info(f"*** Stage-3 ignition trigger: v≥7550 m/s & r≥180 km ***")
-            elif self.rocket.current_stage == 3:  # 第3段分離後 (月着陸船)
-                self.rocket.phase = MissionPhase.LUNAR_ORBIT
-                self.logger.info(f"*** Lunar descent module active. Ready for PDI ***")
-            else:
-                self.logger.warning(f"*** Unexpected stage {self.rocket.current_stage} in separation ***")
-                self.rocket.phase = MissionPhase.LEO # フォールバック
+                # Force Stage 2 separation to trigger Stage 3
+                if self.rocket.separate_stage(current_time):
+                    self.rocket.phase = MissionPhase.STAGE_SEPARATION
+                    self.logger.info(f"Stage separated: now at stage {self.rocket.current_stage}")
+                return  # Exit early to allow stage separation to occur
+        
+        # ケース1: 完全成功（安定軌道）に到達したか？
+        if is_stable_parking_orbit:
+            self.rocket.phase = MissionPhase.LEO
+            self.logger.info(f"SUCCESS: Stable parking orbit achieved!")
+            self.logger.info(f" -> Apoapsis: {(apoapsis-R_EARTH)/1000:.1f} km, "
+                           f"Periapsis: {(periapsis-R_EARTH)/1000:.1f} km, e={eccentricity:.3f}")
+        
+        # ケース2: 燃焼停止条件（目標遠地点達成）- Professor v12  
+        elif should_stop_burning:
+            self.rocket.phase = MissionPhase.COAST_TO_APOAPSIS
+            self.logger.info(f"MECO: Target apoapsis achieved, coasting to apoapsis for circularization")
+            self.logger.info(f" -> Apoapsis: {(apoapsis-R_EARTH)/1000:.1f} km (target: {(target_apoapsis-R_EARTH)/1000:.1f} km), "
+                           f"Periapsis: {(periapsis-R_EARTH)/1000:.1f} km, v={velocity:.0f} m/s (threshold: {velocity_threshold:.0f})")
+        
+        # ケース3: ゴール未達のまま燃料が尽きたか？
+        elif not self.rocket.is_thrusting:
+            self.rocket.phase = MissionPhase.FAILED
+            self.logger.error(f"FAILURE: Out of fuel before achieving stable orbit.")
+            self.logger.error(f" -> Final Apoapsis: {(apoapsis-R_EARTH)/1000:.1f} km, "
+                             f"Final Periapsis: {(periapsis-R_EARTH)/1000:.1f} km")
+        
+        # ケース4: それ以外（ゴール未達で燃料はまだある）の場合は、燃焼を継続
+        # 何もせず、現在のフェーズを維持する
 
-        elif current_phase == MissionPhase.CIRCULARIZATION:
-            # Action A1: Overhauled Circularization Control Logic with S-IVB Engine Cutoff
-            # Professor v41: Enhanced with fuel guard-rail and detailed logging
-            
-            # 1. Get current orbital elements and Stage-3 state
-            apoapsis, periapsis, eccentricity = self.get_orbital_elements()
-            stage3 = self.rocket.stages[2] if len(self.rocket.stages) > 2 else None
-            
-            # 2. Professor v41: Detailed Stage-3 fuel logging
-            if stage3 and hasattr(self, 'circularization_start_time'):
-                burn_duration = self.t - self.circularization_start_time
-                mass_flow_rate = stage3.get_mass_flow_rate(self.get_altitude())
+    def _phase_stage_separation(self, state: StepContext):
+        """STAGE_SEPARATION: 分離後の段に応じて次フェーズへ"""
+        # ステージ分離後の正しい遷移
+        self.logger.info(f"*** Processing stage separation: current_stage = {self.rocket.current_stage} ***")
+        if self.rocket.current_stage == 1:  # 第1段分離後 -> 第2段点火
+            self.rocket.phase = MissionPhase.APOAPSIS_RAISE
+            self.logger.info(f"*** Stage 2 ignition for apoapsis raise ***")
+        elif self.rocket.current_stage == 2:  # 第2段分離後 -> Professor v17: velocity-triggered Stage-3
+            # Professor v17: Wait for velocity-triggered ignition instead of immediate Stage-3 ignition
+            self.rocket.phase = MissionPhase.COAST_TO_APOAPSIS
+            self.logger.info(f"*** Stage 2 separation complete. Coasting for velocity-triggered Stage-3 ignition ***")
+            self.logger.info(f"*** Stage-3 ignition trigger: v≥7550 m/s & r≥180 km ***")
+        elif self.rocket.current_stage == 3:  # 第3段分離後 (月着陸船)
+            self.rocket.phase = MissionPhase.LUNAR_ORBIT
+            self.logger.info(f"*** Lunar descent module active. Ready for PDI ***")
+        else:
+            self.logger.warning(f"*** Unexpected stage {self.rocket.current_stage} in separation ***")
+            self.rocket.phase = MissionPhase.LEO # フォールバック
+
+    def _phase_circularization(self, state: StepContext):
+        """CIRCULARIZATION: S-IVB 円化燃焼の終了判定"""
+        # Action A1: Overhauled Circularization Control Logic with S-IVB Engine Cutoff
+        # Professor v41: Enhanced with fuel guard-rail and detailed logging
+        
+        # 1. Get current orbital elements and Stage-3 state（ステップ冒頭で計算済みの値を使う）
+        apoapsis, periapsis, eccentricity = state.apoapsis, state.periapsis, state.eccentricity
+        stage3 = self.rocket.stages[2] if len(self.rocket.stages) > 2 else None
+        
+        # 2. Professor v41: Detailed Stage-3 fuel logging (DEBUG無効時は計算ごと省く)
+        if stage3 and self.circularization_start_time is not None:
+            # Log every step (0.1s) as requested by professor
+            if self.logger.isEnabledFor(logging.DEBUG):
+                mass_flow_rate = stage3.get_mass_flow_rate(state.altitude)
                 fuel_remaining = stage3.propellant_mass
-                fuel_fraction = fuel_remaining / 160000.0  # Original propellant mass
-                periapsis_error = periapsis - (R_EARTH + 180e3)  # Target 180km periapsis
-                
-                # Log every 0.1s as requested by professor
-                if self.t % 0.1 < 0.05:  # Approximately every 0.1s
-                    self.logger.debug(
-                        f"{self.t:.1f}s | m_dot={mass_flow_rate:.3f} kg/s "
-                        f"fuel_left={fuel_remaining:.1f} kg ({fuel_fraction*100:.1f}%) "
-                        f"periapsis_err={periapsis_error:.1f} m"
-                    )
-            elif not hasattr(self, 'circularization_start_time'):
-                # First time entering circularization phase
-                self.circularization_start_time = self.t
-                self.logger.info(f"CIRCULARIZATION BURN START at t={self.t:.1f}s")
-            
-            # 3. Professor v41: Fuel guard-rail limiter (5% minimum)
-            if stage3 and stage3.propellant_mass > 0:
-                fuel_fraction = stage3.propellant_mass / 160000.0
-                if fuel_fraction <= 0.05:
-                    self.rocket.phase = MissionPhase.LEO_STABLE
-                    self.logger.warning("Fuel guard-rail hit; forcing burn shutdown.")
-                    self.logger.warning(f" -> Fuel remaining: {fuel_fraction*100:.1f}% (≤5%)")
-                    self.logger.warning(f" -> Residual periapsis: {(periapsis-R_EARTH)/1000:.1f} km")
-                    return
-            
-            # 4. Check for burn termination using guidance system
-            from guidance import should_end_circularization_burn
-            if hasattr(self, 'circularization_start_time') and should_end_circularization_burn(self, self.t, self.circularization_start_time):
-                # Professor v29: Command S-IVB engine shutdown for stable orbit
+                fuel_fraction = fuel_remaining / STAGE3_INITIAL_PROPELLANT
+                periapsis_error = periapsis - CIRCULARIZATION_TARGET_PERIAPSIS_R
+                self.logger.debug("%.1fs | m_dot=%.3f kg/s fuel_left=%.1f kg (%.1f%%) periapsis_err=%.1f m",
+                                  state.t, mass_flow_rate, fuel_remaining, fuel_fraction * 100, periapsis_error)
+        elif self.circularization_start_time is None:
+            # First time entering circularization phase
+            self.circularization_start_time = state.t
+            self.logger.info("CIRCULARIZATION BURN START at t=%.1fs", state.t)
+        
+        # 3. Professor v41: Fuel guard-rail limiter (5% minimum)
+        if stage3 and stage3.propellant_mass > 0:
+            fuel_fraction = stage3.propellant_mass / STAGE3_INITIAL_PROPELLANT
+            if fuel_fraction <= 0.05:
                 self.rocket.phase = MissionPhase.LEO_STABLE
-                self.logger.info(f"SUCCESS: S-IVB ENGINE CUTOFF - Circularization complete!")
-                self.logger.info(f" -> Apoapsis: {(apoapsis-R_EARTH)/1000:.1f} km, Periapsis: {(periapsis-R_EARTH)/1000:.1f} km")
-                self.logger.info(f" -> Eccentricity: {eccentricity:.4f}")
-                if stage3:
-                    fuel_fraction = stage3.propellant_mass / 160000.0
-                    self.logger.info(f" -> Stage-3 fuel remaining: {fuel_fraction*100:.1f}%")
-            
-            elif not self.rocket.is_thrusting:
-                self.rocket.phase = MissionPhase.FAILED
-                self.logger.error(f"FAILURE: Out of fuel during circularization burn.")
-                self.logger.error(f" -> Final Periapsis: {(periapsis-R_EARTH)/1000:.1f} km (Target > 180 km)")
-                self.logger.error(f" -> Final Eccentricity: {eccentricity:.4f} (Target < 0.05)")
-
-            # else: continue burning...
-
-        elif current_phase == MissionPhase.COAST_TO_APOAPSIS:
-            # Action A2: Refine Burn Initiation Timing
-            flight_path_angle_deg = np.degrees(self.get_flight_path_angle())
-            apoapsis, periapsis, _ = self.get_orbital_elements()
-
-            # The most efficient time to burn is exactly at apoapsis,
-            # where the flight path angle is zero.
-            is_at_apoapsis = flight_path_angle_deg <= 0.1  # Trigger as we approach/pass apoapsis
-
-            # Ensure we have fuel for Stage-3 and the orbit is not already circular
-            stage3_has_fuel = len(self.rocket.stages) > 2 and self.rocket.stages[2].propellant_mass > 0
-            can_circularize = stage3_has_fuel and periapsis < (R_EARTH + 120e3)
-
-            if is_at_apoapsis and can_circularize:
-                self.rocket.phase = MissionPhase.CIRCULARIZATION
-                self.logger.info(f"APOAPSIS PASS. Initiating circularization burn.")
-                self.logger.info(f" -> Flight Path Angle: {flight_path_angle_deg:.3f} deg, Altitude: {self.get_altitude()/1000:.1f} km")
-            elif not stage3_has_fuel and periapsis < (R_EARTH + 120e3):
-                # Out of fuel but still suborbital
-                self.rocket.phase = MissionPhase.FAILED
-                self.logger.error(f"Circularization failed: out of fuel with suborbital trajectory")
-                self.logger.error(f" -> Periapsis: {(periapsis-R_EARTH)/1000:.1f} km")
+                self.logger.warning("Fuel guard-rail hit; forcing burn shutdown.")
+                self.logger.warning(f" -> Fuel remaining: {fuel_fraction*100:.1f}% (≤5%)")
+                self.logger.warning(f" -> Residual periapsis: {(periapsis-R_EARTH)/1000:.1f} km")
+                return
+        
+        # 4. Check for burn termination using guidance system
+        if self.circularization_start_time is not None and should_end_circularization_burn(self, state.t, self.circularization_start_time):
+            # Professor v29: Command S-IVB engine shutdown for stable orbit
+            self.rocket.phase = MissionPhase.LEO_STABLE
+            self.logger.info(f"SUCCESS: S-IVB ENGINE CUTOFF - Circularization complete!")
+            self.logger.info(f" -> Apoapsis: {(apoapsis-R_EARTH)/1000:.1f} km, Periapsis: {(periapsis-R_EARTH)/1000:.1f} km")
+            self.logger.info(f" -> Eccentricity: {eccentricity:.4f}")
+            if stage3:
+                fuel_fraction = stage3.propellant_mass / STAGE3_INITIAL_PROPELLANT
+                self.logger.info(f" -> Stage-3 fuel remaining: {fuel_fraction*100:.1f}%")
+        
+        elif not self.rocket.is_thrusting:
+            self.rocket.phase = MissionPhase.FAILED
+            self.logger.error(f"FAILURE: Out of fuel during circularization burn.")
+            self.logger.error(f" -> Final Periapsis: {(periapsis-R_EARTH)/1000:.1f} km (Target > 180 km)")
+            self.logger.error(f" -> Final Eccentricity: {eccentricity:.4f} (Target < 0.05)")
 
-        # ----------------------------------------------------------------
-        # 月遷移軌道以降のフェーズ管理 (元のロジックを維持)
-        # ----------------------------------------------------------------
+        # else: continue burning...
 
-        elif current_phase == MissionPhase.LEO:
-            # LEOでの待機からTLIフェーズへの遷移
-            coast_time = len([p for p in self.phase_history if p == MissionPhase.LEO]) * 0.1
-            
-            # 安定した軌道で30秒待機したら月へ
-            if self.rocket.current_stage == 2 and is_stable_parking_orbit and coast_time > 30:
-                self.rocket.phase = MissionPhase.TLI_BURN
-                self.logger.info("LEO parking complete. Initiating Trans-Lunar Injection burn!")
-            elif coast_time > 600 and not is_stable_parking_orbit: # 10分待っても不安定なら失敗
-                self.rocket.phase = MissionPhase.FAILED
-                self.logger.error(f"Failed to maintain stable LEO. Orbit decayed.")
+    def _phase_coast_to_apoapsis(self, state: StepContext):
+        """COAST_TO_APOAPSIS: 遠地点通過で円化燃焼を開始"""
+        # Action A2: Refine Burn Initiation Timing
+        flight_path_angle_deg = math.degrees(self.get_flight_path_angle(state.kinematics))
+        periapsis = state.periapsis
 
-        elif current_phase == MissionPhase.LEO_STABLE:
-            # Professor v29: New stable LEO phase with S-IVB engine off
-            # Professor v33: Enhanced LEO_STABLE with launch window calculation
-            coast_time = len([p for p in self.phase_history if p == MissionPhase.LEO_STABLE]) * 0.1
-            
-            # Professor v39: Calculate TLI delta-V requirements immediately after LEO achievement
-            if not hasattr(self, 'tli_delta_v_calculated') and coast_time > 5:
-                self._calculate_and_report_tli_requirements()
-                self.tli_delta_v_calculated = True
-            
-            # Calculate optimal TLI time if not already calculated
-            if self.tli_optimal_time is None and coast_time > 10:  # Wait 10s for orbit stabilization
-                try:
-                    # Convert positions to numpy arrays for launch window calculator
-                    moon_pos_np = np.array([self.moon.position.x, self.moon.position.y, 0])
-                    spacecraft_pos_np = np.array([self.rocket.position.x, self.rocket.position.y, 0])
-                    
-                    # Target C3 energy for Trans-Lunar trajectory (typical value: -2 to -1 km²/s²)
-                    target_c3_energy = -1.5  # km²/s²
-                    
-                    # Calculate optimal TLI time
-                    launch_window_info = self.launch_window_calculator.get_launch_window_info(
-                        len(self.time_history) * 0.1,  # current time
-                        moon_pos_np, spacecraft_pos_np, target_c3_energy
-                    )
-                    
-                    self.tli_optimal_time = launch_window_info['optimal_tli_time']
-                    self.logger.info("=== LAUNCH WINDOW CALCULATION COMPLETE ===")
-                    self.logger.info(f"Optimal TLI time: {self.tli_optimal_time:.1f}s (T+{self.tli_optimal_time - len(self.time_history) * 0.1:.1f}s)")
-                    self.logger.info(f"Required phase angle: {launch_window_info['required_phase_angle_deg']:.1f}°")
-                    self.logger.info(f"Transfer time: {launch_window_info['transfer_time_days']:.2f} days")
-                    self.logger.info(f"Target C3 energy: {launch_window_info['c3_energy']:.2f} km²/s²")
-                    
-                except Exception as e:
-                    self.logger.error(f"Launch window calculation failed: {e}")
-                    # Fallback: TLI after 30s as before
-                    self.tli_optimal_time = len(self.time_history) * 0.1 + 30
-            
-            # Execute TLI at optimal time
-            current_time = len(self.time_history) * 0.1
-            if (self.tli_optimal_time is not None and 
-                current_time >= self.tli_optimal_time and 
-                self.rocket.current_stage == 2 and 
-                not self.tli_executed):
-                
-                self.rocket.phase = MissionPhase.TLI_BURN
-                self.tli_executed = True
-                self.logger.info("=== TRANS-LUNAR INJECTION INITIATED ===")
-                self.logger.info(f"TLI burn started at optimal time: T+{current_time:.1f}s")
-                
-            elif coast_time > 600: # 10分待っても TLI が始まらない場合は成功とみなす
-                self.logger.info(f"LEO_STABLE maintained successfully for {coast_time:.1f}s. Mission complete.")
-                # Mission stays in LEO_STABLE - this is a success state
+        # The most efficient time to burn is exactly at apoapsis,
+        # where the flight path angle is zero.
+        is_at_apoapsis = flight_path_angle_deg <= 0.1  # Trigger as we approach/pass apoapsis
+
+        # Ensure we have fuel for Stage-3 and the orbit is not already circular
+        stage3_has_fuel = len(self.rocket.stages) > 2 and self.rocket.stages[2].propellant_mass > 0
+        can_circularize = stage3_has_fuel and periapsis < MIN_PARKING_PERIAPSIS_R
 
+        if is_at_apoapsis and can_circularize:
+            self.rocket.phase = MissionPhase.CIRCULARIZATION
+            self.logger.info(f"APOAPSIS PASS. Initiating circularization burn.")
+            self.logger.info(f" -> Flight Path Angle: {flight_path_angle_deg:.3f} deg, Altitude: {state.altitude/1000:.1f} km")
+        elif not stage3_has_fuel and periapsis < MIN_PARKING_PERIAPSIS_R:
+            # Out of fuel but still suborbital
+            self.rocket.phase = MissionPhase.FAILED
+            self.logger.error(f"Circularization failed: out of fuel with suborbital trajectory")
+            self.logger.error(f" -> Periapsis: {(periapsis-R_EARTH)/1000:.1f} km")
+
+    def _phase_leo(self, state: StepContext):
+        """LEO: 安定した駐機軌道で待機後 TLI へ"""
+        _, _, is_stable_parking_orbit = self._parking_orbit_targets(state.apoapsis, state.periapsis)
+
+        # LEOでの待機からTLIフェーズへの遷移
+        coast_time = self.phase_history.count(MissionPhase.LEO) * 0.1
+        
+        # 安定した軌道で30秒待機したら月へ
+        if self.rocket.current_stage == 2 and is_stable_parking_orbit and coast_time > 30:
+            self.rocket.phase = MissionPhase.TLI_BURN
+            self.logger.info("LEO parking complete. Initiating Trans-Lunar Injection burn!")
+        elif coast_time > 600 and not is_stable_parking_orbit: # 10分待っても不安定なら失敗
+            self.rocket.phase = MissionPhase.FAILED
+            self.logger.error(f"Failed to maintain stable LEO. Orbit decayed.")
 
-        elif current_phase == MissionPhase.TLI_BURN:
-            # Professor v29: Enhanced TLI burn with proper guidance termination
-            # Check if TLI guidance indicates burn completion
+    def _phase_leo_stable(self, state: StepContext):
+        """LEO_STABLE: 打ち上げウィンドウを計算し最適時刻に TLI を開始"""
+        # Professor v29: New stable LEO phase with S-IVB engine off
+        # Professor v33: Enhanced LEO_STABLE with launch window calculation
+        coast_time = self.phase_history.count(MissionPhase.LEO_STABLE) * 0.1
+        current_time = len(self.phase_history) * 0.1
+        
+        # Professor v39: Calculate TLI delta-V requirements immediately after LEO achievement
+        if not self.tli_delta_v_calculated and coast_time > 5:
+            self._calculate_and_report_tli_requirements()
+            self.tli_delta_v_calculated = True
+        
+        # Calculate optimal TLI time if not already calculated
+        if self.tli_optimal_time is None and coast_time > 10:  # Wait 10s for orbit stabilization
             try:
-                # Get TLI strategy from guidance context
-                if hasattr(self.guidance_context, 'current_strategy') and hasattr(self.guidance_context.current_strategy, 'tli_guidance'):
-                    tli_guidance = self.guidance_context.current_strategy.tli_guidance
-                    tli_status = tli_guidance.get_trajectory_status()
-                    
-                    # Enhanced termination criteria using TLI guidance
-                    burn_complete = tli_guidance.should_terminate_burn(self.rocket.velocity)
-                    
-                    if burn_complete or not self.rocket.is_thrusting:
-                        self.rocket.phase = MissionPhase.COAST_TO_MOON
-                        self.logger.info(f"TLI burn complete. Coasting to Moon...")
-                        escape_velocity = np.sqrt(2 * G * M_EARTH / self.rocket.position.magnitude())
-                        current_c3 = velocity**2 - escape_velocity**2
-                        self.max_c3_energy = max(self.max_c3_energy, current_c3)  # Professor v30: Track max C3
-                        self.logger.info(f"Current velocity: {velocity:.0f} m/s (Escape vel: {escape_velocity:.0f} m/s)")
-                        self.logger.info(f"C3 energy achieved: {current_c3:.1f} m²/s² (Target: {tli_guidance.tli_params.target_c3_energy:.1f})")
-                        self.logger.info(f"Burn duration: {tli_status.get('burn_elapsed_time', 0):.1f} s")
-                else:
-                    # Fallback to original logic
-                    if not self.rocket.is_thrusting:
-                        self.rocket.phase = MissionPhase.COAST_TO_MOON
-                        self.logger.info(f"TLI burn complete. Coasting to Moon...")
-                        escape_velocity = np.sqrt(2 * G * M_EARTH / self.rocket.position.magnitude())
-                        self.logger.info(f"Current velocity: {velocity:.0f} m/s (Escape vel: {escape_velocity:.0f} m/s)")
+                # Convert positions to numpy arrays for launch window calculator
+                moon_pos_np = np.array([self.moon.position.x, self.moon.position.y, 0])
+                spacecraft_pos_np = np.array([self.rocket.position.x, self.rocket.position.y, 0])
+                
+                # Target C3 energy for Trans-Lunar trajectory (typical value: -2 to -1 km²/s²)
+                target_c3_energy = -1.5  # km²/s²
+                
+                # Calculate optimal TLI time
+                launch_window_info = self.launch_window_calculator.get_launch_window_info(
+                    current_time,
+                    moon_pos_np, spacecraft_pos_np, target_c3_energy
+                )
+                
+                self.tli_optimal_time = launch_window_info['optimal_tli_time']
+                self.logger.info("=== LAUNCH WINDOW CALCULATION COMPLETE ===")
+                self.logger.info(f"Optimal TLI time: {self.tli_optimal_time:.1f}s (T+{self.tli_optimal_time - current_time:.1f}s)")
+                self.logger.info(f"Required phase angle: {launch_window_info['required_phase_angle_deg']:.1f}°")
+                self.logger.info(f"Transfer time: {launch_window_info['transfer_time_days']:.2f} days")
+                self.logger.info(f"Target C3 energy: {launch_window_info['c3_energy']:.2f} km²/s²")
+                
             except Exception as e:
-                self.logger.warning(f"TLI guidance error: {e}, using fallback logic")
+                self.logger.error(f"Launch window calculation failed: {e}")
+                # Fallback: TLI after 30s as before
+                self.tli_optimal_time = current_time + 30
+        
+        # Execute TLI at optimal time
+        if (self.tli_optimal_time is not None and 
+            current_time >= self.tli_optimal_time and 
+            self.rocket.current_stage == 2 and 
+            not self.tli_executed):
+            
+            self.rocket.phase = MissionPhase.TLI_BURN
+            self.tli_executed = True
+            self.logger.info("=== TRANS-LUNAR INJECTION INITIATED ===")
+            self.logger.info(f"TLI burn started at optimal time: T+{current_time:.1f}s")
+            
+        elif coast_time > 600: # 10分待っても TLI が始まらない場合は成功とみなす
+            self.logger.info(f"LEO_STABLE maintained successfully for {coast_time:.1f}s. Mission complete.")
+            # Mission stays in LEO_STABLE - this is a success state
+
+    def _phase_tli_burn(self, state: StepContext):
+        """TLI_BURN: TLI 誘導の燃焼終了判定"""
+        velocity = state.velocity
+        # Professor v29: Enhanced TLI burn with proper guidance termination
+        # Check if TLI guidance indicates burn completion
+        try:
+            # Get TLI strategy from guidance context
+            if hasattr(self.guidance_context, 'current_strategy') and hasattr(self.guidance_context.current_strategy, 'tli_guidance'):
+                tli_guidance = self.guidance_context.current_strategy.tli_guidance
+                tli_status = tli_guidance.get_trajectory_status()
+                
+                # Enhanced termination criteria using TLI guidance
+                burn_complete = tli_guidance.should_terminate_burn(self.rocket.velocity)
+                
+                if burn_complete or not self.rocket.is_thrusting:
+                    self.rocket.phase = MissionPhase.COAST_TO_MOON
+                    self.logger.info(f"TLI burn complete. Coasting to Moon...")
+                    escape_velocity = math.sqrt(2 * G * M_EARTH / self.rocket.position.magnitude())
+                    current_c3 = velocity**2 - escape_velocity**2
+                    self.max_c3_energy = max(self.max_c3_energy, current_c3)  # Professor v30: Track max C3
+                    self.logger.info(f"Current velocity: {velocity:.0f} m/s (Escape vel: {escape_velocity:.0f} m/s)")
+                    self.logger.info(f"C3 energy achieved: {current_c3:.1f} m²/s² (Target: {tli_guidance.tli_params.target_c3_energy:.1f})")
+                    self.logger.info(f"Burn duration: {tli_status.get('burn_elapsed_time', 0):.1f} s")
+            else:
+                # Fallback to original logic
                 if not self.rocket.is_thrusting:
                     self.rocket.phase = MissionPhase.COAST_TO_MOON
                     self.logger.info(f"TLI burn complete. Coasting to Moon...")
-                    escape_velocity = np.sqrt(2 * G * M_EARTH / self.rocket.position.magnitude())
+                    escape_velocity = math.sqrt(2 * G * M_EARTH / self.rocket.position.magnitude())
                     self.logger.info(f"Current velocity: {velocity:.0f} m/s (Escape vel: {escape_velocity:.0f} m/s)")
+        except Exception as e:
+            self.logger.warning(f"TLI guidance error: {e}, using fallback logic")
+            if not self.rocket.is_thrusting:
+                self.rocket.phase = MissionPhase.COAST_TO_MOON
+                self.logger.info(f"TLI burn complete. Coasting to Moon...")
+                escape_velocity = math.sqrt(2 * G * M_EARTH / self.rocket.position.magnitude())
+                self.logger.info(f"Current velocity: {velocity:.0f} m/s (Escape vel: {escape_velocity:.0f} m/s)")
 
-        elif current_phase == MissionPhase.COAST_TO_MOON:
-            # Professor v33: Enhanced coast to Moon with Mid-Course Correction
-            coast_time = len([p for p in self.phase_history if p == current_phase]) * 0.1
-            current_time_total = len(self.time_history) * 0.1
-            
-            # Execute Mid-Course Correction at halfway point
-            if not self.mcc_executed and coast_time > 1.5 * 24 * 3600:  # 1.5 days into coast
-                try:
-                    # Calculate MCC burn for trajectory correction
-                    current_pos = np.array([self.rocket.position.x, self.rocket.position.y, self.rocket.position.z])
-                    current_vel = np.array([self.rocket.velocity.x, self.rocket.velocity.y, self.rocket.velocity.z])
-                    moon_pos = np.array([self.moon.position.x, self.moon.position.y, 0])
-                    
-                    # Simple MCC calculation: 5 m/s correction toward Moon
-                    moon_direction = moon_pos - current_pos[:2]
-                    moon_direction = moon_direction / np.linalg.norm(moon_direction) if np.linalg.norm(moon_direction) > 0 else np.array([0, 1])
-                    mcc_delta_v = np.array([moon_direction[0] * 5.0, moon_direction[1] * 5.0, 0.0])  # 5 m/s toward Moon
-                    
-                    # Execute MCC burn
-                    new_pos, new_vel = self.mid_course_correction.execute_mcc_burn(
-                        (current_pos, current_vel), mcc_delta_v
-                    )
-                    
-                    # Update spacecraft state
-                    self.rocket.position = Vector3(new_pos[0], new_pos[1], new_pos[2])
-                    self.rocket.velocity = Vector3(new_vel[0], new_vel[1], new_vel[2])
-                    
-                    self.mcc_executed = True
-                    self.total_mission_delta_v += np.linalg.norm(mcc_delta_v)
-                    
-                    self.logger.info("=== MID-COURSE CORRECTION EXECUTED ===")
-                    self.logger.info(f"MCC burn executed at T+{current_time_total:.1f}s (coast phase T+{coast_time:.1f}s)")
-                    self.logger.info(f"Delta-V applied: {np.linalg.norm(mcc_delta_v):.2f} m/s toward Moon")
-                    self.logger.info(f"New velocity: {self.rocket.velocity.magnitude():.2f} m/s")
-                    
-                except Exception as e:
-                    self.logger.error(f"Mid-Course Correction failed: {e}")
-                    self.mcc_executed = True  # Mark as attempted to prevent retry
-            
-            # Check for SOI transition using patched conic solver
-            spacecraft_pos_km = self.rocket.position * 1e-3  # Convert to km
-            moon_pos_km = self.moon.position * 1e-3  # Convert to km
-            
-            if check_soi_transition(spacecraft_pos_km, moon_pos_km):
-                # Convert to lunar frame for trajectory analysis
-                spacecraft_state = (spacecraft_pos_km, self.rocket.velocity * 1e-3)
-                moon_state = (moon_pos_km, self.moon.velocity * 1e-3)
-                pos_lci, vel_lci = convert_to_lunar_frame(spacecraft_state, moon_state)
+    def _phase_coast_to_moon(self, state: StepContext):
+        """COAST_TO_MOON: 中間軌道修正と月 SOI 進入判定"""
+        # Professor v33: Enhanced coast to Moon with Mid-Course Correction
+        coast_time = self.phase_history.count(MissionPhase.COAST_TO_MOON) * 0.1
+        current_time_total = len(self.phase_history) * 0.1
+        
+        # Execute Mid-Course Correction at halfway point
+        if not self.mcc_executed and coast_time > 1.5 * 24 * 3600:  # 1.5 days into coast
+            try:
+                # Calculate MCC burn for trajectory correction
+                current_pos = self.rocket.position.data.copy()
+                current_vel = self.rocket.velocity.data.copy()
                 
-                self.rocket.phase = MissionPhase.LOI_BURN
-                self.logger.info("=== LUNAR SPHERE OF INFLUENCE ENTRY ===")
-                self.logger.info(f"Entered Moon's Sphere of Influence using patched conic solver.")
-                self.logger.info(f"Lunar-centered position: {np.linalg.norm(pos_lci):.1f} km")
-                self.logger.info(f"Lunar-centered velocity: {np.linalg.norm(vel_lci):.3f} km/s")
-                self.logger.info(f"Coast phase duration: {coast_time/3600:.1f} hours")
+                # Simple MCC calculation: 5 m/s correction toward Moon
+                moon_direction = self.moon.position.data[:2] - current_pos[:2]
+                moon_direction = moon_direction / np.linalg.norm(moon_direction) if np.linalg.norm(moon_direction) > 0 else np.array([0, 1])
+                mcc_delta_v = np.array([moon_direction[0] * 5.0, moon_direction[1] * 5.0, 0.0])  # 5 m/s toward Moon
                 
-            elif coast_time > 5 * 24 * 3600: # 5日以上かかったら失敗
-                self.rocket.phase = MissionPhase.FAILED
-                self.logger.error("Failed to reach Moon SOI within 5 days.")
+                # Execute MCC burn
+                new_pos, new_vel = self.mid_course_correction.execute_mcc_burn(
+                    (current_pos, current_vel), mcc_delta_v
+                )
+                
+                # Update spacecraft state
+                self.rocket.position = Vector3(new_pos[0], new_pos[1], new_pos[2])
+                self.rocket.velocity = Vector3(new_vel[0], new_vel[1], new_vel[2])
+                
+                self.mcc_executed = True
+                self.total_mission_delta_v += np.linalg.norm(mcc_delta_v)
+                
+                self.logger.info("=== MID-COURSE CORRECTION EXECUTED ===")
+                self.logger.info(f"MCC burn executed at T+{current_time_total:.1f}s (coast phase T+{coast_time:.1f}s)")
+                self.logger.info(f"Delta-V applied: {np.linalg.norm(mcc_delta_v):.2f} m/s toward Moon")
+                self.logger.info(f"New velocity: {self.rocket.velocity.magnitude():.2f} m/s")
+                
+            except Exception as e:
+                self.logger.error(f"Mid-Course Correction failed: {e}")
+                self.mcc_executed = True  # Mark as attempted to prevent retry
+        
+        # Check for SOI transition using patched conic solver (solver works on km arrays)
+        spacecraft_pos_km = self.rocket.position.data * 1e-3  # Convert to km
+        moon_pos_km = self.moon.position.data * 1e-3  # Convert to km
+        
+        if check_soi_transition(spacecraft_pos_km, moon_pos_km):
+            # Convert to lunar frame for trajectory analysis
+            spacecraft_state = (spacecraft_pos_km, self.rocket.velocity.data * 1e-3)
+            moon_state = (moon_pos_km, self.moon.velocity.data * 1e-3)
+            pos_lci, vel_lci = convert_to_lunar_frame(spacecraft_state, moon_state)
+            
+            self.rocket.phase = MissionPhase.LOI_BURN
+            self.logger.info("=== LUNAR SPHERE OF INFLUENCE ENTRY ===")
+            self.logger.info(f"Entered Moon's Sphere of Influence using patched conic solver.")
+            self.logger.info(f"Lunar-centered position: {np.linalg.norm(pos_lci):.1f} km")
+            self.logger.info(f"Lunar-centered velocity: {np.linalg.norm(vel_lci):.3f} km/s")
+            self.logger.info(f"Coast phase duration: {coast_time/3600:.1f} hours")
+            
+        elif coast_time > 5 * 24 * 3600: # 5日以上かかったら失敗
+            self.rocket.phase = MissionPhase.FAILED
+            self.logger.error("Failed to reach Moon SOI within 5 days.")
 
-        elif current_phase == MissionPhase.LOI_BURN:
-            # Professor v33: Enhanced LOI burn using circularize.py for precise lunar orbit insertion
-            r_moon = (self.rocket.position - self.moon.position).magnitude()
-            v_moon_relative = (self.rocket.velocity - self.moon.velocity).magnitude()
-            moon_orbital_energy = 0.5 * v_moon_relative**2 - G * M_MOON / r_moon
-            
-            # Execute LOI burn at periapsis for optimal efficiency
-            if not self.loi_executed:
-                try:
-                    # Calculate relative position and velocity in lunar frame
-                    rel_pos = self.rocket.position - self.moon.position
-                    rel_vel = self.rocket.velocity - self.moon.velocity
+    def _phase_loi_burn(self, state: StepContext):
+        """LOI_BURN: 月周回軌道投入燃焼と捕獲判定"""
+        # Professor v33: Enhanced LOI burn using circularize.py for precise lunar orbit insertion
+        r_moon_sq, v_moon_relative_sq, radial_dot = self._moon_relative_state()
+        r_moon = math.sqrt(r_moon_sq)
+        moon_orbital_energy = 0.5 * v_moon_relative_sq - GM_MOON / r_moon
+        
+        # Execute LOI burn at periapsis for optimal efficiency
+        if not self.loi_executed:
+            try:
+                # Check if we're at or near periapsis (optimal burn point)
+                at_periapsis = radial_dot * radial_dot < 50.0**2 * r_moon_sq  # Within 50 m/s of periapsis (|r·v|/|r| < 50)
+                
+                if at_periapsis or not self._loi_burn_started:
+                    # Start LOI burn
+                    self._loi_burn_started = True
                     
-                    # Check if we're at or near periapsis (optimal burn point)
-                    radial_velocity = rel_vel.data @ rel_pos.normalized().data
-                    at_periapsis = abs(radial_velocity) < 50.0  # Within 50 m/s of periapsis
+                    # Calculate required delta-V for lunar orbit capture
+                    # Target: 100km circular lunar orbit
+                    target_altitude = 100e3  # 100 km
+                    target_radius = R_MOON + target_altitude
                     
-                    if at_periapsis or not hasattr(self, '_loi_burn_started'):
-                        # Start LOI burn
-                        self._loi_burn_started = True
-                        
-                        # Calculate required delta-V for lunar orbit capture
-                        # Target: 100km circular lunar orbit
-                        target_altitude = 100e3  # 100 km
-                        target_radius = R_MOON + target_altitude
-                        
-                        # Current velocity in lunar frame
-                        v_current = rel_vel.magnitude()
+                    # Current velocity in lunar frame
+                    v_current = math.sqrt(v_moon_relative_sq)
+                    
+                    # Velocity for circular orbit at current distance
+                    v_circular = math.sqrt(G * M_MOON / r_moon)
+                    
+                    # If we're too fast, slow down for capture
+                    if v_current > v_circular * 1.2:  # Need significant slowdown
+                        # Retrograde burn to slow down for capture
+                        rel_vel = self.rocket.velocity - self.moon.velocity
+                        burn_magnitude = min((v_current - v_circular) * 0.8, 500.0)  # Limit to 500 m/s
+                        burn_direction = rel_vel.normalized() * (-1)  # Retrograde
                         
-                        # Velocity for circular orbit at current distance
-                        v_circular = np.sqrt(G * M_MOON / r_moon)
+                        # Apply LOI burn
+                        delta_v = burn_direction * burn_magnitude
+                        self.rocket.velocity = self.rocket.velocity + delta_v
+                        self.total_mission_delta_v += burn_magnitude
                         
-                        # If we're too fast, slow down for capture
-                        if v_current > v_circular * 1.2:  # Need significant slowdown
-                            # Retrograde burn to slow down for capture
-                            burn_magnitude = min((v_current - v_circular) * 0.8, 500.0)  # Limit to 500 m/s
-                            burn_direction = rel_vel.normalized() * (-1)  # Retrograde
-                            
-                            # Apply LOI burn
-                            delta_v = burn_direction * burn_magnitude
-                            self.rocket.velocity = self.rocket.velocity + delta_v
-                            self.total_mission_delta_v += burn_magnitude
-                            
-                            self.loi_executed = True
-                            
-                            self.logger.info("=== LUNAR ORBIT INSERTION BURN ===")
-                            self.logger.info(f"LOI burn executed: {burn_magnitude:.1f} m/s retrograde")
-                            self.logger.info(f"Altitude at burn: {(r_moon - R_MOON)/1000:.1f} km")
-                            self.logger.info(f"Pre-burn velocity: {v_current:.1f} m/s, Post-burn: {(rel_vel + delta_v).magnitude():.1f} m/s")
+                        self.loi_executed = True
                         
-                except Exception as e:
-                    self.logger.error(f"LOI burn calculation failed: {e}")
-                    self.loi_executed = True  # Mark as attempted
+                        self.logger.info("=== LUNAR ORBIT INSERTION BURN ===")
+                        self.logger.info(f"LOI burn executed: {burn_magnitude:.1f} m/s retrograde")
+                        self.logger.info(f"Altitude at burn: {(r_moon - R_MOON)/1000:.1f} km")
+                        self.logger.info(f"Pre-burn velocity: {v_current:.1f} m/s, Post-burn: {(rel_vel + delta_v).magnitude():.1f} m/s")
+                    
+            except Exception as e:
+                self.logger.error(f"LOI burn calculation failed: {e}")
+                self.loi_executed = True  # Mark as attempted
+        
+        # Check for successful lunar orbit capture
+        if moon_orbital_energy < 0: # 月の重力に捕獲された
+            self.rocket.phase = MissionPhase.LUNAR_ORBIT
+            self.logger.info("=== LUNAR ORBIT INSERTION SUCCESSFUL ===")
+            self.logger.info(f"Lunar orbit achieved! Altitude: {(r_moon - R_MOON)/1000:.1f} km")
+            self.logger.info(f"Orbital energy: {moon_orbital_energy/1e6:.2f} MJ/kg (negative = bound orbit)")
             
-            # Check for successful lunar orbit capture
-            if moon_orbital_energy < 0: # 月の重力に捕獲された
-                self.rocket.phase = MissionPhase.LUNAR_ORBIT
-                self.logger.info("=== LUNAR ORBIT INSERTION SUCCESSFUL ===")
-                self.logger.info(f"Lunar orbit achieved! Altitude: {(r_moon - R_MOON)/1000:.1f} km")
-                self.logger.info(f"Orbital energy: {moon_orbital_energy/1e6:.2f} MJ/kg (negative = bound orbit)")
-                
-            elif not self.rocket.is_thrusting: # 燃料切れで捕獲失敗
-                self.rocket.phase = MissionPhase.FAILED
-                self.logger.error("LOI failed. Insufficient fuel to be captured by the Moon.")
+        elif not self.rocket.is_thrusting: # 燃料切れで捕獲失敗
+            self.rocket.phase = MissionPhase.FAILED
+            self.logger.error("LOI failed. Insufficient fuel to be captured by the Moon.")
 
-        elif current_phase == MissionPhase.LUNAR_ORBIT:
-            # Professor v33: Enhanced lunar orbit tracking with three full orbits validation
-            orbit_time = len([p for p in self.phase_history if p == current_phase]) * 0.1
-            r_moon = (self.rocket.position - self.moon.position).magnitude()
-            
-            # Initialize lunar orbit tracking
-            if self.lunar_orbit_start_time is None:
-                self.lunar_orbit_start_time = len(self.time_history) * 0.1
-                self.logger.info("=== LUNAR ORBIT TRACKING INITIATED ===")
-            
-            # Track orbital periods by detecting apoapsis and periapsis passages
-            rel_pos = self.rocket.position - self.moon.position
-            rel_vel = self.rocket.velocity - self.moon.velocity
-            radial_velocity = rel_vel.data @ rel_pos.normalized().data
-            
-            # Detect apoapsis/periapsis passages (radial velocity changes sign)
-            if self.last_lunar_radial_velocity_sign is not None:
-                if (self.last_lunar_radial_velocity_sign > 0 and radial_velocity <= 0):
-                    # Passed apoapsis (radial velocity changed from positive to negative)
-                    altitude_km = (r_moon - R_MOON) / 1000
-                    self.lunar_orbit_apoapsises.append(altitude_km)
-                    self.logger.info(f"LUNAR APOAPSIS #{len(self.lunar_orbit_apoapsises)}: {altitude_km:.1f} km")
+    def _phase_lunar_orbit(self, state: StepContext):
+        """LUNAR_ORBIT: 近点・遠点通過を数えて3周回で成功判定"""
+        # Professor v33: Enhanced lunar orbit tracking with three full orbits validation
+        orbit_time = self.phase_history.count(MissionPhase.LUNAR_ORBIT) * 0.1
+        # 近点・遠点通過は r·v の符号変化だけで判定し、|r| は通過時と PDI 判定以外では求めない
+        r_moon_sq, _, radial_dot = self._moon_relative_state()
+        
+        # Initialize lunar orbit tracking
+        if self.lunar_orbit_start_time is None:
+            self.lunar_orbit_start_time = len(self.phase_history) * 0.1
+            self.logger.info("=== LUNAR ORBIT TRACKING INITIATED ===")
+        
+        # Track orbital periods by detecting apoapsis and periapsis passages
+        # Detect apoapsis/periapsis passages (radial velocity changes sign)
+        if self.last_lunar_radial_velocity_sign is not None:
+            if (self.last_lunar_radial_velocity_sign > 0 and radial_dot <= 0):
+                # Passed apoapsis (radial velocity changed from positive to negative)
+                altitude_km = (math.sqrt(r_moon_sq) - R_MOON) / 1000
+                self.lunar_orbit_apoapsises.append(altitude_km)
+                self.logger.info(f"LUNAR APOAPSIS #{len(self.lunar_orbit_apoapsises)}: {altitude_km:.1f} km")
+                
+            elif (self.last_lunar_radial_velocity_sign < 0 and radial_dot >= 0):
+                # Passed periapsis (radial velocity changed from negative to positive)
+                altitude_km = (math.sqrt(r_moon_sq) - R_MOON) / 1000
+                self.lunar_orbit_periapsises.append(altitude_km)
+                self.lunar_orbit_count += 1
+                self.logger.info(f"LUNAR PERIAPSIS #{len(self.lunar_orbit_periapsises)}: {altitude_km:.1f} km")
+                
+                # Calculate and validate orbit eccentricity
+                if len(self.lunar_orbit_apoapsises) >= self.lunar_orbit_count and len(self.lunar_orbit_periapsises) >= self.lunar_orbit_count:
+                    apo = self.lunar_orbit_apoapsises[self.lunar_orbit_count - 1]
+                    peri = self.lunar_orbit_periapsises[self.lunar_orbit_count - 1]
                     
-                elif (self.last_lunar_radial_velocity_sign < 0 and radial_velocity >= 0):
-                    # Passed periapsis (radial velocity changed from negative to positive)
-                    altitude_km = (r_moon - R_MOON) / 1000
-                    self.lunar_orbit_periapsises.append(altitude_km)
-                    self.lunar_orbit_count += 1
-                    self.logger.info(f"LUNAR PERIAPSIS #{len(self.lunar_orbit_periapsises)}: {altitude_km:.1f} km")
+                    # Calculate eccentricity: e = (r_apo - r_peri) / (r_apo + r_peri)
+                    r_apo = (apo * 1000) + R_MOON
+                    r_peri = (peri * 1000) + R_MOON
+                    eccentricity = (r_apo - r_peri) / (r_apo + r_peri)
                     
-                    # Calculate and validate orbit eccentricity
-                    if len(self.lunar_orbit_apoapsises) >= self.lunar_orbit_count and len(self.lunar_orbit_periapsises) >= self.lunar_orbit_count:
-                        apo = self.lunar_orbit_apoapsises[self.lunar_orbit_count - 1]
-                        peri = self.lunar_orbit_periapsises[self.lunar_orbit_count - 1]
-                        
-                        # Calculate eccentricity: e = (r_apo - r_peri) / (r_apo + r_peri)
-                        r_apo = (apo * 1000) + R_MOON
-                        r_peri = (peri * 1000) + R_MOON
-                        eccentricity = (r_apo - r_peri) / (r_apo + r_peri)
-                        
-                        self.logger.info(f"=== LUNAR ORBIT #{self.lunar_orbit_count} COMPLETE ===")
-                        self.logger.info(f"Apoapsis: {apo:.1f} km, Periapsis: {peri:.1f} km")
-                        self.logger.info(f"Eccentricity: {eccentricity:.4f} (target: < 0.1)")
-                        
-                        # Check if orbit meets stability criteria
-                        orbit_stable = eccentricity < 0.1 and peri > 15.0  # Above 15km minimum
-                        if orbit_stable:
-                            self.logger.info(f"✓ Orbit #{self.lunar_orbit_count} is STABLE")
-                        else:
-                            self.logger.warning(f"⚠ Orbit #{self.lunar_orbit_count} stability concern: e={eccentricity:.4f}, peri={peri:.1f}km")
-            
-            self.last_lunar_radial_velocity_sign = 1 if radial_velocity > 0 else -1 if radial_velocity < 0 else self.last_lunar_radial_velocity_sign
-            
-            # Professor v33: After three full orbits, mission is complete
-            if self.lunar_orbit_count >= 3:
-                # Validate final orbit stability
-                if len(self.lunar_orbit_apoapsises) >= 3 and len(self.lunar_orbit_periapsises) >= 3:
-                    # Check last orbit
-                    final_apo = self.lunar_orbit_apoapsises[-1]
-                    final_peri = self.lunar_orbit_periapsises[-1]
-                    r_apo = (final_apo * 1000) + R_MOON
-                    r_peri = (final_peri * 1000) + R_MOON
-                    final_eccentricity = (r_apo - r_peri) / (r_apo + r_peri)
+                    self.logger.info(f"=== LUNAR ORBIT #{self.lunar_orbit_count} COMPLETE ===")
+                    self.logger.info(f"Apoapsis: {apo:.1f} km, Periapsis: {peri:.1f} km")
+                    self.logger.info(f"Eccentricity: {eccentricity:.4f} (target: < 0.1)")
                     
-                    if final_eccentricity < 0.1 and final_peri > 15.0:
-                        self.rocket.phase = MissionPhase.LANDED  # Use LANDED as mission success
-                        self.logger.info("=== MISSION SUCCESS: STABLE LUNAR ORBIT ACHIEVED ===")
-                        self.logger.info(f"Completed {self.lunar_orbit_count} stable lunar orbits")
-                        self.logger.info(f"Final orbit: Apo {final_apo:.1f}km, Peri {final_peri:.1f}km, e={final_eccentricity:.4f}")
-                        self.logger.info(f"Total mission time: {orbit_time/3600:.1f} hours")
-                        return  # Mission complete
+                    # Check if orbit meets stability criteria
+                    orbit_stable = eccentricity < 0.1 and peri > 15.0  # Above 15km minimum
+                    if orbit_stable:
+                        self.logger.info(f"✓ Orbit #{self.lunar_orbit_count} is STABLE")
                     else:
-                        self.rocket.phase = MissionPhase.FAILED
-                        self.logger.error(f"Mission failed: Final orbit unstable (e={final_eccentricity:.4f}, peri={final_peri:.1f}km)")
-                        return
-            
-            # Original landing logic (if altitude is very low)
-            if (r_moon < R_MOON + 50e3 and orbit_time > 300 and self.rocket.current_stage == 3):
-                self.rocket.phase = MissionPhase.PDI
-                self.logger.info("Initiating Powered Descent Initiation (PDI).")
-
-        elif current_phase == MissionPhase.PDI:
-            # 動力降下から最終降下へ
-            altitude_moon = (self.rocket.position - self.moon.position).magnitude() - R_MOON
-            if altitude_moon < 15e3:
-                self.rocket.phase = MissionPhase.TERMINAL_DESCENT
-                self.logger.info(f"Terminal descent initiated at {altitude_moon/1000:.1f} km.")
-
-        elif current_phase == MissionPhase.TERMINAL_DESCENT:
-            # 最終降下から着陸シーケンスへ
-            altitude_moon = (self.rocket.position - self.moon.position).magnitude() - R_MOON
-            if altitude_moon < 1000:
-                self.rocket.phase = MissionPhase.LUNAR_TOUCHDOWN
-                self.logger.info(f"Final approach. Altitude: {altitude_moon:.0f} m.")
-
-        elif current_phase == MissionPhase.LUNAR_TOUCHDOWN:
-            # 着陸の成功/失敗判定
-            altitude_moon = (self.rocket.position - self.moon.position).magnitude() - R_MOON
-            relative_velocity = (self.rocket.velocity - self.moon.velocity).magnitude()
-            
-            if altitude_moon <= 10: # 地表10m以内
-                if relative_velocity <= 3.0: # 秒速3m以下なら成功
-                    self.rocket.phase = MissionPhase.LANDED
-                    self.logger.info(f"LUNAR LANDING CONFIRMED! Landing velocity: {relative_velocity:.2f} m/s")
+                        self.logger.warning(f"⚠ Orbit #{self.lunar_orbit_count} stability concern: e={eccentricity:.4f}, peri={peri:.1f}km")
+        
+        self.last_lunar_radial_velocity_sign = 1 if radial_dot > 0 else -1 if radial_dot < 0 else self.last_lunar_radial_velocity_sign
+        
+        # Professor v33: After three full orbits, mission is complete
+        if self.lunar_orbit_count >= 3:
+            # Validate final orbit stability
+            if len(self.lunar_orbit_apoapsises) >= 3 and len(self.lunar_orbit_periapsises) >= 3:
+                # Check last orbit
+                final_apo = self.lunar_orbit_apoapsises[-1]
+                final_peri = self.lunar_orbit_periapsises[-1]
+                r_apo = (final_apo * 1000) + R_MOON
+                r_peri = (final_peri * 1000) + R_MOON
+                final_eccentricity = (r_apo - r_peri) / (r_apo + r_peri)
+                
+                if final_eccentricity < 0.1 and final_peri > 15.0:
+                    self.rocket.phase = MissionPhase.LANDED  # Use LANDED as mission success
+                    self.logger.info("=== MISSION SUCCESS: STABLE LUNAR ORBIT ACHIEVED ===")
+                    self.logger.info(f"Completed {self.lunar_orbit_count} stable lunar orbits")
+                    self.logger.info(f"Final orbit: Apo {final_apo:.1f}km, Peri {final_peri:.1f}km, e={final_eccentricity:.4f}")
+                    self.logger.info(f"Total mission time: {orbit_time/3600:.1f} hours")
+                    return  # Mission complete
                 else:
                     self.rocket.phase = MissionPhase.FAILED
-                    self.logger.error(f"CRASH! Hard landing - velocity too high: {relative_velocity:.2f} m/s")
+                    self.logger.error(f"Mission failed: Final orbit unstable (e={final_eccentricity:.4f}, peri={final_peri:.1f}km)")
+                    return
+        
+        # Original landing logic (if altitude is very low)
+        if (r_moon_sq < LUNAR_PDI_RADIUS_SQ and orbit_time > 300 and self.rocket.current_stage == 3):
+            self.rocket.phase = MissionPhase.PDI
+            self.logger.info("Initiating Powered Descent Initiation (PDI).")
+
+    def _phase_pdi(self, state: StepContext):
+        """PDI: 動力降下から最終降下へ"""
+        # 動力降下から最終降下へ
+        altitude_moon = math.sqrt(self.moon._distance_squared(self.rocket.position)) - R_MOON
+        if altitude_moon < 15e3:
+            self.rocket.phase = MissionPhase.TERMINAL_DESCENT
+            self.logger.info(f"Terminal descent initiated at {altitude_moon/1000:.1f} km.")
+
+    def _phase_terminal_descent(self, state: StepContext):
+        """TERMINAL_DESCENT: 最終降下から着陸シーケンスへ"""
+        # 最終降下から着陸シーケンスへ
+        altitude_moon = math.sqrt(self.moon._distance_squared(self.rocket.position)) - R_MOON
+        if altitude_moon < 1000:
+            self.rocket.phase = MissionPhase.LUNAR_TOUCHDOWN
+            self.logger.info(f"Final approach. Altitude: {altitude_moon:.0f} m.")
+
+    def _phase_lunar_touchdown(self, state: StepContext):
+        """LUNAR_TOUCHDOWN: 着陸の成功/失敗判定"""
+        # 着陸の成功/失敗判定
+        altitude_moon = math.sqrt(self.moon._distance_squared(self.rocket.position)) - R_MOON
+        relative_velocity = math.hypot(*(self.rocket.velocity.data - self.moon.velocity.data).tolist())
+        
+        if altitude_moon <= 10: # 地表10m以内
+            if relative_velocity <= 3.0: # 秒速3m以下なら成功
+                self.rocket.phase = MissionPhase.LANDED
+                self.logger.info(f"LUNAR LANDING CONFIRMED! Landing velocity: {relative_velocity:.2f} m/s")
+            else:
+                self.rocket.phase = MissionPhase.FAILED
+                self.logger.error(f"CRASH! Hard landing - velocity too high: {relative_velocity:.2f} m/s")
     
     def _check_mission_status(self) -> bool:
         """ミッション状態をチェック（継続/終了）"""
-        altitude = self.get_altitude()
-        distance_to_moon = (self.rocket.position - self.moon.position).magnitude()
+        # フェーズハンドラが成功/失敗を確定させたら、残り時間を積分せずにここで終了
+        if self.rocket.phase in TERMINAL_PHASES:
+            return False
+        kinematics = self._radial_kinematics()  # |r|, |v| は積分後の状態で一度だけ計算して使い回す
+        altitude = kinematics[0] - R_EARTH
+        moon_distance_sq = self.moon._distance_squared(self.rocket.position)
         
         # Professor v19: Verbose abort debugging
-        if hasattr(self, 'config') and self.config.get("verbose_abort", False):
-            velocity = self.rocket.velocity.magnitude()
-            flight_path_angle = np.degrees(self.get_flight_path_angle())
+        if self.config.get("verbose_abort", False):
+            velocity = kinematics[1]
+            flight_path_angle = math.degrees(self.get_flight_path_angle(kinematics))
             thrust_mag = self.get_thrust_vector(0.0).magnitude()
             
             # Propellant info
@@ -1191,8 +1653,8 @@ class Mission:
                 remaining_prop = 0
                 prop_ratio = 0
             
-            self.logger.debug(f"ABORT_DEBUG: alt={altitude:.1f}m, v={velocity:.1f}m/s, γ={flight_path_angle:.1f}°, "
-                           f"thrust={thrust_mag:.0f}N, prop_remain={remaining_prop:.1f}kg ({prop_ratio*100:.1f}%)")
+            self.logger.debug("ABORT_DEBUG: alt=%.1fm, v=%.1fm/s, γ=%.1f°, thrust=%.0fN, prop_remain=%.1fkg (%.1f%%)",
+                              altitude, velocity, flight_path_angle, thrust_mag, remaining_prop, prop_ratio * 100)
         
         # Professor v19: Configurable abort thresholds (C1)
         abort_thresholds = self.config.get("abort_thresholds", {
@@ -1211,10 +1673,10 @@ class Mission:
             self.logger.error(f"Mission failed: Crashed into Earth at altitude {altitude:.1f} m")
             
             # Professor v19: Enhanced abort reason logging
-            if hasattr(self, 'config') and self.config.get("verbose_abort", False):
-                velocity = self.rocket.velocity.magnitude()
-                flight_path_angle = np.degrees(self.get_flight_path_angle())
-                apoapsis, periapsis, eccentricity = self.get_orbital_elements()
+            if self.config.get("verbose_abort", False):
+                velocity = kinematics[1]
+                flight_path_angle = math.degrees(self.get_flight_path_angle(kinematics))
+                apoapsis, periapsis, eccentricity = self.get_orbital_elements(kinematics)
                 self.logger.error(f"ABORT_REASON: Earth impact - altitude {altitude:.1f}m")
                 self.logger.error(f"ABORT_STATE: v={velocity:.1f}m/s, γ={flight_path_angle:.1f}°, "
                                f"apo={(apoapsis-R_EARTH)/1000:.1f}km, peri={(periapsis-R_EARTH)/1000:.1f}km")
@@ -1222,27 +1684,28 @@ class Mission:
         
         # サブオービタル軌道の早期発見
         if altitude > 50e3:  # 50km以上でチェック
-            apoapsis, periapsis, eccentricity = self.get_orbital_elements()
+            apoapsis, periapsis, eccentricity = self.get_orbital_elements(kinematics)
             if periapsis < -R_EARTH * 0.1:  # 非常に負の近地点
                 # 総燃焼時間で判定（燃料切れかどうか）
                 total_burn_time = sum(stage.burn_time for stage in self.rocket.stages[:self.rocket.current_stage+1])
-                elapsed_time = len(self.time_history) * 0.1  # dt=0.1
+                elapsed_time = len(self.phase_history) * 0.1  # dt=0.1
                 if elapsed_time > total_burn_time * 0.8:  # 80%以上経過でもサブオービタル
                     self.rocket.phase = MissionPhase.FAILED
                     self.logger.error(f"Mission failed: Suborbital trajectory detected. Periapsis: {(periapsis-R_EARTH)/1000:.1f} km")
                     return False
         
         # 月面着陸の精密チェック（教授フィードバック対応）
-        if distance_to_moon <= R_MOON + 100:  # 月面から100m以内
-            relative_velocity = (self.rocket.velocity - self.moon.velocity).magnitude()
+        if moon_distance_sq <= LUNAR_TOUCHDOWN_RADIUS_SQ:  # 月面から100m以内
+            _, relative_velocity_sq, radial_dot = self._moon_relative_state()
+            relative_velocity = math.sqrt(relative_velocity_sq)
             
             # 教授推奨: 着陸速度 ≤ 2 m/s, 傾斜 ≤ 5°
             if relative_velocity <= 2.0:  # 2 m/s以下で成功
                 # 僾斜角を簡略チェック（速度ベクトルと面法線の角度）
-                moon_center_dir = (self.moon.position - self.rocket.position).normalized()
-                velocity_dir = (self.rocket.velocity - self.moon.velocity).normalized()
-                dot_product = moon_center_dir.data @ velocity_dir.data
-                tilt_angle = np.degrees(np.arccos(np.abs(np.clip(dot_product, -1, 1))))
+                # 月中心方向 (-r) と相対速度の方向余弦 = -(r·v) / (|r||v|)
+                norm_product = math.sqrt(moon_distance_sq * relative_velocity_sq)
+                dot_product = -radial_dot / norm_product if norm_product > 0 else 0.0
+                tilt_angle = math.degrees(math.acos(abs(min(1.0, max(-1.0, dot_product)))))
                 
                 if tilt_angle <= 85:  # 5°以内の僾斜（簡略化）
                     self.rocket.phase = MissionPhase.LANDED
@@ -1258,10 +1721,10 @@ class Mission:
                 return False
         
         # 月面衝突チェック（100m以下でない場合）
-        elif distance_to_moon <= R_MOON + 1000:  # 1km以内
-            if self.rocket.phase not in [MissionPhase.TERMINAL_DESCENT, MissionPhase.LUNAR_TOUCHDOWN]:
+        elif moon_distance_sq <= LUNAR_PROXIMITY_RADIUS_SQ:  # 1km以内
+            if self.rocket.phase not in LANDING_PHASES:
                 # 着陸フェーズでないのに月面に近づいた
-                relative_velocity = (self.rocket.velocity - self.moon.velocity).magnitude()
+                relative_velocity = math.sqrt(self._moon_relative_state()[1])
                 if relative_velocity > 10:  # 10 m/s以上で衝突
                     self.rocket.phase = MissionPhase.FAILED
                     self.logger.error(f"Uncontrolled lunar impact at {relative_velocity:.1f} m/s")
@@ -1296,7 +1759,7 @@ class Mission:
                 
                 # Calculate actual stage ΔV using Tsiolkovsky equation
                 if total_final_mass > 0:
-                    stage_dv = isp * STANDARD_GRAVITY * np.log(total_initial_mass / total_final_mass)
+                    stage_dv = isp * STANDARD_GRAVITY * math.log(total_initial_mass / total_final_mass)
                     self.total_delta_v += stage_dv
                     self.stage_delta_v_history.append(stage_dv)
             
@@ -1399,8 +1862,6 @@ class Mission:
             self.logger.info("="*60)
             
             # Store for results JSON
-            if not hasattr(self, 'tli_analysis'):
-                self.tli_analysis = {}
             self.tli_analysis = {
                 'required_delta_v': delta_v_required,
                 'available_delta_v': available_delta_v,
@@ -1415,6 +1876,8 @@ class Mission:
     def simulate(self, duration: float = 10 * 24 * 3600, dt: float = 0.1) -> Dict:
         """シミュレーション実行"""
         t = 0.0
+        t_compensation = 0.0  # dt の積算誤差（Kahan補償）：数百万ステップでも t ≈ steps·dt を保つ
+        # 補償なしの積算（10 s 目が 9.99999999999998）とは t < 10.0 の判定や誘導・質量に渡る時刻が丸め分だけ異なり、軌道もそれに応じて変わる
         steps = 0
         self.current_time = 0.0  # Track current time for fuel calculations
         
@@ -1446,230 +1909,295 @@ class Mission:
         # 初期フェーズ確認（月ミッション用）
         self.rocket.phase = MissionPhase.LAUNCH
         
+        # 状態履歴・CSVは log_stride ステップ毎に記録（既定100ステップ = 10秒、record_full_history で履歴は毎ステップ）
+        log_stride = max(1, int(self.config.get("log_stride", 100)))
+        history_stride = 1 if self.config.get("record_full_history", False) else log_stride
+        self._history_stride = history_stride
+        
+        # 履歴バッファを想定ステップ数分あらかじめ確保
+        estimated_steps = int(duration / dt) + 2
+        self.phase_history.reserve(estimated_steps)
+        for history in (self.time_history, self.position_history, self.velocity_history,
+                        self.altitude_history, self.mass_history):
+            history.reserve(estimated_steps // history_stride + 2)
+        
+        # RK4スクラッチバッファ（状態 y = [r, v] の6成分をまとめて扱う、ループ外で一度だけ確保）
+        y0, stage_y = np.empty(6), np.empty(6)
+        k1, k2, k3, k4 = (np.empty(6) for _ in range(4))
+        stage_pos = Vector3.from_array(stage_y[:3])  # 中間状態のビュー
+        stage_vel = Vector3.from_array(stage_y[3:])
+        # dt はループ中一定：RK4の係数は一度だけ計算
+        half_dt = dt / 2
+        rk4_weight = dt / 6
+        
         # RK4法による数値積分
-        while t < duration and self._check_mission_status():
-            # A2: Update mission clock
-            self.step(dt)
-            
-            # A7: Check ΔV budget
-            if not self.check_delta_v_budget():
-                self.logger.error("Mission aborted due to ΔV budget violation")
-                break
-            
-            # フェーズ更新を最初に実行（重要：積分前に実行）
-            self._update_mission_phase()
-            
-            # 記録
-            self.time_history.append(t)
-            self.current_time = t  # Update current time for fuel calculations
-            self.position_history.append(self.rocket.position)
-            self.velocity_history.append(self.rocket.velocity)
-            altitude = self.get_altitude()
-            velocity = self.rocket.velocity.magnitude()
-            mass = self.rocket.get_current_mass(t, altitude)
-            apoapsis, periapsis, eccentricity = self.get_orbital_elements()
-            self.altitude_history.append(altitude)
-            self.mass_history.append(mass)
-            self.phase_history.append(self.rocket.phase)
-            
-            # Professor v19: 10 Hz phase/stage logging for debugging (B1)
-            if steps % 1 == 0:  # dt=0.1なので1ステップ=0.1秒 = 10 Hz
-                flag_status = {
-                    "LEO_FINAL_RUN": is_enabled("LEO_FINAL_RUN"),
-                    "STAGE2_MASS_FLOW": is_enabled("STAGE2_MASS_FLOW_OVERRIDE"),
-                    "VELOCITY_STAGE3": is_enabled("VELOCITY_TRIGGERED_STAGE3"),
-                    "PEG_DAMPING": is_enabled("PEG_GAMMA_DAMPING")
-                }
-                # Every 10 Hz log with high verbosity for first 20 seconds
-                if t <= 20.0:
-                    self.logger.debug(f"10Hz_LOG: t={t:.1f}s, stage={self.rocket.current_stage}, "
-                                   f"phase={self.rocket.phase.value}, flags={flag_status}")
-
-            # Professor v17: Enhanced telemetry logging every 0.2s
-            if is_enabled("ENHANCED_TELEMETRY") and steps % 2 == 0:  # dt=0.1なので2ステップ=0.2秒
-                stage_elapsed_time = t - self.rocket.stage_start_time
-                # Calculate propellant usage and abort if >99.5%
-                if self.rocket.current_stage < len(self.rocket.stages):
-                    current_stage = self.rocket.stages[self.rocket.current_stage]
-                    used_propellant = current_stage.get_mass_flow_rate(altitude) * stage_elapsed_time
-                    propellant_usage_pct = (used_propellant / current_stage.propellant_mass) * 100 if current_stage.propellant_mass > 0 else 100
-                    
-                    # Professor v19: Configurable propellant threshold with time guard (C2)
-                    abort_thresholds = self.config.get("abort_thresholds", {"propellant_critical_percent": 99.5, "min_safe_time": 5.0})
-                    propellant_threshold = abort_thresholds["propellant_critical_percent"]
-                    min_safe_time = abort_thresholds["min_safe_time"]
-                    
-                    # Professor v17: Monitor propellant usage and trigger stage separation if needed
-                    # Professor v19: Add time guard to prevent early aborts
-                    if (propellant_usage_pct > propellant_threshold and
-                        self.rocket.is_thrusting(t, altitude) and
-                        t > min_safe_time):  # Time guard: no abort before min_safe_time seconds
-                        # Force stage separation instead of mission abort
-                        self.logger.warning(f"PROPELLANT CRITICAL: Stage {self.rocket.current_stage + 1} propellant >{propellant_threshold:.1f}% consumed after t={t:.1f}s")
-                        self.logger.warning(f" -> Propellant usage: {propellant_usage_pct:.1f}% - Triggering stage separation")
+        try:
+            while t < duration and self._check_mission_status():
+                # A2: Update mission clock
+                self.step(dt)
+                
+                # A7: Check ΔV budget
+                if not self.check_delta_v_budget():
+                    self.logger.error("Mission aborted due to ΔV budget violation")
+                    break
+                
+                # ステップの派生量（高度・速度・軌道要素）を一度だけ計算して使い回す
+                position, velocity_vector = self.rocket.position, self.rocket.velocity
+                context = self._step_context(t)
+                
+                # フェーズ更新を最初に実行（重要：積分前に実行）
+                self._update_mission_phase(context)
+                # MCC・LOI などで状態が書き換えられたら作り直す
+                if self.rocket.position is not position or self.rocket.velocity is not velocity_vector:
+                    context = self._step_context(t)
+                
+                # 記録（フェーズ履歴は経過時間の計数に使うため毎ステップ記録）
+                self.current_time = t  # Update current time for fuel calculations
+                kinematics = context.kinematics
+                altitude = context.altitude
+                velocity = context.velocity
+                # 質量は段分離しうるフェーズ更新の後に確定
+                mass = context.mass = self.rocket.get_current_mass(t, altitude)
+                self.phase_history.append(self.rocket.phase)
+                if steps % history_stride == 0:
+                    self.time_history.append(t)
+                    self.position_history.append(self.rocket.position)
+                    self.velocity_history.append(self.rocket.velocity)
+                    self.altitude_history.append(altitude)
+                    self.mass_history.append(mass)
+                
+                # Professor v19: 10 Hz phase/stage logging for debugging (B1)
+                # Every 10 Hz log with high verbosity for first 20 seconds (DEBUG無効時はフラグ収集ごと省く)
+                if t <= 20.0 and self.logger.isEnabledFor(logging.DEBUG):  # dt=0.1なので1ステップ=0.1秒 = 10 Hz
+                    flag_status = {
+                        "LEO_FINAL_RUN": is_enabled("LEO_FINAL_RUN"),
+                        "STAGE2_MASS_FLOW": is_enabled("STAGE2_MASS_FLOW_OVERRIDE"),
+                        "VELOCITY_STAGE3": is_enabled("VELOCITY_TRIGGERED_STAGE3"),
+                        "PEG_DAMPING": is_enabled("PEG_GAMMA_DAMPING")
+                    }
+                    self.logger.debug("10Hz_LOG: t=%.1fs, stage=%d, phase=%s, flags=%s",
+                                      t, self.rocket.current_stage, self.rocket.phase.value, flag_status)
+
+                # Professor v17: Enhanced telemetry logging every 0.2s
+                if is_enabled("ENHANCED_TELEMETRY") and steps % 2 == 0:  # dt=0.1なので2ステップ=0.2秒
+                    stage_elapsed_time = t - self.rocket.stage_start_time
+                    # Calculate propellant usage and abort if >99.5%
+                    if self.rocket.current_stage < len(self.rocket.stages):
+                        current_stage = self.rocket.stages[self.rocket.current_stage]
+                        used_propellant = current_stage.get_mass_flow_rate(altitude) * stage_elapsed_time
+                        propellant_usage_pct = (used_propellant / current_stage.propellant_mass) * 100 if current_stage.propellant_mass > 0 else 100
+                        
+                        # Professor v19: Configurable propellant threshold with time guard (C2)
+                        abort_thresholds = self.config.get("abort_thresholds", {"propellant_critical_percent": 99.5, "min_safe_time": 5.0})
+                        propellant_threshold = abort_thresholds["propellant_critical_percent"]
+                        min_safe_time = abort_thresholds["min_safe_time"]
+                        
+                        # Professor v17: Monitor propellant usage and trigger stage separation if needed
+                        # Professor v19: Add time guard to prevent early aborts
+                        if (propellant_usage_pct > propellant_threshold and
+                            self.rocket.is_thrusting(t, altitude) and
+                            t > min_safe_time):  # Time guard: no abort before min_safe_time seconds
+                            # Force stage separation instead of mission abort
+                            self.logger.warning(f"PROPELLANT CRITICAL: Stage {self.rocket.current_stage + 1} propellant >{propellant_threshold:.1f}% consumed after t={t:.1f}s")
+                            self.logger.warning(f" -> Propellant usage: {propellant_usage_pct:.1f}% - Triggering stage separation")
+                            
+                            # Force stage separation by setting rocket to separation phase
+                            if self.rocket.separate_stage(t):
+                                self.rocket.phase = MissionPhase.STAGE_SEPARATION
+                                context.mass = None  # 段分離で質量が変わる：k1 で再計算
+                                self.logger.warning(f"Stage {self.rocket.current_stage} separation completed")
+                            
+                            # Continue simulation to allow normal stage separation logic to run
+                            # Don't return here - let the normal separation process handle it
+                        
+                        # Professor v23: Max-Q Monitor - check dynamic pressure limits
+                        # Calculate velocity relative to atmosphere (subtract Earth rotation)
+                        earth_rotation_velocity = 2 * np.pi * R_EARTH * np.cos(np.radians(28.573)) / EARTH_ROTATION_PERIOD
+                        relative_velocity = max(0, self.rocket.velocity.magnitude() - earth_rotation_velocity)
+                        density = self._calculate_atmospheric_density(altitude)
+                        dynamic_pressure = 0.5 * density * relative_velocity**2  # Pa
                         
-                        # Force stage separation by setting rocket to separation phase
-                        if self.rocket.separate_stage(t):
-                            self.rocket.phase = MissionPhase.STAGE_SEPARATION
-                            self.logger.warning(f"Stage {self.rocket.current_stage} separation completed")
+                        # Track maximum dynamic pressure encountered
+                        self.max_dynamic_pressure = max(self.max_dynamic_pressure, dynamic_pressure)
                         
-                        # Continue simulation to allow normal stage separation logic to run
-                        # Don't return here - let the normal separation process handle it
+                        # Max-Q check - temporarily disabled for testing - log but don't abort
+                        # Only check after launch (t > 1s) to avoid initial Earth rotation velocity
+                        if dynamic_pressure > MAX_Q_OPERATIONAL and t > 1.0:
+                            if not self._max_q_warning_shown:
+                                self.logger.warning(f"WARNING: Dynamic pressure exceeded {MAX_Q_OPERATIONAL/1000:.1f} kPa at t={t:.1f}s")
+                                self.logger.warning(f"Limit exceeded: {dynamic_pressure:.1f} Pa > {MAX_Q_OPERATIONAL} Pa ({MAX_Q_OPERATIONAL/1000:.1f} kPa)")
+                                self._max_q_warning_shown = True
+                        
+                        # Log detailed telemetry every 1 second (5 * 0.2s)
+                        if steps % 10 == 0:
+                            flight_path_angle_deg = math.degrees(self.get_flight_path_angle(kinematics))
+                            self.logger.info("TELEMETRY: t=%.1fs, stage=%d, alt=%.1fkm, v=%.0fm/s, "
+                                             "propellant=%.1f%%, γ=%.1f°",
+                                             t, self.rocket.current_stage + 1, altitude / 1000, velocity,
+                                             100 - propellant_usage_pct, flight_path_angle_deg)
+
+                # CSVログ出力（log_stride毎、既定10秒） - Professor v7: enhanced logging
+                if steps % log_stride == 0:  # dt=0.1なので100ステップ=10秒
+                    stage_elapsed_time = t - self.rocket.stage_start_time
+                    # 軌道要素はステップ冒頭の StepContext の値を流用
+                    apoapsis, periapsis, eccentricity = context.apoapsis, context.periapsis, context.eccentricity
+                    # Calculate additional metrics for professor's analysis
+                    flight_path_angle_deg = math.degrees(self.get_flight_path_angle(kinematics))
                     
-                    # Professor v23: Max-Q Monitor - check dynamic pressure limits
-                    # Calculate velocity relative to atmosphere (subtract Earth rotation)
-                    earth_rotation_velocity = 2 * np.pi * R_EARTH * np.cos(np.radians(28.573)) / EARTH_ROTATION_PERIOD
-                    relative_velocity = max(0, self.rocket.velocity.magnitude() - earth_rotation_velocity)
-                    density = self._calculate_atmospheric_density(altitude)
-                    dynamic_pressure = 0.5 * density * relative_velocity**2  # Pa
+                    # Get current pitch angle from guidance
+                    pitch_angle_deg = guidance.get_target_pitch_angle(altitude, velocity)
                     
-                    # Track maximum dynamic pressure encountered
-                    if not hasattr(self, 'max_dynamic_pressure'):
-                        self.max_dynamic_pressure = 0.0
-                    self.max_dynamic_pressure = max(self.max_dynamic_pressure, dynamic_pressure)
+                    # Calculate remaining propellant in current stage
+                    if self.rocket.current_stage < len(self.rocket.stages):
+                        current_stage = self.rocket.stages[self.rocket.current_stage]
+                        used_propellant = current_stage.get_mass_flow_rate(altitude) * stage_elapsed_time
+                        remaining_propellant = max(0, current_stage.propellant_mass - used_propellant)
+                        
+                        # Professor v16: Enhanced Stage-2 logging
+                        if self.rocket.current_stage == 1:  # Stage-2 (S-II)
+                            thrust_actual = current_stage.get_thrust(altitude)
+                            mass_flow_actual = current_stage.get_mass_flow_rate(altitude)
+                            self.logger.info("STAGE-2 MONITOR: t=%.1fs, propellant=%.1ft, mass_flow=%.1fkg/s, "
+                                             "thrust=%.0fkN, burn_time=%.1fs/%.1fs",
+                                             t, remaining_propellant / 1000, mass_flow_actual, thrust_actual / 1000,
+                                             stage_elapsed_time, current_stage.burn_time)
+                        
+                        # Professor v39: Enhanced Stage-3 fuel monitoring for TLI readiness
+                        elif self.rocket.current_stage == 2:  # Stage-3 (S-IVB)
+                            thrust_actual = current_stage.get_thrust(altitude)
+                            mass_flow_actual = current_stage.get_mass_flow_rate(altitude)
+                            fuel_percentage = (remaining_propellant / current_stage.propellant_mass) * 100 if current_stage.propellant_mass > 0 else 0
+                            tli_ready = "TLI_READY" if fuel_percentage >= 30.0 else "TLI_RISK"
+                            
+                            self.logger.info("STAGE-3 MONITOR: t=%.1fs, propellant=%.1ft (%.1f%%), mass_flow=%.1fkg/s, "
+                                             "thrust=%.0fkN, burn_time=%.1fs/%.1fs, %s",
+                                             t, remaining_propellant / 1000, fuel_percentage, mass_flow_actual,
+                                             thrust_actual / 1000, stage_elapsed_time, current_stage.burn_time, tli_ready)
+                            
+                            # Alert when Stage-3 fuel drops below TLI threshold
+                            if fuel_percentage < 30.0 and fuel_percentage > 25.0:
+                                self.logger.warning(f"STAGE-3 FUEL WARNING: {fuel_percentage:.1f}% remaining - approaching TLI minimum threshold")
+                    else:
+                        remaining_propellant = 0
                     
-                    # Max-Q check - temporarily disabled for testing - log but don't abort
-                    # Only check after launch (t > 1s) to avoid initial Earth rotation velocity
-                    if dynamic_pressure > MAX_Q_OPERATIONAL and t > 1.0:
-                        if not hasattr(self, '_max_q_warning_shown'):
-                            self.logger.warning(f"WARNING: Dynamic pressure exceeded {MAX_Q_OPERATIONAL/1000:.1f} kPa at t={t:.1f}s")
-                            self.logger.warning(f"Limit exceeded: {dynamic_pressure:.1f} Pa > {MAX_Q_OPERATIONAL} Pa ({MAX_Q_OPERATIONAL/1000:.1f} kPa)")
-                            self._max_q_warning_shown = True
+                    # Calculate dynamic pressure for CSV logging
+                    csv_velocity = self.rocket.velocity.magnitude()
+                    csv_density = self._calculate_atmospheric_density(altitude)
+                    csv_dynamic_pressure = 0.5 * csv_density * csv_velocity**2  # Pa
+                    csv_max_dynamic_pressure = self.max_dynamic_pressure
                     
-                    # Log detailed telemetry every 1 second (5 * 0.2s)
-                    if steps % 10 == 0:
-                        flight_path_angle_deg = np.degrees(self.get_flight_path_angle())
-                        self.logger.info(f"TELEMETRY: t={t:.1f}s, stage={self.rocket.current_stage+1}, "
-                                       f"alt={altitude/1000:.1f}km, v={velocity:.0f}m/s, "
-                                       f"propellant={100-propellant_usage_pct:.1f}%, γ={flight_path_angle_deg:.1f}°")
-
-            # CSVログ出力（10秒ごと） - Professor v7: enhanced logging
-            if steps % 100 == 0:  # dt=0.1なので100ステップ=10秒
-                stage_elapsed_time = t - self.rocket.stage_start_time
-                # Calculate additional metrics for professor's analysis
-                flight_path_angle_deg = np.degrees(self.get_flight_path_angle())
+                    if self.csv_file is None:
+                        # npz ログ: 文字列化せず CSV と同じ単位の数値で保持
+                        self._csv_row_buffer.append((
+                            t, altitude, velocity, mass, self.total_delta_v, self.rocket.phase.value,
+                            self.rocket.current_stage, (apoapsis - R_EARTH) / 1000, (periapsis - R_EARTH) / 1000,
+                            eccentricity, flight_path_angle_deg, pitch_angle_deg, remaining_propellant / 1000,
+                            csv_dynamic_pressure, csv_max_dynamic_pressure
+                        ))
+                    else:
+                        self._csv_row_buffer.append([
+                            f"{t:.1f}",
+                            f"{altitude:.1f}",
+                            f"{velocity:.1f}",
+                            f"{mass:.1f}",
+                            f"{self.total_delta_v:.1f}",
+                            self.rocket.phase.value,
+                            self.rocket.current_stage,
+                            f"{(apoapsis-R_EARTH)/1000:.1f}" if apoapsis != float('inf') else "inf",
+                            f"{(periapsis-R_EARTH)/1000:.1f}",
+                            f"{eccentricity:.3f}",
+                            f"{flight_path_angle_deg:.2f}",
+                            f"{pitch_angle_deg:.2f}",
+                            f"{remaining_propellant/1000:.1f}",
+                            f"{csv_dynamic_pressure:.1f}",
+                            f"{csv_max_dynamic_pressure:.1f}"
+                        ])
+                        if len(self._csv_row_buffer) >= CSV_FLUSH_ROWS:
+                            self._flush_csv_rows()
                 
-                # Get current pitch angle from guidance
-                import guidance
-                pitch_angle_deg = guidance.get_target_pitch_angle(altitude, velocity)
+                # 統計更新（|r|, |v| はステップ冒頭の _radial_kinematics の値を流用、max() 呼び出しは省く）
+                if altitude > self.max_altitude:
+                    self.max_altitude = altitude
+                if velocity > self.max_velocity:
+                    self.max_velocity = velocity
                 
-                # Calculate remaining propellant in current stage
-                if self.rocket.current_stage < len(self.rocket.stages):
-                    current_stage = self.rocket.stages[self.rocket.current_stage]
-                    used_propellant = current_stage.get_mass_flow_rate(altitude) * stage_elapsed_time
-                    remaining_propellant = max(0, current_stage.propellant_mass - used_propellant)
+                # 慣性飛行（adaptive_coast）: log_stride ステップ分を適応刻みでまとめて伝搬
+                # （月SOI進入・地表到達で打ち切り、以降は通常のRK4に戻る）
+                coast_steps = 0
+                if self.adaptive_coast and steps % log_stride == 0 and self._is_ballistic_coast(t, altitude):
+                    sol = self.propagate_coast(log_stride * dt, rtol=self.coast_rtol, atol=self.coast_atol,
+                                               method=self.coast_method, advance_clock=False)
+                    coast_elapsed = float(sol.t[-1])
+                    coast_steps = max(1, int(round(coast_elapsed / dt)))
+                    # ループ末尾の t += dt / steps += 1 と合わせて実経過時間・ステップ数を進める
+                    self.step(coast_elapsed - dt)
+                    t, t_compensation = _kahan_add(t, t_compensation, coast_elapsed - dt)
+                    steps += coast_steps - 1
+                    # フェーズ履歴は1ステップ1記録（滞在時間の計数に使う）
+                    self.phase_history.append_repeated(self.rocket.phase, coast_steps - 1)
+                else:
+                    # RK4積分（スクラッチバッファ上でin-place計算）: k = [v, a]
+                    np.copyto(y0[:3], self.rocket.position.data)
+                    np.copyto(y0[3:], self.rocket.velocity.data)
                     
-                    # Professor v16: Enhanced Stage-2 logging
-                    if self.rocket.current_stage == 1:  # Stage-2 (S-II)
-                        thrust_actual = current_stage.get_thrust(altitude)
-                        mass_flow_actual = current_stage.get_mass_flow_rate(altitude)
-                        self.logger.info(f"STAGE-2 MONITOR: t={t:.1f}s, propellant={remaining_propellant/1000:.1f}t, "
-                                       f"mass_flow={mass_flow_actual:.1f}kg/s, thrust={thrust_actual/1000:.0f}kN, "
-                                       f"burn_time={stage_elapsed_time:.1f}s/{current_stage.burn_time:.1f}s")
+                    # k1: 現在の状態での微分
+                    self._calculate_total_acceleration(t, out=k1[3:], context=context)
+                    k1[:3] = y0[3:]
                     
-                    # Professor v39: Enhanced Stage-3 fuel monitoring for TLI readiness
-                    elif self.rocket.current_stage == 2:  # Stage-3 (S-IVB)
-                        thrust_actual = current_stage.get_thrust(altitude)
-                        mass_flow_actual = current_stage.get_mass_flow_rate(altitude)
-                        fuel_percentage = (remaining_propellant / current_stage.propellant_mass) * 100 if current_stage.propellant_mass > 0 else 0
-                        tli_ready = "TLI_READY" if fuel_percentage >= 30.0 else "TLI_RISK"
-                        
-                        self.logger.info(f"STAGE-3 MONITOR: t={t:.1f}s, propellant={remaining_propellant/1000:.1f}t ({fuel_percentage:.1f}%), "
-                                       f"mass_flow={mass_flow_actual:.1f}kg/s, thrust={thrust_actual/1000:.0f}kN, "
-                                       f"burn_time={stage_elapsed_time:.1f}s/{current_stage.burn_time:.1f}s, {tli_ready}")
-                        
-                        # Alert when Stage-3 fuel drops below TLI threshold
-                        if fuel_percentage < 30.0 and fuel_percentage > 25.0:
-                            self.logger.warning(f"STAGE-3 FUEL WARNING: {fuel_percentage:.1f}% remaining - approaching TLI minimum threshold")
-                else:
-                    remaining_propellant = 0
+                    # k2: dt/2での状態での微分
+                    self.rocket.position = stage_pos
+                    self.rocket.velocity = stage_vel
+                    _rk4_substate(y0, k1, half_dt, stage_y)
+                    self._calculate_total_acceleration(t + half_dt, out=k2[3:])
+                    k2[:3] = stage_y[3:]
+                    
+                    # k3: dt/2での状態（k2使用）での微分
+                    _rk4_substate(y0, k2, half_dt, stage_y)
+                    self._calculate_total_acceleration(t + half_dt, out=k3[3:])
+                    k3[:3] = stage_y[3:]
+                    
+                    # k4: dtでの状態（k3使用）での微分
+                    _rk4_substate(y0, k3, dt, stage_y)
+                    self._calculate_total_acceleration(t + dt, out=k4[3:])
+                    k4[:3] = stage_y[3:]
+                    
+                    # 最終状態更新（RK4公式）: k1 + 2*k2 + 2*k3 + k4
+                    # 履歴やモニタが参照を保持するため、確定状態は新しい配列に書き出す
+                    y1 = _rk4_combine(y0, k1, k2, k3, k4, rk4_weight)
+                    self.rocket.position = Vector3.from_array(y1[:3])
+                    self.rocket.velocity = Vector3.from_array(y1[3:])
                 
-                # Calculate dynamic pressure for CSV logging
-                csv_velocity = self.rocket.velocity.magnitude()
-                csv_density = self._calculate_atmospheric_density(altitude)
-                csv_dynamic_pressure = 0.5 * csv_density * csv_velocity**2  # Pa
-                csv_max_dynamic_pressure = getattr(self, 'max_dynamic_pressure', 0.0)
+                # Professor v27: Update orbital monitor with new state
+                self.orbital_monitor.update_state(self.rocket.position, self.rocket.velocity, t)
                 
-                self.csv_writer.writerow([
-                    f"{t:.1f}",
-                    f"{altitude:.1f}",
-                    f"{velocity:.1f}",
-                    f"{mass:.1f}",
-                    f"{self.total_delta_v:.1f}",
-                    self.rocket.phase.value,
-                    self.rocket.current_stage,
-                    f"{(apoapsis-R_EARTH)/1000:.1f}" if apoapsis != float('inf') else "inf",
-                    f"{(periapsis-R_EARTH)/1000:.1f}",
-                    f"{eccentricity:.3f}",
-                    f"{flight_path_angle_deg:.2f}",
-                    f"{pitch_angle_deg:.2f}",
-                    f"{remaining_propellant/1000:.1f}",
-                    f"{csv_dynamic_pressure:.1f}",
-                    f"{csv_max_dynamic_pressure:.1f}"
-                ])
-                self.csv_file.flush()
-            
-            # 統計更新
-            self.max_altitude = max(self.max_altitude, altitude)
-            self.max_velocity = max(self.max_velocity, velocity)
-            
-            # RK4積分
-            # k1: 現在の状態での微分
-            k1_v = self._calculate_total_acceleration(t)
-            k1_r = self.rocket.velocity
-            
-            # 状態の完全コピーを保存
-            orig_pos = Vector3(self.rocket.position.x, self.rocket.position.y, self.rocket.position.z)
-            orig_vel = Vector3(self.rocket.velocity.x, self.rocket.velocity.y, self.rocket.velocity.z)
-            
-            # k2: dt/2での状態での微分
-            self.rocket.position = orig_pos + k1_r * (dt/2)
-            self.rocket.velocity = orig_vel + k1_v * (dt/2)
-            k2_v = self._calculate_total_acceleration(t + dt/2)
-            k2_r = self.rocket.velocity
-            
-            # k3: dt/2での状態（k2使用）での微分
-            self.rocket.position = orig_pos + k2_r * (dt/2)
-            self.rocket.velocity = orig_vel + k2_v * (dt/2)
-            k3_v = self._calculate_total_acceleration(t + dt/2)
-            k3_r = self.rocket.velocity
-            
-            # k4: dtでの状態（k3使用）での微分
-            self.rocket.position = orig_pos + k3_r * dt
-            self.rocket.velocity = orig_vel + k3_v * dt
-            k4_v = self._calculate_total_acceleration(t + dt)
-            k4_r = self.rocket.velocity
-            
-            # 最終状態更新（RK4公式）
-            self.rocket.velocity = orig_vel + (k1_v + k2_v * 2 + k3_v * 2 + k4_v) * (dt/6)
-            self.rocket.position = orig_pos + (k1_r + k2_r * 2 + k3_r * 2 + k4_r) * (dt/6)
-            
-            # Professor v27: Update orbital monitor with new state
-            self.orbital_monitor.update_state(self.rocket.position, self.rocket.velocity, t)
-            
-            # Professor v27: Check LEO mission success
-            self.check_leo_success()
-            
-            # その他の更新
-            self._update_moon_position(dt)
-            self.rocket.update_stage(dt)
-            
-            # ΔV calculation using stage-end ledger (Professor v11)
-            self._update_stage_delta_v()
-            
-            t += dt
-            steps += 1
-            
-            # 定期的な状態出力（1000秒ごと） - Professor v7: enhanced logging
-            if steps % 10000 == 0:
-                flight_path_angle_deg = np.degrees(self.get_flight_path_angle())
-                import guidance
-                pitch_angle_deg = guidance.get_target_pitch_angle(altitude, velocity)
+                # Professor v27: Check LEO mission success
+                self.check_leo_success()
+                
+                # その他の更新（月はステップ終了時刻の位置に設定）
+                self._set_moon_time(t + dt)
+                self.rocket.update_stage(dt)
                 
-                self.logger.info(f"t={t/3600:.1f}h, alt={altitude/1000:.1f}km, "
-                                f"v={velocity:.0f}m/s, ΔV={self.total_delta_v:.0f}m/s, "
-                                f"phase={self.rocket.phase.value}, "
-                                f"γ={flight_path_angle_deg:.1f}°, pitch={pitch_angle_deg:.1f}°")
+                # ΔV calculation using stage-end ledger (Professor v11)
+                self._update_stage_delta_v()
+                
+                t, t_compensation = _kahan_add(t, t_compensation, dt)
+                steps += 1
+                
+                # 定期的な状態出力（1000秒ごと） - Professor v7: enhanced logging
+                if steps % 10000 == 0 and self.logger.isEnabledFor(logging.INFO):
+                    flight_path_angle_deg = math.degrees(self.get_flight_path_angle())
+                    pitch_angle_deg = guidance.get_target_pitch_angle(altitude, velocity)
+                    
+                    self.logger.info("t=%.1fh, alt=%.1fkm, v=%.0fm/s, ΔV=%.0fm/s, phase=%s, γ=%.1f°, pitch=%.1f°",
+                                     t / 3600, altitude / 1000, velocity, self.total_delta_v,
+                                     self.rocket.phase.value, flight_path_angle_deg, pitch_angle_deg)
+        finally:
+            # 例外で中断しても、そこまでのログ行はバッファに残さずファイルへ書き出す
+            if self.csv_file is None:
+                self._save_log_npz()
+            else:
+                self._flush_csv_rows()
+                self.csv_file.flush()
         
         # 最終記録
         self.time_history.append(t)
@@ -1681,7 +2209,9 @@ class Mission:
         self.phase_history.append(self.rocket.phase)
         
         # CSVファイルを閉じる
-        self.csv_file.close()
+        if self.csv_file is not None:
+            self._flush_csv_rows()
+            self.csv_file.close()
         
         return self._compile_results()
     
@@ -1739,6 +2269,13 @@ class Mission:
                     "eccentricity": final_ecc
                 }
         
+        # フェーズ履歴を状態履歴と同じ間隔に揃える（ループ内は間引き、末尾は最終記録）
+        phase_values = self.phase_history.tolist(self._history_stride)
+        
+        # 月位置は円軌道の閉形式なので、記録時刻の列から一括で求める（ステップ毎には保持しない）
+        moon_angles = MOON_ANGULAR_RATE * self.time_history.array
+        moon_positions = EARTH_MOON_DIST * np.column_stack([np.cos(moon_angles), np.sin(moon_angles)])
+        
         return {
             "mission_success": mission_success,
             "final_phase": self.rocket.phase.value,
@@ -1759,22 +2296,70 @@ class Mission:
             "final_mass": self.mass_history[-1] if self.mass_history else self.rocket.total_mass,
             "propellant_used": sum(stage.propellant_mass for stage in self.rocket.stages[:self.rocket.current_stage]),
             "stage_fuel_remaining": self._calculate_stage_fuel_remaining(),
-            "tli_analysis": getattr(self, 'tli_analysis', {}),
-            "time_history": self.time_history,
-            "position_history": [(p.x, p.y) for p in self.position_history],
-            "velocity_history": [(v.x, v.y) for v in self.velocity_history],
-            "altitude_history": self.altitude_history,
-            "mass_history": self.mass_history,
-            "phase_history": [p.value for p in self.phase_history],
+            "tli_analysis": self.tli_analysis,
+            "time_history": self.time_history.tolist(),
+            "position_history": self.position_history.array[:, :2].tolist(),
+            "velocity_history": self.velocity_history.array[:, :2].tolist(),
+            "altitude_history": self.altitude_history.tolist(),
+            "mass_history": self.mass_history.tolist(),
+            "phase_history": phase_values,
             # Professor v33: Add Moon position history for trajectory plotting
-            "moon_position_history": [(self.moon.position.x, self.moon.position.y) for _ in self.time_history]
+            "moon_position_history": moon_positions.tolist()
         }
 
 
+def _simulate_batch_worker(config: Dict) -> Dict:
+    """
+    1軌道分を独立したプロセスで実行
+    機体・エンジン設定は main() と同じく呼び出し元ディレクトリから読み、出力ログ（CSV・leo_state）だけ一時ディレクトリへ
+    """
+    import os
+    import tempfile
+
+    cwd = os.getcwd()
+    rocket = create_saturn_v_rocket(os.path.join(cwd, "saturn_v_config.json"))
+    # エンジン特性（engine_curve.json）は初回の推力参照で読まれるため、chdir 前に解決しておく
+    rocket.stages[0].get_thrust(0.0)
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            mission = Mission(rocket, config)
+            return mission.simulate(duration=config.get("simulation_duration", 10 * 24 * 3600),
+                                    dt=config.get("time_step", 0.1))
+        finally:
+            os.chdir(cwd)
+
+
+def simulate_batch(configs: List[Dict], max_workers: Optional[int] = None) -> List[Dict]:
+    """
+    Run independent trajectories (one mission config each) in parallel across processes.
+    Results are returned in the order of `configs`.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    if max_workers == 1 or len(configs) <= 1:
+        return [_simulate_batch_worker(config) for config in configs]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_simulate_batch_worker, configs))
+
+
 # Professor v10: Removed duplicate function - now using vehicle.py
 
 
-def main():
+def _save_trajectory_npz(results: Dict, filename: str = "mission_results.npz"):
+    """軌道履歴をバイナリ（圧縮NPZ）で保存"""
+    np.savez_compressed(
+        filename,
+        time=np.asarray(results["time_history"], dtype=np.float64),
+        position=np.asarray(results["position_history"], dtype=np.float64),
+        velocity=np.asarray(results["velocity_history"], dtype=np.float64),
+        altitude=np.asarray(results["altitude_history"], dtype=np.float64),
+        mass=np.asarray(results["mass_history"], dtype=np.float64),
+        phase=np.asarray(results["phase_history"], dtype=str),
+    )
+
+
+def main(output_format: str = "json"):
     """メインエントリーポイント"""
     import sys
     
@@ -1913,6 +2498,12 @@ def main():
     
     # Save comprehensive results
     try:
+        if output_format == "npz":
+            # スカラー値のみJSONに、履歴はNPZに保存
+            del mission_results["trajectory_data"]
+            _save_trajectory_npz(results)
+            mission_results["trajectory_file"] = "mission_results.npz"
+            print("Trajectory histories saved to mission_results.npz")
         with open("mission_results.json", "w") as f:
             json.dump(mission_results, f, indent=2)
         print("Mission results saved to mission_results.json")
@@ -1971,6 +2562,8 @@ if __name__ == "__main__":
                        help='Enable debug-level logging for detailed output')
     parser.add_argument('--quiet', action='store_true',
                        help='Enable quiet mode with minimal logging output')
+    parser.add_argument('--format', choices=['json', 'npz'], default='json',
+                       help='Results format: full JSON, or JSON summary + compressed NPZ histories')
     
     args = parser.parse_args()
     
@@ -1987,4 +2580,4 @@ if __name__ == "__main__":
         import os
         os.environ['ROCKET_FAST_MODE'] = '1'
     
-    main()
\ No newline at end of file
+    main(output_format=args.format)
\ No newline at end of file
@@ -4,6 +4,7 @@ Consolidates Vector3, RocketStage, and Rocket classes to eliminate duplication
 Professor v13: Remove duplicate definitions across modules
 """
 
+import math
 import numpy as np
 import json
 from dataclasses import dataclass, field
@@ -13,6 +14,23 @@ from enum import Enum
 # Physical constants
 STANDARD_GRAVITY = 9.80665  # Standard gravity acceleration [m/s^2]
 
+# Enhanced engine model, resolved once per process (None when unavailable)
+_ENGINE_MODEL_UNRESOLVED = object()
+_engine_model = _ENGINE_MODEL_UNRESOLVED
+
+
+def _get_engine_model():
+    """Return the shared engine model, or None if it cannot be built"""
+    global _engine_model
+    if _engine_model is _ENGINE_MODEL_UNRESOLVED:
+        try:
+            from engine import get_engine_model
+            _engine_model = get_engine_model()
+        except Exception:
+            # A failed build is not retried on every thrust/Isp query
+            _engine_model = None
+    return _engine_model
+
 
 class MissionPhase(Enum):
     """Mission phases for rocket flight"""
@@ -43,6 +61,13 @@ class Vector3:
     def __init__(self, x: float, y: float, z: float = 0.0):
         self.data = np.array([x, y, z])
     
+    @classmethod
+    def from_array(cls, data: np.ndarray) -> 'Vector3':
+        """Wrap an existing float64 array without copying"""
+        vec = cls.__new__(cls)
+        vec.data = data
+        return vec
+    
     @property
     def x(self) -> float:
         return self.data[0]
@@ -56,27 +81,46 @@ class Vector3:
         return self.data[2]
     
     def magnitude(self) -> float:
-        return np.linalg.norm(self.data)
+        # Scalar hypot is far cheaper than np.linalg.norm on 3 elements;
+        # keep the np.float64 result so division by a zero magnitude still yields inf
+        return np.float64(math.hypot(*self.data.tolist()))
     
     def normalized(self) -> 'Vector3':
         mag = self.magnitude()
         if mag == 0:
             return Vector3(0, 0, 0)
-        return Vector3(*(self.data / mag))
+        return Vector3.from_array(self.data / mag)
+    
+    def dot(self, other: 'Vector3') -> float:
+        # Scalar arithmetic on the three components avoids NumPy's per-call dispatch for `@`
+        x1, y1, z1 = self.data.tolist()
+        x2, y2, z2 = other.data.tolist()
+        return x1 * x2 + y1 * y2 + z1 * z2
+    
+    def iadd_scaled(self, other: 'Vector3', scale: float) -> None:
+        """In-place self += other * scale, without the temporaries of `*` and `+`"""
+        x1, y1, z1 = self.data.tolist()
+        x2, y2, z2 = other.data.tolist()
+        self.data[:] = (x1 + x2 * scale, y1 + y2 * scale, z1 + z2 * scale)
     
+    # The NumPy result is already a fresh array: wrap it instead of unpacking into a new one
     def __add__(self, other: 'Vector3') -> 'Vector3':
-        return Vector3(*(self.data + other.data))
+        return Vector3.from_array(self.data + other.data)
     
     def __sub__(self, other: 'Vector3') -> 'Vector3':
-        return Vector3(*(self.data - other.data))
+        return Vector3.from_array(self.data - other.data)
     
     def __mul__(self, scalar: float) -> 'Vector3':
-        return Vector3(*(self.data * scalar))
+        return Vector3.from_array(self.data * scalar)
     
     def __repr__(self) -> str:
         return f"Vector3({self.x:.2e}, {self.y:.2e}, {self.z:.2e})"
 
 
+# Phases in which the engine is shut down regardless of remaining propellant
+_NON_THRUSTING_PHASES = frozenset({MissionPhase.LEO_STABLE})
+
+
 @dataclass
 class RocketStage:
     """Rocket stage data and methods"""
@@ -95,55 +139,39 @@ class RocketStage:
     
     def get_thrust(self, altitude: float, throttle: float = 1.0) -> float:
         """Get thrust based on altitude using enhanced engine model if available"""
-        try:
-            # Try to use enhanced engine model
-            from engine import get_engine_model
-            engine_model = get_engine_model()
-            
-            # Map stage name to engine model stage identifier
-            stage_id = self._get_stage_identifier()
-            if stage_id:
+        engine_model = _get_engine_model()
+        stage_id = self._get_stage_identifier() if engine_model is not None else None
+        if stage_id:
+            try:
                 return engine_model.get_thrust(stage_id, altitude, throttle)
-        except (ImportError, Exception):
-            # Fallback to linear interpolation
-            pass
-        
-        # Fallback linear interpolation
-        if altitude < 0:
-            base_thrust = self.thrust_sea_level
-        elif altitude > 100e3:  # Above 100km is vacuum
-            base_thrust = self.thrust_vacuum
-        else:
-            # Linear interpolation between 0-100km
-            factor = altitude / 100e3
-            base_thrust = self.thrust_sea_level * (1 - factor) + self.thrust_vacuum * factor
+            except Exception:
+                # Fallback to linear interpolation
+                pass
         
-        return base_thrust * throttle
+        return self._interpolate_performance(altitude)[0] * throttle
     
     def get_specific_impulse(self, altitude: float) -> float:
         """Get specific impulse based on altitude using enhanced engine model if available"""
-        try:
-            # Try to use enhanced engine model
-            from engine import get_engine_model
-            engine_model = get_engine_model()
-            
-            # Map stage name to engine model stage identifier
-            stage_id = self._get_stage_identifier()
-            if stage_id:
+        engine_model = _get_engine_model()
+        stage_id = self._get_stage_identifier() if engine_model is not None else None
+        if stage_id:
+            try:
                 return engine_model.get_specific_impulse(stage_id, altitude)
-        except (ImportError, Exception):
-            # Fallback to linear interpolation
-            pass
+            except Exception:
+                # Fallback to linear interpolation
+                pass
         
-        # Fallback linear interpolation
+        return self._interpolate_performance(altitude)[1]
+    
+    def _interpolate_performance(self, altitude: float):
+        """Fallback (thrust, Isp): linear between sea level and vacuum over 0-100km"""
         if altitude < 0:
-            return self.specific_impulse_sea_level
-        elif altitude > 100e3:  # Above 100km is vacuum
-            return self.specific_impulse_vacuum
-        else:
-            # Linear interpolation between 0-100km
-            factor = altitude / 100e3
-            return self.specific_impulse_sea_level * (1 - factor) + self.specific_impulse_vacuum * factor
+            return self.thrust_sea_level, self.specific_impulse_sea_level
+        if altitude > 100e3:  # Above 100km is vacuum
+            return self.thrust_vacuum, self.specific_impulse_vacuum
+        factor = altitude / 100e3
+        return (self.thrust_sea_level * (1 - factor) + self.thrust_vacuum * factor,
+                self.specific_impulse_sea_level * (1 - factor) + self.specific_impulse_vacuum * factor)
     
     def _get_stage_identifier(self) -> str:
         """Map stage name to engine model identifier"""
@@ -158,8 +186,12 @@ class RocketStage:
     
     def get_mass_flow_rate(self, altitude: float) -> float:
         """Get mass flow rate [kg/s] based on altitude"""
-        thrust = self.get_thrust(altitude)
-        isp = self.get_specific_impulse(altitude)
+        if _get_engine_model() is None or not self._get_stage_identifier():
+            # Thrust and Isp share one interpolation factor
+            thrust, isp = self._interpolate_performance(altitude)
+        else:
+            thrust = self.get_thrust(altitude)
+            isp = self.get_specific_impulse(altitude)
         return thrust / (isp * STANDARD_GRAVITY)
 
     def get_mass_at_time(self, burn_duration: float, altitude: float) -> float:
@@ -186,6 +218,10 @@ class Rocket:
     phase: MissionPhase = MissionPhase.PRE_LAUNCH
     position: Vector3 = field(default_factory=lambda: Vector3(0, 0, 0))
     velocity: Vector3 = field(default_factory=lambda: Vector3(0, 0, 0))
+    # (current_stage, fixed mass) memo for get_current_mass; rebuilt on staging
+    _fixed_mass_cache: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+    # (phase, current_stage, burning stage or None) memo for is_thrusting; rebuilt on phase change/staging
+    _thrust_stage_cache: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
     
     @property
     def total_mass(self) -> float:
@@ -206,11 +242,7 @@ class Rocket:
         Returns:
             Current total mass [kg] including consumed propellant
         """
-        total_mass = self.payload_mass
-        
-        # Add mass from all stages after current stage (not yet used)
-        for i in range(self.current_stage + 1, len(self.stages)):
-            total_mass += self.stages[i].total_mass
+        total_mass = self._fixed_mass()
         
         # Add mass from current stage, accounting for propellant consumption
         if self.current_stage < len(self.stages):
@@ -221,12 +253,22 @@ class Rocket:
             current_stage_mass = current_stage.get_mass_at_time(stage_elapsed_time, altitude)
             total_mass += current_stage_mass
         
-        # Add dry mass from all previous stages (already consumed)
-        for i in range(self.current_stage):
-            total_mass += self.stages[i].dry_mass
-        
         return total_mass
     
+    def _fixed_mass(self) -> float:
+        """Payload + unused stages after the current one + dry mass of stages before it"""
+        cache = self._fixed_mass_cache
+        if cache is None or cache[0] != self.current_stage:
+            fixed_mass = self.payload_mass
+            # Add mass from all stages after current stage (not yet used)
+            for i in range(self.current_stage + 1, len(self.stages)):
+                fixed_mass += self.stages[i].total_mass
+            # Add dry mass from all previous stages (already consumed)
+            for i in range(self.current_stage):
+                fixed_mass += self.stages[i].dry_mass
+            cache = self._fixed_mass_cache = (self.current_stage, fixed_mass)
+        return cache[1]
+    
     @property
     def current_stage_obj(self) -> Optional[RocketStage]:
         """Get current active stage object"""
@@ -275,26 +317,23 @@ class Rocket:
         return Vector3(0, 0, thrust_magnitude)
 
     def is_thrusting(self, current_time: float, altitude: float) -> bool:
-        # Professor v29: S-IVB engine cutoff for LEO_STABLE phase
-        if self.phase == MissionPhase.LEO_STABLE:
-            return False  # Engine is shut down in stable LEO
-        
-        # Professor v29: Allow thrusting during TLI_BURN phase
-        if self.phase == MissionPhase.TLI_BURN:
-            stage = self.current_stage_obj
-            if not stage:
-                return False
-            # For TLI, check if we have propellant (guidance will handle cutoff)
-            stage_elapsed_time = current_time - self.stage_start_time
-            return stage_elapsed_time < stage.burn_time and stage.propellant_mass > 0
-        
-        stage = self.current_stage_obj
-        if not stage:
+        stage = self._thrust_stage()
+        if stage is None:
             return False
         
         stage_elapsed_time = current_time - self.stage_start_time
         return stage_elapsed_time < stage.burn_time and stage.propellant_mass > 0
     
+    def _thrust_stage(self) -> Optional[RocketStage]:
+        """Stage that may burn in the current phase (None if the engine is off by phase or no stage is left)"""
+        cache = self._thrust_stage_cache
+        if cache is None or cache[0] is not self.phase or cache[1] != self.current_stage:
+            # Professor v29: S-IVB engine cutoff for LEO_STABLE phase
+            # (TLI_BURN uses the propellant check in is_thrusting; guidance handles cutoff)
+            stage = None if self.phase in _NON_THRUSTING_PHASES else self.current_stage_obj
+            cache = self._thrust_stage_cache = (self.phase, self.current_stage, stage)
+        return cache[2]
+    
     def separate_stage(self, current_time: float) -> bool:
         """Separate current stage and activate next stage"""
         if self.current_stage < len(self.stages) - 1:
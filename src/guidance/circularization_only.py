@@ -128,14 +128,11 @@ class MockMission:
         altitude = self.get_altitude()
         thrust_magnitude = self.rocket.get_thrust(altitude)
         
+        # Gravitational acceleration (the total is accumulated into this one vector)
+        r = self.rocket.position.magnitude()
+        total_acc = self.rocket.position * (-MU_EARTH / r**3)
+        
         if thrust_magnitude > 0:
-            # Simple prograde thrust for circularization
-            if self.rocket.velocity.magnitude() > 0:
-                thrust_direction = self.rocket.velocity.normalized()
-                thrust_vector = thrust_direction * thrust_magnitude
-            else:
-                thrust_vector = Vector3(0, 0, 0)
-                
             # Update mass (consume fuel)
             stage3 = self.rocket.stages[2]
             mass_flow_rate = stage3.get_mass_flow_rate(altitude)
@@ -143,25 +140,15 @@ class MockMission:
             stage3.propellant_mass = max(0, stage3.propellant_mass - fuel_consumed_dt)
             self.fuel_consumed += fuel_consumed_dt
             
-            # Apply thrust acceleration  
+            # Apply thrust acceleration: simple prograde thrust for circularization
             total_mass = self.rocket.get_current_mass(0, altitude)  # Provide required args
-            if total_mass > 0:
-                acceleration = thrust_vector * (1.0 / total_mass)
-            else:
-                acceleration = Vector3(0, 0, 0)
-        else:
-            acceleration = Vector3(0, 0, 0)
-        
-        # Gravitational acceleration
-        r = self.rocket.position.magnitude()
-        gravity_acc = self.rocket.position * (-MU_EARTH / r**3)
-        
-        # Total acceleration
-        total_acc = acceleration + gravity_acc
+            speed = self.rocket.velocity.magnitude()
+            if total_mass > 0 and speed > 0:
+                total_acc.iadd_scaled(self.rocket.velocity, thrust_magnitude / (total_mass * speed))
         
-        # Update velocity and position (simple Euler integration)
-        self.rocket.velocity += total_acc * dt
-        self.rocket.position += self.rocket.velocity * dt
+        # Update velocity and position (simple Euler integration, in place)
+        self.rocket.velocity.iadd_scaled(total_acc, dt)
+        self.rocket.position.iadd_scaled(self.rocket.velocity, dt)
         
         # Track metrics
         _, periapsis, _ = self.get_orbital_elements()
@@ -200,11 +187,8 @@ def run_circularization_test(dt: float = 0.1, verbose: bool = False) -> dict:
         if verbose and t % 1.0 < dt:
             mass_flow_rate = stage3.get_mass_flow_rate(mission.get_altitude())
             periapsis_error = periapsis - (R_EARTH + config.target_periapsis)
-            mission.logger.debug(
-                f"{t:.1f}s | m_dot={mass_flow_rate:.3f} kg/s "
-                f"fuel_left={stage3.propellant_mass:.1f} kg ({fuel_fraction*100:.1f}%) "
-                f"periapsis_err={periapsis_error:.1f} m"
-            )
+            mission.logger.debug("%.1fs | m_dot=%.3f kg/s fuel_left=%.1f kg (%.1f%%) periapsis_err=%.1f m",
+                                 t, mass_flow_rate, stage3.propellant_mass, fuel_fraction * 100, periapsis_error)
         
         # Check termination conditions
         # 1. Fuel guard-rail (5% minimum)
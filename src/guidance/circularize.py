@@ -56,7 +56,7 @@ def calculate_time_to_apoapsis(position: Vector3, velocity: Vector3) -> float:
         
         # Current radial velocity (dot product)
         pos_unit = position.normalized()
-        radial_velocity = velocity.data @ pos_unit.data
+        radial_velocity = velocity.dot(pos_unit)
         
         # True anomaly calculation
         cos_nu = (a * (1 - e * e) / r - 1) / e if e > 1e-6 else 0
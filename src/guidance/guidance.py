@@ -5,7 +5,7 @@ Professor v23: Added pitch rate limiting for Max-Q protection
 """
 
 import numpy as np
-from vehicle import Vector3
+from vehicle import Vector3, MissionPhase
 from config_flags import is_enabled
 
 # Global state for pitch rate limiting
@@ -240,8 +240,6 @@ def compute_thrust_direction(mission, t: float, thrust_magnitude: float) -> Vect
     Professor v17: Enhanced with PEG guidance integration
     Action A3: Added prograde thrust for circularization
     """
-    from vehicle import MissionPhase
-    
     rocket = mission.rocket
     altitude = mission.get_altitude()
 
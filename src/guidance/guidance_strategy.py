@@ -3,6 +3,7 @@ Strategy Pattern Guidance Architecture
 Task 3-6: Modular guidance system using Strategy pattern for cleaner fault handling
 """
 
+import math
 import numpy as np
 import logging
 from abc import ABC, abstractmethod
@@ -39,7 +40,9 @@ class GuidanceCommand:
 
 @dataclass
 class VehicleState:
-    """Current vehicle state for guidance"""
+    """Current vehicle state for guidance (built every thrust evaluation, so slotted)"""
+    __slots__ = ('position', 'velocity', 'altitude', 'mass', 'mission_phase', 'time')
+
     position: Vector3
     velocity: Vector3
     altitude: float
@@ -103,12 +106,12 @@ class GravityTurnStrategy(IGuidanceStrategy):
         pitch_error = target_pitch - current_flight_path_angle
         
         # Convert to thrust direction (simplified)
-        pitch_rad = np.radians(target_pitch)
+        pitch_rad = math.radians(target_pitch)
         
         # Thrust direction in local coordinates (pitch from vertical)
         thrust_direction = Vector3(
-            np.sin(pitch_rad),  # Horizontal component
-            np.cos(pitch_rad),  # Vertical component
+            math.sin(pitch_rad),  # Horizontal component
+            math.cos(pitch_rad),  # Vertical component
             0.0                 # No yaw
         )
         
@@ -150,7 +153,7 @@ class GravityTurnStrategy(IGuidanceStrategy):
     def _get_flight_path_angle(self, vehicle_state: VehicleState) -> float:
         """Calculate current flight path angle"""
         # Simplified calculation
-        v_radial = vehicle_state.velocity.data @ vehicle_state.position.normalized().data
+        v_radial = vehicle_state.velocity.dot(vehicle_state.position.normalized())
         v_total = vehicle_state.velocity.magnitude()
         
         if v_total == 0:
@@ -159,7 +162,7 @@ class GravityTurnStrategy(IGuidanceStrategy):
         sin_gamma = v_radial / v_total
         sin_gamma = max(-1.0, min(1.0, sin_gamma))  # Clamp
         
-        return np.degrees(np.arcsin(sin_gamma))
+        return math.degrees(math.asin(sin_gamma))
     
     def is_phase_complete(self, vehicle_state: VehicleState, target_state: Dict) -> bool:
         """Check if gravity turn is complete"""
@@ -3,7 +3,10 @@ Powered Explicit Guidance (PEG) Implementation
 Professor v15: Basic PEG logic with target orbit h=200km, e<10^-3
 """
 
+import math
 import numpy as np
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Tuple, Optional
 from vehicle import Vector3
 
@@ -13,6 +16,28 @@ M_EARTH = 5.972e24  # Earth mass [kg]
 R_EARTH = 6371e3  # Earth radius [m]
 MU_EARTH = G * M_EARTH  # Standard gravitational parameter [m^3/s^2]
 
+# Ascent pitch schedule for the high-ΔV branch of the standard PEG logic:
+# 0-45° over the first 45 km, held at 45° to 50 km, then 1°/km up to the 85° cap
+_ASCENT_ALT_BREAKS = np.array([0.0, 45e3, 50e3, 90e3, 100e3])  # [m]
+_ASCENT_PITCH_DEG = np.array([0.0, 45.0, 45.0, 85.0, 85.0])  # [deg]
+
+@dataclass(frozen=True)
+class PEGConstants:
+    """Target-orbit constants derived once per target altitude"""
+    target_radius: float  # Target orbit radius [m]
+    circular_velocity: float  # Circular orbit velocity at target radius [m/s]
+    target_energy: float  # Specific energy of target circular orbit [J/kg]
+
+@lru_cache(maxsize=16)
+def _peg_constants(target_altitude: float) -> PEGConstants:
+    """Derive target-orbit constants, shared by every PEG instance with the same target"""
+    target_radius = R_EARTH + target_altitude
+    return PEGConstants(
+        target_radius=target_radius,
+        circular_velocity=math.sqrt(MU_EARTH / target_radius),
+        target_energy=-MU_EARTH / (2 * target_radius)
+    )
+
 class PEGGuidance:
     """
     Enhanced Powered Explicit Guidance implementation
@@ -29,7 +54,12 @@ class PEGGuidance:
         """
         self.target_altitude = target_altitude
         self.target_eccentricity = target_eccentricity
-        self.target_radius = R_EARTH + target_altitude
+        self.k = _peg_constants(target_altitude)
+        self.target_radius = self.k.target_radius
+        
+        # Circularization band: within 10 km of the target radius
+        self._band_lo = self.target_radius - 10000.0
+        self._band_hi = self.target_radius + 10000.0
         
         # Target orbital velocity for circular orbit - Professor v16: tuned to 7790 m/s
         self.target_velocity = 7790.0  # Professor feedback: specific target velocity
@@ -107,10 +137,10 @@ class PEGGuidance:
         current_energy = 0.5 * v * v - MU_EARTH / r
         
         # Target specific energy for circular orbit
-        target_energy = -MU_EARTH / (2 * self.target_radius)
+        target_energy = self.k.target_energy
         
         # If we're at target altitude, calculate circularization ΔV
-        if abs(r - self.target_radius) < 10000:  # Within 10km of target
+        if self._band_lo < r < self._band_hi:  # Within 10km of target
             target_v = np.sqrt(MU_EARTH / r)  # Circular velocity at current altitude
             delta_v_mag = abs(target_v - v)
             
@@ -172,10 +202,14 @@ class PEGGuidance:
         altitude = r - R_EARTH
         v = velocity.magnitude()
         
-        # Flight path angle with derivative damping
-        pos_unit = position.normalized()
-        vel_unit = velocity.normalized()
-        flight_path_angle = np.pi/2 - np.arccos(np.clip(pos_unit.data @ vel_unit.data, -1, 1))
+        # Flight path angle with derivative damping: γ = asin(r·v / (|r||v|))
+        rv = r * v
+        if rv > 0:
+            cos_angle = (position.x * velocity.x + position.y * velocity.y + position.z * velocity.z) / rv
+            cos_angle = max(-1.0, min(1.0, cos_angle))  # Scalar clamp, avoids ufunc dispatch
+        else:
+            cos_angle = 0.0
+        flight_path_angle = math.asin(cos_angle)
         
         # Professor v17: γ derivative damping
         gamma_derivative = (flight_path_angle - self.last_flight_path_angle) / self.update_interval
@@ -228,13 +262,13 @@ class PEGGuidance:
         v_circular_current = np.sqrt(MU_EARTH / r)
         
         # Target orbital velocity at target radius
-        v_circular_target = np.sqrt(MU_EARTH / self.target_radius)
+        v_circular_target = self.k.circular_velocity
         
         # Current specific energy
         current_energy = 0.5 * v**2 - MU_EARTH / r
         
         # Target specific energy for circular orbit
-        target_energy = -MU_EARTH / (2 * self.target_radius)
+        target_energy = self.k.target_energy
         
         # Required velocity change magnitude
         if r < self.target_radius:  # Below target altitude
@@ -349,7 +383,7 @@ class PEGGuidance:
         radial_unit = position.normalized()
         
         # Dot product to get cosine of angle from vertical
-        cos_pitch = radial_unit.data @ thrust_vector.data
+        cos_pitch = radial_unit.dot(thrust_vector)
         cos_pitch = np.clip(cos_pitch, -1, 1)
         
         pitch_rad = np.arccos(cos_pitch)
@@ -364,12 +398,8 @@ class PEGGuidance:
         
         if altitude < 100e3:  # In atmosphere - focus on altitude gain
             if delta_v_needed > 1000:  # Significant ΔV needed
-                # Gradually pitch over based on altitude and velocity
-                if altitude < 50e3:
-                    base_pitch = min(45, altitude / 1000)  # 0-45° by 50km
-                else:
-                    base_pitch = 45 + (altitude - 50e3) / 1000  # Continue pitching
-                    base_pitch = min(85, base_pitch)
+                # Gradually pitch over based on altitude (table lookup)
+                base_pitch = float(np.interp(altitude, _ASCENT_ALT_BREAKS, _ASCENT_PITCH_DEG))
                 
                 # Apply damping
                 pitch_deg = base_pitch * damping_factor
@@ -412,11 +442,17 @@ class PEGGuidance:
         Returns:
             True if guidance corrections are needed
         """
+        # Fast path: periapsis can never exceed the current radius, so below the
+        # periapsis threshold the target cannot be achieved yet
+        min_periapsis = R_EARTH + self.target_altitude * 0.9
+        if position.magnitude() <= min_periapsis:
+            return True
+        
         apoapsis, periapsis, eccentricity = self.calculate_orbital_elements(position, velocity)
         
         # Check if we're close to target orbit - Professor v16: lowered abort-eccentricity threshold
         target_achieved = (
-            periapsis > R_EARTH + self.target_altitude * 0.9 and
+            periapsis > min_periapsis and
             eccentricity < 0.02  # Professor feedback: lower threshold to 0.02
         )
         
@@ -80,7 +80,7 @@ def test_guidance_commands():
     
     # Check if thrust is pointing in the right direction
     thrust_unit = guidance_command.thrust_direction
-    dot_product = radial_unit.data @ thrust_unit.data
+    dot_product = radial_unit.dot(thrust_unit)
     logger.info(f"Dot product with radial (should be ~1.0 for vertical): {dot_product:.3f}")
     
     if abs(dot_product - 1.0) < 0.1:
@@ -138,7 +138,7 @@ class MonteCarloOrchestrator:
             self.output_dir.mkdir(parents=True, exist_ok=True)
             with open(self.state_file, 'w') as f:
                 json.dump(state, f, indent=2)
-            self.logger.debug(f"Campaign state saved: {completed_runs} runs completed")
+            self.logger.debug("Campaign state saved: %s runs completed", completed_runs)
         except Exception as e:
             self.logger.warning(f"Failed to save campaign state: {e}")
     
@@ -71,6 +71,7 @@ class OrbitalMonitor:
         # Current orbital state
         self.current_state: Optional[OrbitalState] = None
         self.previous_state: Optional[OrbitalState] = None
+        self.state_version = 0  # Incremented on every recomputation of current_state
         
         # Circular orbit criteria
         self.circular_eccentricity_threshold = 0.01  # e < 0.01 for circular
@@ -108,6 +109,7 @@ class OrbitalMonitor:
         
         # Calculate new orbital state
         self.current_state = self._calculate_orbital_state(position, velocity, time)
+        self.state_version += 1
         
         return True
     
@@ -210,7 +212,7 @@ class OrbitalMonitor:
         
         # Current radius and radial velocity
         r = position.magnitude()
-        r_dot = (position.data @ velocity.data) / r
+        r_dot = position.dot(velocity) / r
         
         # Eccentric anomaly from position
         cos_E = (1 - r / semi_major_axis) / eccentricity if eccentricity > 0 else 0
@@ -260,7 +262,7 @@ class OrbitalMonitor:
         # True anomaly (angle from periapsis)
         r = position.magnitude()
         v = velocity.magnitude()
-        r_dot = (position.data @ velocity.data) / r
+        r_dot = position.dot(velocity) / r
         
         # Simplified true anomaly calculation
         if h_magnitude > 0 and r > 0:
@@ -21,7 +21,7 @@ import numpy as np
 # Add current directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from post_flight_analysis import PostFlightAnalyzer, MissionResults
+from post_flight_analysis import PostFlightAnalyzer, MissionResults, validate_batch
 
 @dataclass
 class ParameterSet:
@@ -288,13 +288,18 @@ class ParameterSweepRunner:
         
         # Run tests
         start_time = time.time()
-        successful_runs = 0
+        mission_results = []
         
         for params in parameter_sets:
             params_result, mission_result = self.run_single_test(params)
-            
-            if mission_result.mission_success:
-                successful_runs += 1
+            mission_results.append(mission_result)
+        
+        # Validate the whole sweep in one batch
+        success_mask = validate_batch(mission_results)
+        successful_runs = int(success_mask.sum())
+        
+        for params, mission_result, success in zip(parameter_sets, mission_results, success_mask):
+            if success:
                 self.logger.info(f"✅ Test {params.test_id} SUCCESS")
             else:
                 self.logger.warning(f"❌ Test {params.test_id} FAILED: {mission_result.failure_reason}")
@@ -345,14 +350,7 @@ class ParameterSweepRunner:
                 return 7200  # Fallback to placeholder
                 
             # Find closest altitude to target
-            closest_index = 0
-            min_diff = float('inf')
-            
-            for i, alt in enumerate(altitude_history):
-                diff = abs(alt - target_altitude)
-                if diff < min_diff:
-                    min_diff = diff
-                    closest_index = i
+            closest_index = int(np.argmin(np.abs(np.asarray(altitude_history, dtype=float) - target_altitude)))
             
             if closest_index < len(velocity_history):
                 vx, vy = velocity_history[closest_index]
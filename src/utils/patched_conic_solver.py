@@ -2,6 +2,7 @@ import numpy as np
 
 # Constants
 R_SOI_MOON_KM = 66100  # Sphere of Influence of the Moon in km
+R_SOI_MOON_KM_SQ = R_SOI_MOON_KM**2  # compared against squared distances (no sqrt per check)
 
 def check_soi_transition(spacecraft_pos_eci, moon_pos_eci):
     """
@@ -14,9 +15,8 @@ def check_soi_transition(spacecraft_pos_eci, moon_pos_eci):
     Returns:
         bool: True if the spacecraft is within the Moon's SOI, False otherwise.
     """
-    relative_pos = spacecraft_pos_eci - moon_pos_eci
-    distance = np.linalg.norm(relative_pos)
-    return distance <= R_SOI_MOON_KM
+    d = np.subtract(spacecraft_pos_eci, moon_pos_eci, dtype=float)
+    return float(d @ d) <= R_SOI_MOON_KM_SQ
 
 def convert_to_lunar_frame(spacecraft_state_eci, moon_state_eci):
     """
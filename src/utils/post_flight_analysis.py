@@ -6,9 +6,108 @@ Professor v36: Automated validation checks for stable LEO achievement
 import numpy as np
 import csv
 import json
+import atexit
+import queue
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 import logging
+from logging.handlers import QueueHandler, QueueListener
+
+# Optional JIT compilation for sweep-wide validation
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Professor v36 success criteria
+MIN_PERIAPSIS_KM = 150.0
+MAX_ECCENTRICITY = 0.05
+MIN_STAGE3_PROPELLANT = 0.05
+MIN_HORIZONTAL_VELOCITY_MS = 7400.0
+
+# Structured telemetry record: one contiguous row per logged tick
+TELEMETRY_DTYPE = np.dtype([('t', 'f8'), ('v', 'f8'), ('fpa', 'f8')])
+
+def build_telemetry(times, velocities, flight_path_angles=None) -> np.ndarray:
+    """
+    Pack parallel time/velocity/flight-path-angle series into a telemetry record array
+    Missing flight path angles are stored as NaN
+    """
+    n_steps = len(times)
+    telemetry = np.empty(n_steps, dtype=TELEMETRY_DTYPE)
+    telemetry['t'] = times
+    telemetry['v'] = velocities
+    if flight_path_angles is not None and len(flight_path_angles) == n_steps:
+        telemetry['fpa'] = flight_path_angles
+    else:
+        telemetry['fpa'] = np.nan
+    return telemetry
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _validate_batch(peri, ecc, prop, hv, out_mask):
+        for i in prange(peri.size):
+            out_mask[i] = ((peri[i] > MIN_PERIAPSIS_KM) & (ecc[i] < MAX_ECCENTRICITY) &
+                           (prop[i] >= MIN_STAGE3_PROPELLANT) & (hv[i] >= MIN_HORIZONTAL_VELOCITY_MS))
+else:
+    def _validate_batch(peri, ecc, prop, hv, out_mask):
+        np.greater(peri, MIN_PERIAPSIS_KM, out=out_mask)
+        out_mask &= ecc < MAX_ECCENTRICITY
+        out_mask &= prop >= MIN_STAGE3_PROPELLANT
+        out_mask &= hv >= MIN_HORIZONTAL_VELOCITY_MS
+
+def validate_batch(results: List['MissionResults']) -> np.ndarray:
+    """
+    Validate a whole sweep of mission results against the Professor v36 criteria
+    Returns a boolean success mask aligned with results
+    """
+    peri = np.array([r.periapsis_km for r in results], dtype=np.float64)
+    ecc = np.array([r.eccentricity for r in results], dtype=np.float64)
+    prop = np.array([r.stage3_propellant_remaining for r in results], dtype=np.float64)
+    hv = np.array([r.horizontal_velocity_at_220km for r in results], dtype=np.float64)
+    
+    success_mask = np.empty(len(results), dtype=np.bool_)
+    _validate_batch(peri, ecc, prop, hv, success_mask)
+    return success_mask
+
+def _mark(passed: bool) -> str:
+    """Pass/fail marker for validation log lines"""
+    return '✅' if passed else '❌'
+
+# Process-wide log queue listener, started at most once
+_log_listener: Optional[QueueListener] = None
+
+def _stop_log_listener():
+    """Stop the shared log listener if one is running (safe to call repeatedly)"""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+def _install_log_listener():
+    """
+    Route root logging through a QueueListener shared by all analyzers
+    Leaves logging untouched when the root logger is already configured
+    """
+    global _log_listener
+    if _log_listener is not None or logging.getLogger().handlers:
+        return
+    
+    log_queue = queue.SimpleQueue()
+    _log_listener = QueueListener(
+        log_queue,
+        logging.FileHandler('post_flight_analysis.log', delay=True),
+        logging.StreamHandler()
+    )
+    _log_listener.start()
+    atexit.register(_stop_log_listener)
+    
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[QueueHandler(log_queue)]
+    )
 
 @dataclass
 class MissionResults:
@@ -23,6 +122,7 @@ class MissionResults:
     time_to_apoapsis: float
     mission_success: bool
     failure_reason: Optional[str] = None
+    telemetry: Optional[np.ndarray] = None  # TELEMETRY_DTYPE record array
 
 class PostFlightAnalyzer:
     """Automated post-flight analysis and validation"""
@@ -32,15 +132,12 @@ class PostFlightAnalyzer:
         self.setup_logging()
     
     def setup_logging(self):
-        """Setup logging configuration"""
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler('post_flight_analysis.log'),
-                logging.StreamHandler()
-            ]
-        )
+        """
+        Setup logging configuration
+        File and console output are drained by a background QueueListener so
+        log calls never block on disk I/O during parameter sweeps
+        """
+        _install_log_listener()
         self.logger = logging.getLogger(__name__)
     
     def analyze_mission(self, mission_data: Dict) -> MissionResults:
@@ -66,6 +163,7 @@ class PostFlightAnalyzer:
             stage3_propellant = mission_data.get('stage3_propellant_remaining', 0)
             horizontal_velocity_220km = mission_data.get('horizontal_velocity_at_220km', 0)
             time_to_apoapsis = mission_data.get('time_to_apoapsis', 0)
+            telemetry = self._get_telemetry(mission_data)
             
             return MissionResults(
                 apoapsis_km=apoapsis_km,
@@ -76,12 +174,25 @@ class PostFlightAnalyzer:
                 stage3_propellant_remaining=stage3_propellant,
                 horizontal_velocity_at_220km=horizontal_velocity_220km,
                 time_to_apoapsis=time_to_apoapsis,
-                mission_success=False  # Will be determined by validation
+                mission_success=False,  # Will be determined by validation
+                telemetry=telemetry
             )
         except Exception as e:
             self.logger.error(f"Error extracting orbital parameters: {e}")
             return MissionResults(0, 0, 1.0, 0, 0, 0, 0, 0, False, f"Data extraction error: {e}")
     
+    def _get_telemetry(self, mission_data: Dict) -> Optional[np.ndarray]:
+        """Return the mission telemetry record array, packing legacy time-series lists if needed"""
+        telemetry = mission_data.get('telemetry')
+        if telemetry is not None:
+            return telemetry
+        
+        times = mission_data.get('times', [])
+        velocities = mission_data.get('velocities', [])
+        if len(times) == 0 or len(times) != len(velocities):
+            return None
+        return build_telemetry(times, velocities, mission_data.get('flight_path_angles'))
+    
     def _validate_mission_success(self, results: MissionResults):
         """
         Validate mission success against Professor v36 criteria
@@ -93,25 +204,25 @@ class PostFlightAnalyzer:
         # Professor v36 Success Criteria
         
         # 1. Periapsis > 150 km
-        periapsis_success = results.periapsis_km > 150.0
+        periapsis_success = results.periapsis_km > MIN_PERIAPSIS_KM
         success_criteria.append(periapsis_success)
         if not periapsis_success:
             failure_reasons.append(f"Periapsis too low: {results.periapsis_km:.1f} km < 150 km")
         
         # 2. Eccentricity < 0.05
-        eccentricity_success = results.eccentricity < 0.05
+        eccentricity_success = results.eccentricity < MAX_ECCENTRICITY
         success_criteria.append(eccentricity_success)
         if not eccentricity_success:
             failure_reasons.append(f"Eccentricity too high: {results.eccentricity:.4f} > 0.05")
         
         # 3. Stage 3 propellant margin ≥ 5%
-        propellant_success = results.stage3_propellant_remaining >= 0.05
+        propellant_success = results.stage3_propellant_remaining >= MIN_STAGE3_PROPELLANT
         success_criteria.append(propellant_success)
         if not propellant_success:
             failure_reasons.append(f"Stage 3 propellant too low: {results.stage3_propellant_remaining:.1%} < 5%")
         
         # 4. Horizontal velocity ≥ 7.4 km/s by 220 km altitude
-        velocity_success = results.horizontal_velocity_at_220km >= 7400
+        velocity_success = results.horizontal_velocity_at_220km >= MIN_HORIZONTAL_VELOCITY_MS
         success_criteria.append(velocity_success)
         if not velocity_success:
             failure_reasons.append(f"Horizontal velocity too low: {results.horizontal_velocity_at_220km:.0f} m/s < 7400 m/s")
@@ -120,26 +231,29 @@ class PostFlightAnalyzer:
         results.mission_success = all(success_criteria)
         results.failure_reason = "; ".join(failure_reasons) if failure_reasons else None
         
-        # Log validation results
-        self.logger.info(f"Mission Validation Results:")
-        self.logger.info(f"  Periapsis: {results.periapsis_km:.1f} km ({'✅' if periapsis_success else '❌'})")
-        self.logger.info(f"  Eccentricity: {results.eccentricity:.4f} ({'✅' if eccentricity_success else '❌'})")
-        self.logger.info(f"  Stage 3 propellant: {results.stage3_propellant_remaining:.1%} ({'✅' if propellant_success else '❌'})")
-        self.logger.info(f"  Horizontal velocity: {results.horizontal_velocity_at_220km:.0f} m/s ({'✅' if velocity_success else '❌'})")
-        self.logger.info(f"  Overall success: {'✅' if results.mission_success else '❌'}")
+        # Log validation results (lazy %-formatting: skipped entirely when INFO is filtered)
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("Mission Validation Results:")
+            self.logger.info("  Periapsis: %.1f km (%s)", results.periapsis_km, _mark(periapsis_success))
+            self.logger.info("  Eccentricity: %.4f (%s)", results.eccentricity, _mark(eccentricity_success))
+            self.logger.info("  Stage 3 propellant: %.1f%% (%s)",
+                             results.stage3_propellant_remaining * 100, _mark(propellant_success))
+            self.logger.info("  Horizontal velocity: %.0f m/s (%s)",
+                             results.horizontal_velocity_at_220km, _mark(velocity_success))
+            self.logger.info("  Overall success: %s", _mark(results.mission_success))
         
         if not results.mission_success:
-            self.logger.warning(f"Mission failed: {results.failure_reason}")
+            self.logger.warning("Mission failed: %s", results.failure_reason)
     
     def _log_analysis_results(self, results: MissionResults):
         """Log detailed analysis results"""
         self.logger.info("=== POST-FLIGHT ANALYSIS SUMMARY ===")
-        self.logger.info(f"Max altitude: {results.max_altitude_km:.1f} km")
-        self.logger.info(f"Final apoapsis: {results.apoapsis_km:.1f} km")
-        self.logger.info(f"Final periapsis: {results.periapsis_km:.1f} km")
-        self.logger.info(f"Final eccentricity: {results.eccentricity:.4f}")
-        self.logger.info(f"Final velocity: {results.final_velocity_ms:.0f} m/s")
-        self.logger.info(f"Time to apoapsis: {results.time_to_apoapsis:.1f} s")
+        self.logger.info("Max altitude: %.1f km", results.max_altitude_km)
+        self.logger.info("Final apoapsis: %.1f km", results.apoapsis_km)
+        self.logger.info("Final periapsis: %.1f km", results.periapsis_km)
+        self.logger.info("Final eccentricity: %.4f", results.eccentricity)
+        self.logger.info("Final velocity: %.0f m/s", results.final_velocity_ms)
+        self.logger.info("Time to apoapsis: %.1f s", results.time_to_apoapsis)
         self.logger.info("===================================")
     
     def run_automated_checks(self, mission_data: Dict) -> bool:
@@ -171,18 +285,20 @@ class PostFlightAnalyzer:
             import matplotlib.pyplot as plt
             
             # Extract time series data
-            times = mission_data.get('times', [])
-            velocities = mission_data.get('velocities', [])
-            flight_path_angles = mission_data.get('flight_path_angles', [])
+            telemetry = self._get_telemetry(mission_data)
             
-            if not times or not velocities:
+            if telemetry is None or telemetry.size == 0:
                 self.logger.warning("Insufficient data for plotting")
                 return
             
+            times = telemetry['t']
+            flight_path_angles = telemetry['fpa']
+            has_flight_path_angles = not np.isnan(flight_path_angles).all()
+            
             # Velocity vs Time plot
             plt.figure(figsize=(12, 8))
             plt.subplot(2, 1, 1)
-            plt.plot(times, velocities, 'b-', linewidth=2)
+            plt.plot(times, telemetry['v'], 'b-', linewidth=2)
             plt.xlabel('Time (s)')
             plt.ylabel('Velocity (m/s)')
             plt.title('Velocity vs Time')
@@ -190,7 +306,7 @@ class PostFlightAnalyzer:
             
             # Flight Path Angle plot
             plt.subplot(2, 1, 2)
-            if flight_path_angles:
+            if has_flight_path_angles:
                 plt.plot(times, flight_path_angles, 'r-', linewidth=2)
             plt.xlabel('Time (s)')
             plt.ylabel('Flight Path Angle (degrees)')
@@ -203,7 +319,7 @@ class PostFlightAnalyzer:
             
             # Separate flight path angle plot
             plt.figure(figsize=(10, 6))
-            if flight_path_angles:
+            if has_flight_path_angles:
                 plt.plot(times, flight_path_angles, 'r-', linewidth=2)
             plt.xlabel('Time (s)')
             plt.ylabel('Flight Path Angle (degrees)')
@@ -219,8 +335,12 @@ class PostFlightAnalyzer:
         except Exception as e:
             self.logger.error(f"Error generating plots: {e}")
     
-    def save_results_to_csv(self, results: MissionResults, filename: str = "sweep_results.csv"):
-        """Save analysis results to CSV file for parameter sweep"""
+    def save_results_to_csv(self, results: MissionResults, filename: str = "sweep_results.csv",
+                            telemetry_filename: Optional[str] = None):
+        """
+        Save analysis results to CSV file for parameter sweep
+        Optionally dump the full telemetry record array to telemetry_filename
+        """
         try:
             # Check if file exists to determine if we need headers
             file_exists = False
@@ -255,6 +375,11 @@ class PostFlightAnalyzer:
             
             self.logger.info(f"Results saved to {filename}")
             
+            if telemetry_filename and results.telemetry is not None:
+                np.savetxt(telemetry_filename, results.telemetry, fmt='%.6f', delimiter=',',
+                           header=','.join(TELEMETRY_DTYPE.names), comments='')
+                self.logger.info(f"Telemetry saved to {telemetry_filename}")
+            
         except Exception as e:
             self.logger.error(f"Error saving results to CSV: {e}")
 
@@ -26,8 +26,11 @@ class TrajectoryVisualizer:
                  config_file: str = "mission_config.json"):
         # データ読み込み
         try:
-            with open(results_file, "r") as f:
-                self.results = json.load(f)
+            if results_file.endswith(".npz"):
+                self.results = self._load_npz_results(results_file)
+            else:
+                with open(results_file, "r") as f:
+                    self.results = json.load(f)
         except FileNotFoundError:
             print(f"Error: {results_file} not found!")
             print("Please run 'python3 rocket_simulation.py' first to generate simulation data.")
@@ -80,6 +83,24 @@ class TrajectoryVisualizer:
         # 画像アセットを読み込み
         self.images = self._load_images()
     
+    @staticmethod
+    def _load_npz_results(results_file: str) -> Dict:
+        """--format npz の出力（履歴NPZ + 同名のサマリーJSON）を読み込み"""
+        with np.load(results_file) as data:
+            results = {
+                "time_history": data["time"],
+                "position_history": data["position"],
+                "velocity_history": data["velocity"],
+                "altitude_history": data["altitude"],
+                "mass_history": data["mass"],
+                "phase_history": data["phase"].tolist(),
+            }
+        summary_file = os.path.splitext(results_file)[0] + ".json"
+        if os.path.exists(summary_file):
+            with open(summary_file, "r") as f:
+                results = {**json.load(f), **results}
+        return results
+    
     def _load_images(self) -> Dict:
         """画像ファイルを読み込み"""
         images = {}
@@ -553,7 +574,7 @@ def main():
     """メインエントリーポイント"""
     parser = argparse.ArgumentParser(description='Rocket Trajectory Visualizer')
     parser.add_argument('--results', default='mission_results.json',
-                      help='Path to mission results file')
+                      help='Path to mission results file (.json, or .npz from --format npz)')
     parser.add_argument('--config', default='mission_config.json',
                       help='Path to mission config file')
     parser.add_argument('--mode', choices=['static', 'animate', 'analysis', 'all'],
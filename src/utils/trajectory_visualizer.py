@@ -21,6 +21,10 @@ def run_trajectory_analysis(duration=7*24*3600):
     
     return results, [], []
 
+def _xy_array(points) -> np.ndarray:
+    """(x, y) point history as an (N, 2) float array (empty history -> shape (0, 2))"""
+    return np.asarray(points, dtype=float).reshape(-1, 2)
+
 def create_trajectory_plots(trajectory_data, stage_events, phase_changes, save_filename='lunar_intercept_trajectory.png'):
     """Create comprehensive trajectory visualization including lunar intercept
     
@@ -34,13 +38,12 @@ def create_trajectory_plots(trajectory_data, stage_events, phase_changes, save_f
     # Convert to numpy arrays for easier handling
     time_arr = np.array(trajectory_data['time_history'])
     alt_arr = np.array(trajectory_data['altitude_history'])
-    vel_arr = np.array([np.sqrt(v[0]**2 + v[1]**2) for v in trajectory_data['velocity_history']])
-    x_arr = np.array([p[0] for p in trajectory_data['position_history']])
-    y_arr = np.array([p[1] for p in trajectory_data['position_history']])
+    vel_xy = _xy_array(trajectory_data['velocity_history'])
+    vel_arr = np.hypot(vel_xy[:, 0], vel_xy[:, 1])
+    x_arr, y_arr = _xy_array(trajectory_data['position_history']).T
     
     # Extract Moon trajectory data if available
-    moon_x_arr = np.array([p[0] for p in trajectory_data.get('moon_position_history', [])])
-    moon_y_arr = np.array([p[1] for p in trajectory_data.get('moon_position_history', [])])
+    moon_x_arr, moon_y_arr = _xy_array(trajectory_data.get('moon_position_history', [])).T
 
     # Create figure with subplots
     fig = plt.figure(figsize=(20, 14))
@@ -8,6 +8,13 @@ import numpy as np
 from rocket_simulation_main import Mission, create_saturn_v_rocket
 from trajectory_visualizer import create_trajectory_plots
 
+# Optional fast JSON encoder
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 def run_accelerated_mission():
     """Run mission with accelerated time parameters for quick visualization"""
     
@@ -46,8 +53,13 @@ def run_accelerated_mission():
     print("Trajectory plot saved as 'quick_mission_trajectory.png'")
     
     # Save results
-    with open("quick_mission_results.json", "w") as f:
-        json.dump(results, f, indent=2)
+    if ORJSON_AVAILABLE:
+        with open("quick_mission_results.json", "wb") as f:
+            f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        # Compact output avoids the pure-Python pretty printer on long histories
+        with open("quick_mission_results.json", "w") as f:
+            json.dump(results, f, separators=(",", ":"))
     print("Results saved to 'quick_mission_results.json'")
     
     return results
@@ -6,8 +6,31 @@ Uses a known good parameter set to test the improvements
 
 import subprocess
 import json
-import tempfile
+import csv
 import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
+
+# Optional fast JSON decoder (json.loads also accepts bytes)
+try:
+    import orjson as json_decoder
+except ImportError:
+    json_decoder = json
+
+try:
+    import pandas as pd
+    PANDAS_AVAILABLE = True
+except ImportError:
+    PANDAS_AVAILABLE = False
+
+# Simulator is invoked by absolute path since each run executes in its own directory
+SIM_SCRIPT = os.path.abspath('rocket_simulation_main.py')
+
+# Precompiled result-key extractors; fall back to per-key defaults on KeyError
+_get_summary = itemgetter('mission_success', 'max_altitude_km', 'final_phase')
+_get_tli = itemgetter('required_delta_v', 'available_delta_v', 'tli_ready')
 
 def create_test_config():
     """Create a test mission config with parameters that should work"""
@@ -29,117 +52,200 @@ def create_test_config():
     }
     return config
 
-def run_test_mission():
-    """Run a single test mission with good parameters"""
-    print("=== Running Test Mission with Optimized Parameters ===")
+# Auxiliary inputs the simulator reads from its working directory
+SIM_INPUT_FILES = ("saturn_v_config.json", "mission_flags.json", "engine_curve.json")
+
+def _prepare_workdir(config):
+    """Create an isolated run directory holding the mission config and simulator inputs"""
+    workdir = tempfile.mkdtemp(prefix="mission_run_")
+    for name in SIM_INPUT_FILES:
+        if os.path.exists(name):
+            shutil.copyfile(name, os.path.join(workdir, name))
+    with open(os.path.join(workdir, "mission_config.json"), 'wb') as f:
+        f.write(json.dumps(config, indent=2).encode())
+    return workdir
+
+def run_test_mission(config=None, workdir=None, verbose=True, keep_workdir=False):
+    """Run a single test mission in its own working directory.
     
-    # Create test config
-    config = create_test_config()
+    Each run gets a private directory so parallel runs don't stomp on
+    mission_config.json / mission_results.json. Returns the parsed results
+    dict, or {'mission_success': False} on failure.
     
-    # Write to temporary config file
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-        json.dump(config, f, indent=2)
-        temp_config = f.name
+    A directory created here is removed after the run unless keep_workdir is
+    set; a caller-supplied workdir is never removed. When the directory is
+    kept, its path is returned under '_workdir'.
+    """
+    if config is None:
+        config = create_test_config()
+    keep_workdir = keep_workdir or workdir is not None
+    if workdir is None:
+        workdir = _prepare_workdir(config)
+    log = print if verbose else (lambda *args, **kwargs: None)
+    log(f"=== Running Test Mission in {workdir} ===")
     
+    failed = {'mission_success': False}
+    if keep_workdir:
+        failed['_workdir'] = workdir
     try:
-        # Save original config if it exists
-        original_config = None
-        if os.path.exists("mission_config.json"):
-            with open("mission_config.json", 'r') as f:
-                original_config = json.load(f)
-        
-        # Copy our test config to mission_config.json
-        with open("mission_config.json", 'w') as f:
-            json.dump(config, f, indent=2)
+        # Run simulation, streaming output to disk rather than buffering it in memory
+        stdout_path = os.path.join(workdir, "sim_stdout.log")
+        stderr_path = os.path.join(workdir, "sim_stderr.log")
+        with open(stdout_path, 'wb') as stdout_log, open(stderr_path, 'wb') as stderr_log:
+            result = subprocess.run([
+                'python3', SIM_SCRIPT, '--fast'
+            ], stdout=stdout_log, stderr=stderr_log, timeout=300, cwd=workdir)
         
-        # Run simulation
-        result = subprocess.run([
-            'python3', 'rocket_simulation_main.py', '--fast'
-        ], capture_output=True, text=True, timeout=300)
-        
-        print(f"Return code: {result.returncode}")
+        log(f"Return code: {result.returncode}")
         if result.returncode != 0:
-            print("STDERR:", result.stderr)
-            return False
+            with open(stderr_path, 'r', errors='replace') as f:
+                log("STDERR:", f.read())
+            return failed
         
         # Check results
-        if os.path.exists("mission_results.json"):
-            with open("mission_results.json", 'r') as f:
-                results = json.load(f)
-            
+        results_path = os.path.join(workdir, "mission_results.json")
+        if not os.path.exists(results_path):
+            log("❌ No mission_results.json found")
+            return failed
+        
+        with open(results_path, 'rb') as f:
+            results = json_decoder.loads(f.read())
+        if keep_workdir:
+            results['_workdir'] = workdir
+        
+        try:
+            success, max_alt, final_phase = _get_summary(results)
+        except KeyError:
             success = results.get('mission_success', False)
             max_alt = results.get('max_altitude_km', 0)
             final_phase = results.get('final_phase', 'unknown')
+        
+        log(f"Mission Success: {success}")
+        log(f"Max Altitude: {max_alt:.1f} km") 
+        log(f"Final Phase: {final_phase}")
+        
+        # Check our improvements
+        if 'stage_fuel_remaining' in results:
+            stage_fuel = results['stage_fuel_remaining']
+            log(f"✅ Stage fuel data found")
             
-            print(f"Mission Success: {success}")
-            print(f"Max Altitude: {max_alt:.1f} km") 
-            print(f"Final Phase: {final_phase}")
-            
-            # Check our improvements
-            if 'stage_fuel_remaining' in results:
-                stage_fuel = results['stage_fuel_remaining']
-                print(f"✅ Stage fuel data found")
+            if 'stage3_percentage' in stage_fuel:
+                stage3_pct = stage_fuel['stage3_percentage']
+                tli_ready = stage_fuel.get('stage3_tli_ready', False)
+                log(f"Stage 3 fuel: {stage3_pct:.1f}% (TLI Ready: {tli_ready})")
                 
-                if 'stage3_percentage' in stage_fuel:
-                    stage3_pct = stage_fuel['stage3_percentage']
-                    tli_ready = stage_fuel.get('stage3_tli_ready', False)
-                    print(f"Stage 3 fuel: {stage3_pct:.1f}% (TLI Ready: {tli_ready})")
-                    
-                    if stage3_pct >= 30.0:
-                        print("✅ FUEL CONSERVATION SUCCESS: >30% Stage 3 fuel remaining!")
-                    else:
-                        print(f"⚠️  Fuel conservation needs improvement: {stage3_pct:.1f}% < 30%")
-            
-            if 'tli_analysis' in results:
-                tli = results['tli_analysis']
-                print(f"✅ TLI analysis found")
-                print(f"Required ΔV: {tli.get('required_delta_v', 0):.1f} m/s")
-                print(f"Available ΔV: {tli.get('available_delta_v', 0):.1f} m/s")
-                print(f"TLI Ready: {tli.get('tli_ready', False)}")
-            
-            return success
-        else:
-            print("❌ No mission_results.json found")
-            return False
+                if stage3_pct >= 30.0:
+                    log("✅ FUEL CONSERVATION SUCCESS: >30% Stage 3 fuel remaining!")
+                else:
+                    log(f"⚠️  Fuel conservation needs improvement: {stage3_pct:.1f}% < 30%")
+        
+        if 'tli_analysis' in results:
+            tli = results['tli_analysis']
+            try:
+                required_dv, available_dv, tli_ready = _get_tli(tli)
+            except KeyError:
+                required_dv = tli.get('required_delta_v', 0)
+                available_dv = tli.get('available_delta_v', 0)
+                tli_ready = tli.get('tli_ready', False)
+            log(f"✅ TLI analysis found")
+            log(f"Required ΔV: {required_dv:.1f} m/s")
+            log(f"Available ΔV: {available_dv:.1f} m/s")
+            log(f"TLI Ready: {tli_ready}")
+        
+        return results
             
     except subprocess.TimeoutExpired:
-        print("❌ Mission timed out")
-        return False
+        log("❌ Mission timed out")
+        return failed
     except Exception as e:
-        print(f"❌ Error: {e}")
-        return False
+        log(f"❌ Error: {e}")
+        return failed
     finally:
-        # Restore original config
-        if original_config:
-            with open("mission_config.json", 'w') as f:
-                json.dump(original_config, f, indent=2)
-        
-        # Clean up temp file
-        if os.path.exists(temp_config):
-            os.unlink(temp_config)
+        if not keep_workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+def _run_sweep_point(config):
+    """ProcessPoolExecutor worker: run one config quietly and flatten the summary"""
+    results = run_test_mission(config, verbose=False, keep_workdir=True)
+    stage_fuel = results.get('stage_fuel_remaining', {})
+    row = dict(config)
+    row.pop('abort_thresholds', None)
+    row.update({
+        'mission_success': results.get('mission_success', False),
+        'max_altitude_km': results.get('max_altitude_km', 0.0),
+        'final_phase': results.get('final_phase', 'unknown'),
+        'stage3_percentage': stage_fuel.get('stage3_percentage', float('nan')),
+        'workdir': results['_workdir'],
+    })
+    return row
 
-def check_burn_termination_logs():
+def run_parameter_sweep(config_list, output_file="quick_sweep_results.feather", max_workers=None):
+    """Run several mission configs concurrently and collect a summary table.
+    
+    Returns a pandas DataFrame when pandas is available, otherwise a list of dicts.
+    The table is written to feather (falls back to CSV without pyarrow).
+    """
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as ex:
+        rows = list(ex.map(_run_sweep_point, config_list))
+    
+    if not PANDAS_AVAILABLE:
+        return rows
+    
+    df = pd.DataFrame(rows)
+    if output_file:
+        try:
+            df.to_feather(output_file)
+        except ImportError:
+            df.to_csv(os.path.splitext(output_file)[0] + ".csv", index=False)
+    return df
+
+def _tail_log_rows(path, phase, limit=5, block_size=65536):
+    """Return the last `limit` CSV rows whose phase column matches, reading backward from EOF.
+    
+    Only as many 64 KiB blocks as needed are read; matching lines are decoded and
+    CSV-parsed at the end, in file order.
+    """
+    needle = phase.encode()
+    matches = []
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        end = f.tell()
+        carry = b''
+        while end > 0 and len(matches) < limit:
+            pos = max(0, end - block_size)
+            f.seek(pos)
+            chunk = f.read(end - pos) + carry
+            end = pos
+            lines = chunk.split(b'\n')
+            # First piece may be a partial line unless we reached the start of the file
+            carry = lines.pop(0) if pos > 0 else b''
+            for line in reversed(lines):
+                # Columns: phase is column 5, remaining_propellant is column 12
+                fields = line.split(b',')
+                if len(fields) > 12 and fields[5] == needle:
+                    matches.append(line)
+                    if len(matches) >= limit:
+                        break
+    
+    return list(csv.reader(line.decode(errors='replace').rstrip('\r') for line in reversed(matches)))
+
+def check_burn_termination_logs(workdir="."):
     """Check logs for evidence of improved burn termination"""
     print("\n=== Checking Burn Termination Logic ===")
     
     try:
-        with open("mission_log.csv", 'r') as f:
-            lines = f.readlines()
-        
-        # Look for circularization phase
-        circ_lines = [line for line in lines if 'circularization' in line.lower()]
+        # Only the tail is printed, so scan backward from EOF instead of reading the whole log
+        circ_tail = _tail_log_rows(os.path.join(workdir, "mission_log.csv"), 'circularization')
         
-        if circ_lines:
-            print(f"Found {len(circ_lines)} circularization log entries")
+        if circ_tail:
+            print(f"Showing last {len(circ_tail)} circularization log entries")
             
             # Check last few entries for fuel levels
-            for line in circ_lines[-5:]:
-                parts = line.strip().split(',')
-                if len(parts) > 12:  # remaining_propellant is column 12
-                    time = parts[0]
-                    fuel = parts[12]
-                    phase = parts[5]
-                    print(f"t={time}s, fuel={fuel}t, phase={phase}")
+            for row in circ_tail:
+                time = row[0]
+                fuel = row[12]
+                phase = row[5]
+                print(f"t={time}s, fuel={fuel}t, phase={phase}")
             
             return True
         else:
@@ -151,8 +257,9 @@ def check_burn_termination_logs():
         return False
 
 if __name__ == "__main__":
-    success = run_test_mission()
-    check_burn_termination_logs()
+    results = run_test_mission(keep_workdir=True)
+    success = results.get('mission_success', False)
+    check_burn_termination_logs(results['_workdir'])
     
     if success:
         print("\n🎉 Test mission completed successfully!")
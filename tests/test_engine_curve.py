@@ -319,6 +319,23 @@ def test_singleton_engine_model():
     assert model1 is model2, "get_engine_model should return singleton instance"
 
 
+def test_vacuum_performance_matches_splines():
+    """Test the precomputed above-150 km full-throttle values equal direct spline evaluation"""
+    curve_path = os.path.join(os.path.dirname(__file__), '..', 'config', 'engine_curve.json')
+    model = EnginePerformanceModel(curve_path)
+    direct = EnginePerformanceModel(curve_path)
+    direct._vacuum_performance = {}
+    
+    for stage_name in model.interpolators:
+        for altitude in (150000, 2e5, 1e7, 149000.0):
+            for throttle in (1.0, 0.7):
+                assert model.get_thrust(stage_name, altitude, throttle) == direct.get_thrust(stage_name, altitude, throttle)
+                assert (model.get_specific_impulse(stage_name, altitude, throttle)
+                        == direct.get_specific_impulse(stage_name, altitude, throttle))
+                assert (model.get_mass_flow_rate(stage_name, altitude, throttle)
+                        == direct.get_mass_flow_rate(stage_name, altitude, throttle))
+
+
 if __name__ == "__main__":
     # Run tests directly
     import sys
@@ -376,4 +393,4 @@ if __name__ == "__main__":
         sys.exit(1)
     except Exception as e:
         print(f"💥 Test error: {e}")
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the array-backed mission history buffers
+"""
+
+import unittest
+import numpy as np
+
+from history_buffer import HistoryBuffer, VectorHistory, PhaseHistory
+from vehicle import Vector3, MissionPhase
+
+
+class TestHistoryBuffer(unittest.TestCase):
+    """Test suite for HistoryBuffer, VectorHistory and PhaseHistory"""
+
+    def test_append_grows_past_capacity(self):
+        """Test appends beyond the initial capacity keep all entries"""
+        history = HistoryBuffer(capacity=2)
+        for value in range(5):
+            history.append(value * 0.1)
+
+        self.assertEqual(len(history), 5)
+        self.assertEqual(history[-1], 0.4)
+        self.assertEqual(history.tolist(), [0.0, 0.1, 0.2, 0.30000000000000004, 0.4])
+
+    def test_vector_history_returns_independent_vectors(self):
+        """Test recorded vectors are copies, not views into the buffer"""
+        history = VectorHistory(capacity=1)
+        history.append(Vector3(1.0, 2.0, 3.0))
+        history.append(Vector3(4.0, 5.0, 6.0))
+
+        last = history[-1]
+        last.data[0] = 99.0
+
+        self.assertIsInstance(last, Vector3)
+        np.testing.assert_array_equal(history.array, [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]])
+
+    def test_phase_history_round_trip_and_count(self):
+        """Test phases are stored as codes and decoded back to MissionPhase"""
+        history = PhaseHistory()
+        for phase in (MissionPhase.LAUNCH, MissionPhase.LEO, MissionPhase.LEO):
+            history.append(phase)
+
+        self.assertEqual(history.array.dtype, np.int8)
+        self.assertEqual(list(history), [MissionPhase.LAUNCH, MissionPhase.LEO, MissionPhase.LEO])
+        self.assertEqual(history.count(MissionPhase.LEO), 2)
+        self.assertEqual(history.count(MissionPhase.FAILED), 0)
+        self.assertEqual(history.tolist(), ["launch", "leo", "leo"])
+
+    def test_phase_count_matches_history_scan(self):
+        """Test the running per-phase counter agrees with a full scan after growth"""
+        history = PhaseHistory(capacity=4)
+        phases = [MissionPhase.LEO, MissionPhase.TLI_BURN, MissionPhase.COAST_TO_MOON] * 7
+        for phase in phases:
+            history.append(phase)
+
+        for phase in MissionPhase:
+            self.assertEqual(history.count(phase), len([p for p in history if p == phase]))
+
+    def test_phase_append_repeated_matches_appends(self):
+        """Test a bulk append of one phase matches the same number of single appends"""
+        bulk, single = PhaseHistory(capacity=2), PhaseHistory(capacity=2)
+        for history in (bulk, single):
+            history.append(MissionPhase.TLI_BURN)
+        bulk.append_repeated(MissionPhase.COAST_TO_MOON, 9)
+        bulk.append_repeated(MissionPhase.COAST_TO_MOON, 0)
+        for _ in range(9):
+            single.append(MissionPhase.COAST_TO_MOON)
+
+        np.testing.assert_array_equal(bulk.array, single.array)
+        self.assertEqual(bulk.count(MissionPhase.COAST_TO_MOON), 9)
+
+    def test_phase_append_repeated_grows_only_when_full(self):
+        """Test repeated bulk appends keep amortized capacity instead of doubling every call"""
+        history = PhaseHistory(capacity=16)
+        for _ in range(1000):
+            history.append_repeated(MissionPhase.COAST_TO_MOON, 99)
+
+        self.assertEqual(len(history), 99000)
+        self.assertLess(len(history._data), 2 * 99000)
+
+    def test_phase_tolist_stride_keeps_last_entry(self):
+        """Test strided decoding matches slicing the full value list"""
+        history = PhaseHistory(capacity=4)
+        phases = [MissionPhase.LAUNCH, MissionPhase.GRAVITY_TURN, MissionPhase.LEO] * 5
+        for phase in phases:
+            history.append(phase)
+        values = [phase.value for phase in phases]
+
+        self.assertEqual(history.tolist(4), values[:-1:4] + values[-1:])
+        self.assertEqual(history.tolist(1), values)
+        self.assertEqual(PhaseHistory().tolist(4), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,537 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Mission integration helpers
+"""
+
+import unittest
+import os
+import tempfile
+import csv
+import json
+import shutil
+import numpy as np
+
+from rocket_simulation_main import Mission, simulate_batch, _save_trajectory_npz, _moon_position, _patched_conic_gravity, _quadratic_drag, _rk4_substate, _rk4_combine, _legacy_atmospheric_density, G, M_EARTH, R_EARTH, R_MOON, EARTH_MOON_DIST, MOON_ORBIT_PERIOD
+from vehicle import create_saturn_v_rocket, Vector3, MissionPhase
+
+
+class TestMissionIntegration(unittest.TestCase):
+    """Test suite for the coast propagator and atmosphere lookup"""
+
+    def setUp(self):
+        """Set up a mission in a circular 200 km parking orbit"""
+        self._cwd = os.getcwd()
+        self._tmpdir = tempfile.TemporaryDirectory()
+        os.chdir(self._tmpdir.name)
+        self.mission = Mission(create_saturn_v_rocket(), {"target_parking_orbit": 200e3})
+        r = R_EARTH + 200e3
+        self.mission.rocket.position = Vector3(r, 0, 0)
+        self.mission.rocket.velocity = Vector3(0, np.sqrt(G * M_EARTH / r), 0)
+        self.mission.rocket.phase = MissionPhase.COAST_TO_MOON
+
+    def tearDown(self):
+        self.mission.csv_file.close()
+        os.chdir(self._cwd)
+        self._tmpdir.cleanup()
+
+    def _specific_energy(self):
+        r = self.mission.rocket.position.magnitude()
+        v = self.mission.rocket.velocity.magnitude()
+        return 0.5 * v**2 - G * M_EARTH / r
+
+    def test_propagate_coast_conserves_orbit(self):
+        """Test adaptive coast propagation keeps a circular orbit circular"""
+        energy_before = self._specific_energy()
+        period = 2 * np.pi * np.sqrt((R_EARTH + 200e3)**3 / (G * M_EARTH))
+
+        sol = self.mission.propagate_coast(period)
+
+        self.assertTrue(sol.success)
+        self.assertAlmostEqual(self.mission.time, period)
+        # Far fewer RHS evaluations than fixed-step RK4 at dt=0.1 (4 per step)
+        self.assertLess(sol.nfev, 4 * period / 0.1 / 10)
+        self.assertAlmostEqual(self.mission.get_altitude(), 200e3, delta=1e3)
+        self.assertAlmostEqual(self._specific_energy(), energy_before, delta=abs(energy_before) * 1e-4)
+
+    def test_propagate_coast_stops_at_earth_impact(self):
+        """Test the Earth impact event terminates propagation"""
+        self.mission.rocket.velocity = Vector3(-100.0, 0, 0)
+
+        sol = self.mission.propagate_coast(3600.0)
+
+        self.assertEqual(sol.status, 1)
+        self.assertLess(self.mission.time, 3600.0)
+        self.assertAlmostEqual(self.mission.get_altitude(), 0.0, delta=1.0)
+
+    def test_propagate_coast_can_leave_clock_to_caller(self):
+        """Test advance_clock=False moves the state and Moon but not the mission clock"""
+        moon_before = self.mission.moon.position.data.copy()
+
+        self.mission.propagate_coast(600.0, advance_clock=False)
+
+        self.assertEqual(self.mission.time, 0.0)
+        self.assertFalse(np.allclose(self.mission.moon.position.data, moon_before))
+        self.assertAlmostEqual(self.mission.get_altitude(), 200e3, delta=1e3)
+
+    def test_ballistic_coast_requires_coast_phase_above_atmosphere(self):
+        """Test the adaptive coast gate: COAST_TO_MOON, engine off, above the drag cutoff"""
+        self.assertTrue(self.mission._is_ballistic_coast(1e5, 200e3))
+        self.assertFalse(self.mission._is_ballistic_coast(1e5, 100e3))
+        self.assertFalse(self.mission._is_ballistic_coast(0.0, 200e3))  # stage still burning
+        self.mission.rocket.phase = MissionPhase.LEO
+        self.assertFalse(self.mission._is_ballistic_coast(1e5, 200e3))
+
+    def test_coast_jacobian_matches_finite_differences(self):
+        """Test the analytical Jacobian against central differences of the RHS"""
+        y = np.concatenate([self.mission.rocket.position.data, self.mission.rocket.velocity.data])
+        moon_x, moon_y = self.mission.moon.position.x, self.mission.moon.position.y
+
+        jac = self.mission._coast_jacobian(y, moon_x, moon_y)
+
+        for j in range(3):
+            step = np.zeros(6)
+            step[j] = 10.0
+            plus = np.array(self.mission._coast_acceleration(y + step, moon_x, moon_y))
+            minus = np.array(self.mission._coast_acceleration(y - step, moon_x, moon_y))
+            np.testing.assert_allclose(jac[3:, j], (plus - minus) / 20.0, rtol=1e-5, atol=1e-12)
+        np.testing.assert_array_equal(jac[:3, 3:], np.eye(3))
+
+    def test_propagate_coast_implicit_method_uses_jacobian(self):
+        """Test implicit solvers are handed the analytical Jacobian"""
+        sol = self.mission.propagate_coast(600.0, method='Radau')
+
+        self.assertTrue(sol.success)
+        self.assertGreater(sol.njev, 0)
+        self.assertAlmostEqual(self.mission.get_altitude(), 200e3, delta=1e3)
+
+    def test_propagate_coast_symplectic_conserves_orbit(self):
+        """Test leapfrog and SABA2 coasts keep the circular orbit and advance the clock"""
+        energy_before = self._specific_energy()
+        period = 2 * np.pi * np.sqrt((R_EARTH + 200e3)**3 / (G * M_EARTH))
+        state = (self.mission.rocket.position, self.mission.rocket.velocity)
+
+        for method in ('leapfrog', 'SABA2'):
+            self.mission.rocket.position, self.mission.rocket.velocity = state
+            self.mission.time = 0.0
+
+            sol = self.mission.propagate_coast(period, method=method)
+
+            self.assertEqual(sol.status, 0)
+            self.assertAlmostEqual(self.mission.time, period)
+            self.assertAlmostEqual(self.mission.get_altitude(), 200e3, delta=1e3)
+            self.assertAlmostEqual(self._specific_energy(), energy_before, delta=abs(energy_before) * 1e-6)
+
+    def test_propagate_coast_symplectic_stops_at_earth_impact(self):
+        """Test the symplectic coast stops on the step that reaches the surface"""
+        self.mission.rocket.velocity = Vector3(-100.0, 0, 0)
+
+        sol = self.mission.propagate_coast(3600.0, method='SABA2')
+
+        self.assertEqual(sol.status, 1)
+        self.assertLess(self.mission.time, 3600.0)
+        self.assertAlmostEqual(self.mission.get_altitude(), 0.0, delta=200.0)
+
+    def test_density_table_matches_model(self):
+        """Test the log-density table reproduces the atmosphere model, including layer boundaries"""
+        altitudes = np.concatenate([
+            np.random.default_rng(0).uniform(0.0, 300e3, 2000),
+            [0.0, 11000.0, 20000.0, 32000.0, 47000.0, 51000.0, 71000.0, 71050.0, 84852.0, 299999.0],
+        ])
+        for altitude in altitudes:
+            expected = self.mission._model_atmospheric_density(altitude)
+            self.assertAlmostEqual(self.mission._calculate_atmospheric_density(altitude) / expected, 1.0, delta=1e-5)
+
+    def test_density_outside_table_uses_model(self):
+        """Test altitudes outside the table, including the vacuum shortcut, agree with the model"""
+        for altitude in (-50.0, 300e3, 999e3, 5e6, 3.8e8):
+            self.assertEqual(self.mission._calculate_atmospheric_density(altitude),
+                             self.mission._model_atmospheric_density(altitude))
+
+    def test_failing_atmosphere_model_falls_back_once(self):
+        """Test a model error switches to the legacy density and the model is not retried"""
+        calls = []
+
+        class BrokenModel:
+            def get_density(self, altitude, latitude, longitude):
+                calls.append(altitude)
+                raise RuntimeError("msis offline")
+
+        self.mission._atmosphere_model = BrokenModel()
+        first = self.mission._model_atmospheric_density(50e3)
+
+        self.assertEqual(first, _legacy_atmospheric_density(50e3))
+        self.assertEqual(self.mission._model_atmospheric_density(50e3), first)
+        self.assertEqual(calls, [50e3])
+
+    def test_moon_position_follows_circular_orbit(self):
+        """Test the Moon stays on its circular orbit with velocity tangent to it"""
+        for _ in range(1000):
+            self.mission._update_moon_position(60.0)
+
+        angle = 2 * np.pi * 60000.0 / MOON_ORBIT_PERIOD
+        moon = self.mission.moon
+        np.testing.assert_allclose(moon.position.data,
+                                   [EARTH_MOON_DIST * np.cos(angle), EARTH_MOON_DIST * np.sin(angle), 0.0],
+                                   rtol=1e-12, atol=1e-3)
+        self.assertAlmostEqual(moon.position.data @ moon.velocity.data, 0.0, delta=1e-3)
+        np.testing.assert_array_equal(moon.position.data[:2], _moon_position(60000.0))
+
+    def test_coast_acceleration_is_gravity_only(self):
+        """Test an unpowered step above the drag cutoff returns gravity without touching mass"""
+        mission = self.mission
+        mission.rocket.get_current_mass = None  # must not be consulted on the coast path
+        position = mission.rocket.position
+
+        acceleration = mission._calculate_total_acceleration(1e5)
+
+        mission._set_moon_time(1e5)  # the RHS evaluates the Moon at the requested time
+        expected = (mission.earth.get_gravitational_acceleration(position)
+                    + mission.moon.get_gravitational_acceleration(position) * 0.1)
+        np.testing.assert_array_equal(acceleration.data, expected.data)
+
+    def test_patched_conic_gravity_matches_body_model(self):
+        """Test the gravity kernel against the CelestialBody dominant-body weighting"""
+        earth, moon = self.mission.earth, self.mission.moon
+        for offset in (Vector3(-EARTH_MOON_DIST + 7e6, 0, 1e5), Vector3(-2e7, 3e7, 0), Vector3(-3e6, 1e6, 2e5)):
+            position = moon.position + offset
+            dominant = earth.get_dominant_body(position, moon)
+            g_earth = earth.get_gravitational_acceleration(position)
+            g_moon = moon.get_gravitational_acceleration(position)
+            if dominant is earth:
+                expected = g_earth + g_moon * 0.1
+            else:
+                earth_factor = min(1.0, (2 * R_EARTH / position.magnitude())**2)
+                expected = g_moon + g_earth * earth_factor
+
+            *acceleration, earth_dominant = _patched_conic_gravity(*position.data, *moon.position.data,
+                                                                   moon.soi_radius)
+
+            self.assertEqual(earth_dominant, dominant is earth)
+            np.testing.assert_allclose(acceleration, expected.data, rtol=1e-12)
+
+    def test_body_gravity_uses_precomputed_mu(self):
+        """Test the cached G·M and the point-mass law outside and inside the body"""
+        earth = self.mission.earth
+        self.assertEqual(earth.mu, G * M_EARTH)
+        outside, inside = Vector3(3e6, -4e6, 5e6), Vector3(1e6, 2e6, -2e6)
+        r = outside.magnitude()
+        np.testing.assert_allclose(earth.get_gravitational_acceleration(outside).data,
+                                   (outside * (-G * M_EARTH / r**3)).data, rtol=1e-14)
+        surface_g = G * M_EARTH / R_EARTH**2
+        self.assertAlmostEqual(earth.get_gravitational_acceleration(inside).magnitude() / surface_g, 1.0, places=12)
+
+    def test_log_stride_downsamples_histories_and_csv(self):
+        """Test log_stride sets the history and CSV cadence, keeping the final sample"""
+        mission = Mission(create_saturn_v_rocket(), {"log_stride": 10})
+        results = mission.simulate(duration=5.0, dt=0.1)
+
+        self.assertEqual(len(results["time_history"]), 6)  # steps 0, 10, ..., 40 + final record at t=5
+        self.assertEqual(len(results["phase_history"]), len(results["time_history"]))
+        self.assertAlmostEqual(results["time_history"][1], 1.0)
+        self.assertEqual(results["time_history"][-1], 5.0)
+        with open(mission.csv_file.name) as f:
+            self.assertEqual(sum(1 for _ in f), 1 + 5)
+
+    def test_buffered_csv_rows_survive_a_failing_run(self):
+        """Test rows still in the CSV buffer reach the file when the loop raises"""
+        mission = Mission(create_saturn_v_rocket(), {"log_stride": 1})
+
+        def fail_after_one_second():
+            if mission.current_time >= 1.0:
+                raise RuntimeError("boom")
+        mission.check_leo_success = fail_after_one_second
+
+        with self.assertRaises(RuntimeError):
+            mission.simulate(duration=5.0, dt=0.1)
+        with open(mission.csv_file.name) as f:
+            self.assertEqual(sum(1 for _ in f), 1 + 11)  # steps at t = 0.0 ... 1.0
+        mission.csv_file.close()
+
+    def test_npz_log_matches_csv_columns(self):
+        """Test log_format="npz" writes the CSV columns as numeric arrays instead of a text CSV"""
+        csv_mission = Mission(create_saturn_v_rocket(), {"log_stride": 10})
+        csv_mission.simulate(duration=5.0, dt=0.1)
+        with open(csv_mission.csv_file.name) as f:
+            rows = list(csv.reader(f))
+        mission = Mission(create_saturn_v_rocket(), {"log_stride": 10, "log_format": "npz"})
+        mission.simulate(duration=5.0, dt=0.1)
+
+        self.assertIsNone(mission.csv_file)
+        with np.load("mission_log.npz") as log:
+            self.assertEqual(list(rows[0]), list(log.files))
+            self.assertEqual(log["stage"].dtype, np.int64)
+            self.assertEqual(log["phase"].tolist(), [row[5] for row in rows[1:]])
+            for column, name in ((0, "time"), (1, "altitude"), (3, "mass")):
+                np.testing.assert_allclose(log[name], [float(row[column]) for row in rows[1:]], atol=0.05)
+
+    def test_moon_position_history_follows_recorded_times(self):
+        """Test the Moon history is the circular-orbit position at each recorded time"""
+        mission = Mission(create_saturn_v_rocket(), {"log_stride": 10})
+        results = mission.simulate(duration=5.0, dt=0.1)
+
+        self.assertEqual(len(results["moon_position_history"]), len(results["time_history"]))
+        for t, moon_xy in zip(results["time_history"], results["moon_position_history"]):
+            np.testing.assert_allclose(moon_xy, _moon_position(t), rtol=1e-12)
+        np.testing.assert_allclose(results["moon_position_history"][-1], mission.moon.position.data[:2], rtol=1e-12)
+
+    def test_leo_success_check_reuses_unchanged_orbital_state(self):
+        """Test check_leo_success only re-evaluates after the orbital monitor recomputes its state"""
+        monitor = self.mission.orbital_monitor
+        self.mission.rocket.phase = MissionPhase.LEO
+        monitor.update_state(self.mission.rocket.position, self.mission.rocket.velocity, 1.0)
+        self.assertTrue(self.mission.check_leo_success())
+
+        monitor.is_orbit_circular = lambda tolerance_km=None: False
+        monitor.update_state(self.mission.rocket.position, self.mission.rocket.velocity, 1.05)  # too soon: no update
+        self.assertTrue(self.mission.check_leo_success())
+
+        monitor.update_state(self.mission.rocket.position, self.mission.rocket.velocity, 2.0)
+        self.assertFalse(self.mission.check_leo_success())
+
+    def test_phase_update_dispatches_to_current_phase_handler(self):
+        """Test only the current phase's handler runs and unhandled phases are left alone"""
+        self.mission.rocket.phase = MissionPhase.GRAVITY_TURN
+        self.mission._update_mission_phase()
+        self.assertEqual(self.mission.rocket.phase, MissionPhase.GRAVITY_TURN)
+
+        self.mission.moon.position = self.mission.rocket.position - Vector3(R_MOON + 500.0, 0, 0)
+        self.mission.rocket.phase = MissionPhase.TERMINAL_DESCENT
+        self.mission._update_mission_phase()
+        self.assertEqual(self.mission.rocket.phase, MissionPhase.LUNAR_TOUCHDOWN)
+
+    def test_orbital_elements_memo_follows_state(self):
+        """Test repeated queries on one state reuse the result and a state change recomputes it"""
+        first = self.mission.get_orbital_elements()
+        self.assertIs(self.mission.get_orbital_elements(), first)
+
+        self.mission.rocket.velocity.data[1] += 100.0
+        raised = self.mission.get_orbital_elements()
+
+        self.assertGreater(raised[0], first[0])
+        self.assertEqual(raised, self.mission.get_orbital_elements(
+            (self.mission.rocket.position.magnitude(), self.mission.rocket.velocity.magnitude(), 0.0)))
+
+    def test_circularization_start_uses_step_time(self):
+        """Test the CIRCULARIZATION handler stamps the burn start with the step context time"""
+        self.mission.rocket.phase = MissionPhase.CIRCULARIZATION
+
+        self.mission._update_mission_phase(self.mission._step_context(42.0))
+
+        self.assertEqual(self.mission.circularization_start_time, 42.0)
+        self.assertEqual(self.mission.rocket.phase, MissionPhase.CIRCULARIZATION)
+
+    def test_moon_relative_state_matches_vector_form(self):
+        """Test the scalar lunar-frame |r|^2, |v|^2 and r.v agree with Vector3 arithmetic"""
+        self.mission.rocket.position = self.mission.moon.position + Vector3(2000e3, -500e3, 30e3)
+        self.mission.rocket.velocity = self.mission.moon.velocity + Vector3(-300.0, 1500.0, 10.0)
+        rel_pos = self.mission.rocket.position - self.mission.moon.position
+        rel_vel = self.mission.rocket.velocity - self.mission.moon.velocity
+
+        r_sq, v_sq, radial_dot = self.mission._moon_relative_state()
+
+        self.assertAlmostEqual(np.sqrt(r_sq), rel_pos.magnitude(), places=6)
+        self.assertAlmostEqual(np.sqrt(v_sq), rel_vel.magnitude(), places=9)
+        self.assertAlmostEqual(radial_dot / np.sqrt(r_sq), rel_vel.dot(rel_pos.normalized()), places=9)
+
+    def test_lunar_touchdown_checks_descent_direction(self):
+        """Test a slow vertical touchdown lands and a slow sideways one is rejected for tilt"""
+        moon = self.mission.moon
+        for relative_velocity, expected in ((Vector3(-1.0, 0, 0), MissionPhase.LANDED),
+                                            (Vector3(0, 1.0, 0), MissionPhase.FAILED)):
+            self.mission.rocket.phase = MissionPhase.TERMINAL_DESCENT
+            self.mission.rocket.position = moon.position + Vector3(R_MOON + 50.0, 0, 0)
+            self.mission.rocket.velocity = moon.velocity + relative_velocity
+
+            self.assertFalse(self.mission._check_mission_status())
+            self.assertEqual(self.mission.rocket.phase, expected)
+
+    def test_terminal_phase_ends_mission_without_further_checks(self):
+        """Test a handler-set LANDED stops the loop and is not overwritten by later status checks"""
+        moon = self.mission.moon
+        self.mission.rocket.phase = MissionPhase.LANDED
+        self.mission.rocket.position = moon.position + Vector3(R_MOON + 500.0, 0, 0)
+        self.mission.rocket.velocity = moon.velocity + Vector3(-50.0, 0, 0)
+
+        self.assertFalse(self.mission._check_mission_status())
+        self.assertEqual(self.mission.rocket.phase, MissionPhase.LANDED)
+
+    def test_coast_to_moon_detects_lunar_soi_entry(self):
+        """Test the COAST_TO_MOON handler passes km arrays to the SOI check and switches to LOI"""
+        self.mission._update_mission_phase()
+        self.assertEqual(self.mission.rocket.phase, MissionPhase.COAST_TO_MOON)
+
+        self.mission.rocket.position = self.mission.moon.position + Vector3(50000e3, 0, 0)
+        self.mission._update_mission_phase()
+        self.assertEqual(self.mission.rocket.phase, MissionPhase.LOI_BURN)
+
+    def test_step_context_reuse_matches_fresh_acceleration(self):
+        """Test the k1 acceleration from a StepContext equals a from-scratch evaluation, and stale mass is recomputed"""
+        self.mission.rocket.position = Vector3(R_EARTH + 5e3, 0, 0)
+        self.mission.rocket.velocity = Vector3(300.0, 50.0, 0)
+        self.mission.rocket.phase = MissionPhase.LAUNCH
+        context = self.mission._step_context(20.0)
+        context.mass = self.mission.rocket.get_current_mass(20.0, context.altitude)
+
+        self.assertEqual(context.altitude, self.mission.get_altitude())
+        np.testing.assert_array_equal(self.mission._calculate_total_acceleration(20.0, context=context).data,
+                                      self.mission._calculate_total_acceleration(20.0).data)
+
+        context.mass = None
+        np.testing.assert_array_equal(self.mission._calculate_total_acceleration(20.0, context=context).data,
+                                      self.mission._calculate_total_acceleration(20.0).data)
+
+    def test_guidance_target_state_is_reused_until_target_changes(self):
+        """Test the guidance target dict is built once and rebuilt when the LEO target altitude changes"""
+        target = self.mission._guidance_target_state()
+        self.assertIs(self.mission._guidance_target_state(), target)
+        self.assertEqual(target['target_apoapsis'], self.mission.leo_target_altitude + R_EARTH)
+
+        self.mission.leo_target_altitude = 250e3
+        self.assertEqual(self.mission._guidance_target_state(),
+                         {'target_apoapsis': 250e3 + R_EARTH, 'target_altitude': 250e3})
+
+    def test_flight_path_angle_from_state(self):
+        """Test the flight path angle kernel via the mission state: level, climbing and at rest"""
+        self.assertAlmostEqual(self.mission.get_flight_path_angle(), 0.0)
+        self.mission.rocket.velocity = Vector3(100.0, 100.0, 0.0)
+        self.assertAlmostEqual(self.mission.get_flight_path_angle(), np.pi / 4)
+        self.mission.rocket.velocity = Vector3(0.0, 0.0, 0.0)
+        self.assertEqual(self.mission.get_flight_path_angle(), 0.0)
+
+    def test_rk4_kernels_match_vector_formula(self):
+        """Test the scalar RK4 kernels against the array expressions they replace"""
+        rng = np.random.default_rng(1)
+        y0, k1, k2, k3, k4 = rng.normal(size=(5, 6)) * 1e3
+        stage = np.empty(6)
+
+        _rk4_substate(y0, k1, 0.05, stage)
+        combined = _rk4_combine(y0, k1, k2, k3, k4, 0.1 / 6)
+
+        np.testing.assert_array_equal(stage, y0 + k1 * 0.05)
+        np.testing.assert_allclose(combined, y0 + (k1 + 2 * k2 + 2 * k3 + k4) * (0.1 / 6), rtol=1e-15)
+
+    def test_simulate_batch_matches_serial_runs_in_order(self):
+        """Test parallel batch runs return the same results as serial runs, in config order"""
+        configs = [{"simulation_duration": 2.0, "time_step": 0.1, "launch_azimuth": azimuth}
+                   for azimuth in (90, 72)]
+
+        batch = simulate_batch(configs, max_workers=2)
+
+        self.assertEqual(len(batch), 2)
+        for config, result in zip(configs, batch):
+            serial = Mission(create_saturn_v_rocket(), config).simulate(duration=2.0, dt=0.1)
+            self.assertEqual(result["position_history"], serial["position_history"])
+
+    def test_simulate_batch_reads_vehicle_config_from_caller_directory(self):
+        """Test batch workers fly the saturn_v_config.json of the calling directory, not the built-in defaults"""
+        config_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "config")
+        shutil.copy(os.path.join(config_dir, "saturn_v_config.json"), "saturn_v_config.json")
+        rocket = create_saturn_v_rocket("saturn_v_config.json")
+        with open("saturn_v_config.json") as f:
+            self.assertEqual(rocket.stages[0].thrust_sea_level, json.load(f)["stages"][0]["thrust_sea_level"])
+        self.assertNotEqual(rocket.total_mass, create_saturn_v_rocket("missing.json").total_mass)
+        config = {"simulation_duration": 2.0, "time_step": 0.1}
+
+        batch = simulate_batch([config, config], max_workers=2)
+
+        serial = Mission(rocket, config).simulate(duration=2.0, dt=0.1)
+        for result in batch:
+            self.assertAlmostEqual(result["mass_history"][0], rocket.total_mass)
+            self.assertEqual(result["position_history"], serial["position_history"])
+
+    def test_trajectory_npz_round_trip(self):
+        """Test the NPZ results format stores the histories losslessly"""
+        results = Mission(create_saturn_v_rocket(), {"log_stride": 10}).simulate(duration=2.0, dt=0.1)
+
+        _save_trajectory_npz(results, "results.npz")
+
+        with np.load("results.npz") as data:
+            self.assertEqual(data["time"].tolist(), results["time_history"])
+            self.assertEqual(data["position"].tolist(), results["position_history"])
+            self.assertEqual(data["mass"].tolist(), results["mass_history"])
+            self.assertEqual(data["phase"].tolist(), results["phase_history"])
+
+    def test_thrust_components_match_thrust_vector(self):
+        """Test the scalar thrust path agrees with the Vector3 accessor, and is zero when not thrusting"""
+        mission = Mission(create_saturn_v_rocket(), {})
+        mission.rocket.position = Vector3(R_EARTH + 1e3, 0, 0)
+        mass = mission.rocket.get_current_mass(5.0, 1e3)
+
+        components = mission._thrust_components(5.0, 1e3, mass)
+
+        self.assertGreater(np.linalg.norm(components), 0.0)
+        np.testing.assert_array_equal(mission.get_thrust_vector(5.0, 1e3, mass).data, components)
+        self.assertEqual(self.mission._thrust_components(1e5, 200e3), (0.0, 0.0, 0.0))
+
+    def test_mission_clock_is_compensated(self):
+        """Test the Kahan-compensated clock stays on steps * dt over many steps"""
+        for _ in range(100000):
+            self.mission.step(0.1)
+
+        self.assertEqual(self.mission.time, 10000.0)
+
+    def _simulate_parking_orbit_coast(self, adaptive_coast, duration):
+        """Run simulate() from an engine-off circular 200 km orbit in COAST_TO_MOON"""
+        mission = Mission(create_saturn_v_rocket(), {"target_parking_orbit": 200e3,
+                                                     "adaptive_coast": adaptive_coast})
+        update_phase = mission._update_mission_phase
+        coast_calls = []
+        propagate_coast = mission.propagate_coast
+
+        def start_in_orbit(context):
+            # simulate() 冒頭で発射台に戻されるため、最初のフェーズ更新で駐機軌道の慣性飛行へ置き換える
+            if mission.rocket.phase == MissionPhase.LAUNCH:
+                r = R_EARTH + 200e3
+                mission.rocket.position = Vector3(r, 0, 0)
+                mission.rocket.velocity = Vector3(0, np.sqrt(G * M_EARTH / r), 0)
+                mission.rocket.phase = MissionPhase.COAST_TO_MOON
+                for stage in mission.rocket.stages:
+                    stage.propellant_mass = 0.0
+                return
+            update_phase(context)
+
+        def counting_propagate_coast(*args, **kwargs):
+            coast_calls.append(args)
+            return propagate_coast(*args, **kwargs)
+
+        mission._update_mission_phase = start_in_orbit
+        mission.propagate_coast = counting_propagate_coast
+        results = mission.simulate(duration=duration, dt=0.1)
+        mission.csv_file.close()
+        return mission, results, len(coast_calls)
+
+    def test_simulate_adaptive_coast_matches_fixed_step(self):
+        """Test the default adaptive-coast path in simulate() tracks fixed-step RK4 on the same grid"""
+        adaptive, adaptive_results, adaptive_calls = self._simulate_parking_orbit_coast(True, 3600.0)
+        fixed, fixed_results, fixed_calls = self._simulate_parking_orbit_coast(False, 3600.0)
+
+        self.assertGreater(adaptive_calls, 0)
+        self.assertEqual(fixed_calls, 0)
+        # 時計・ステップ数（フェーズ履歴は1ステップ1記録）が固定刻みと一致する
+        self.assertEqual(adaptive.time, 3600.0)
+        self.assertEqual(adaptive.time, fixed.time)
+        self.assertEqual(len(adaptive.phase_history), len(fixed.phase_history))
+        self.assertEqual(adaptive_results["phase_history"], fixed_results["phase_history"])
+        # 記録は同じ10秒格子に揃い、各履歴の長さも一致する
+        self.assertEqual(adaptive_results["time_history"], fixed_results["time_history"])
+        self.assertEqual(adaptive_results["time_history"][-1], 3600.0)
+        for key in ("position_history", "velocity_history", "altitude_history"):
+            self.assertEqual(len(adaptive_results[key]), len(adaptive_results["time_history"]))
+        np.testing.assert_allclose(adaptive_results["position_history"], fixed_results["position_history"],
+                                   rtol=0, atol=1.0)  # coast_atol [m]
+        np.testing.assert_allclose(adaptive.rocket.position.data, fixed.rocket.position.data, rtol=0, atol=1.0)
+
+    def test_quadratic_drag_matches_vector_formula(self):
+        """Test the drag kernel against -(0.5 rho v^2 Cd A) v_hat / m"""
+        velocity = np.array([700.0, -120.0, 45.0])
+        density, drag_area, mass = 0.4, 0.3 * 80.0, 2.5e6
+        speed = np.linalg.norm(velocity)
+        expected = -(0.5 * density * speed**2 * drag_area) * velocity / speed / mass
+
+        np.testing.assert_allclose(_quadratic_drag(*velocity, density, drag_area, 1.0 / mass), expected, rtol=1e-14)
+        self.assertEqual(_quadratic_drag(0.0, 0.0, 0.0, density, drag_area, 1.0), (0.0, 0.0, 0.0))
+        self.assertEqual(_quadratic_drag(*velocity, 0.0, drag_area, 1.0), (0.0, 0.0, 0.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
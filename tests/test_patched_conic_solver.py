@@ -23,6 +23,13 @@ class TestPatchedConicSolver(unittest.TestCase):
         self.assertFalse(check_soi_transition(sc_pos_outside, moon_pos_eci), 
                          "Should return False when spacecraft is outside SOI")
 
+    def test_check_soi_transition_planar(self):
+        """Test the SOI check with 2-D position vectors."""
+        moon_pos_eci = np.array([384400, 0])
+
+        self.assertTrue(check_soi_transition(np.array([350000, 0]), moon_pos_eci))
+        self.assertFalse(check_soi_transition(np.array([300000, 0]), moon_pos_eci))
+
     def test_convert_to_lunar_frame(self):
         """Test the conversion of state vectors to the lunar frame."""
         # ECI state vectors
@@ -0,0 +1,126 @@
+import logging
+import os
+import tempfile
+import threading
+import unittest
+from logging.handlers import QueueHandler
+import numpy as np
+import post_flight_analysis
+from post_flight_analysis import PostFlightAnalyzer, TELEMETRY_DTYPE, build_telemetry, validate_batch
+
+class TestPostFlightAnalysis(unittest.TestCase):
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.analyzer = PostFlightAnalyzer()
+        self.mission_data = {
+            'final_apoapsis_km': 185.0,
+            'final_periapsis_km': 170.0,
+            'final_eccentricity': 0.001,
+            'max_altitude_km': 185.0,
+            'final_velocity_ms': 7800.0,
+            'stage3_propellant_remaining': 0.3,
+            'horizontal_velocity_at_220km': 7500.0,
+            'time_to_apoapsis': 45.0,
+            'times': [0.0, 10.0, 20.0],
+            'velocities': [0.0, 120.0, 260.0],
+            'flight_path_angles': [90.0, 88.5, 86.0]
+        }
+
+    def test_log_listener_started_once(self):
+        """Test repeated analyzers share one QueueListener and one QueueHandler."""
+        root = logging.getLogger()
+        saved_handlers = root.handlers[:]
+        saved_listener = post_flight_analysis._log_listener
+        root.handlers.clear()
+        post_flight_analysis._log_listener = None
+        threads_before = threading.active_count()
+        try:
+            with tempfile.TemporaryDirectory() as tmpdir:
+                cwd = os.getcwd()
+                os.chdir(tmpdir)
+                try:
+                    for _ in range(5):
+                        PostFlightAnalyzer()
+                finally:
+                    os.chdir(cwd)
+                queue_handlers = [h for h in root.handlers if isinstance(h, QueueHandler)]
+                self.assertEqual(len(queue_handlers), 1)
+                self.assertEqual(threading.active_count(), threads_before + 1)
+                post_flight_analysis._stop_log_listener()
+                self.assertIsNone(post_flight_analysis._log_listener)
+        finally:
+            root.handlers[:] = saved_handlers
+            post_flight_analysis._log_listener = saved_listener
+
+    def test_log_listener_skipped_when_root_configured(self):
+        """Test an already-configured root logger is left as is."""
+        root = logging.getLogger()
+        saved_handlers = root.handlers[:]
+        saved_listener = post_flight_analysis._log_listener
+        existing = logging.NullHandler()
+        root.handlers[:] = [existing]
+        post_flight_analysis._log_listener = None
+        try:
+            PostFlightAnalyzer()
+            self.assertEqual(root.handlers, [existing])
+            self.assertIsNone(post_flight_analysis._log_listener)
+        finally:
+            root.handlers[:] = saved_handlers
+            post_flight_analysis._log_listener = saved_listener
+
+    def test_build_telemetry(self):
+        """Test packing of parallel series into a telemetry record array."""
+        telemetry = build_telemetry([0.0, 1.0], [10.0, 20.0], [90.0, 89.0])
+
+        self.assertEqual(telemetry.dtype, TELEMETRY_DTYPE)
+        np.testing.assert_array_equal(telemetry['t'], [0.0, 1.0])
+        np.testing.assert_array_equal(telemetry['v'], [10.0, 20.0])
+        np.testing.assert_array_equal(telemetry['fpa'], [90.0, 89.0])
+
+    def test_build_telemetry_without_flight_path_angles(self):
+        """Test missing flight path angles are stored as NaN."""
+        telemetry = build_telemetry([0.0, 1.0], [10.0, 20.0])
+
+        self.assertTrue(np.isnan(telemetry['fpa']).all())
+
+    def test_analyze_mission_attaches_telemetry(self):
+        """Test mission analysis packs legacy time-series lists into telemetry."""
+        results = self.analyzer.analyze_mission(self.mission_data)
+
+        self.assertTrue(results.mission_success)
+        self.assertEqual(results.telemetry.size, 3)
+        np.testing.assert_array_equal(results.telemetry['v'], self.mission_data['velocities'])
+
+    def test_save_telemetry_to_csv(self):
+        """Test telemetry dump alongside sweep results."""
+        results = self.analyzer.analyze_mission(self.mission_data)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            results_file = os.path.join(tmpdir, 'sweep_results.csv')
+            telemetry_file = os.path.join(tmpdir, 'telemetry.csv')
+            self.analyzer.save_results_to_csv(results, results_file, telemetry_filename=telemetry_file)
+
+            loaded = np.loadtxt(telemetry_file, delimiter=',', skiprows=1)
+            np.testing.assert_allclose(loaded[:, 0], self.mission_data['times'])
+            np.testing.assert_allclose(loaded[:, 2], self.mission_data['flight_path_angles'])
+
+    def test_validate_batch_matches_per_mission_validation(self):
+        """Test batch validation agrees with the per-mission criteria."""
+        sweep = [
+            dict(self.mission_data),
+            dict(self.mission_data, final_periapsis_km=120.0),
+            dict(self.mission_data, final_eccentricity=0.08),
+            dict(self.mission_data, stage3_propellant_remaining=0.01),
+            dict(self.mission_data, horizontal_velocity_at_220km=7300.0),
+        ]
+        results = [self.analyzer.analyze_mission(data) for data in sweep]
+
+        success_mask = validate_batch(results)
+
+        self.assertEqual(success_mask.dtype, np.bool_)
+        self.assertEqual(success_mask.tolist(), [r.mission_success for r in results])
+        self.assertEqual(success_mask.tolist(), [True, False, False, False, False])
+
+if __name__ == '__main__':
+    unittest.main()
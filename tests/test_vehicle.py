@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Rocket mass bookkeeping
+"""
+
+import unittest
+import numpy as np
+
+from vehicle import create_saturn_v_rocket, MissionPhase, Vector3
+
+
+class TestRocketMass(unittest.TestCase):
+    """Test suite for Rocket.get_current_mass"""
+
+    def _expected_mass(self, rocket, current_time, altitude):
+        stages = rocket.stages
+        mass = rocket.payload_mass
+        mass += sum(s.total_mass for s in stages[rocket.current_stage + 1:])
+        mass += sum(s.dry_mass for s in stages[:rocket.current_stage])
+        stage = stages[rocket.current_stage]
+        return mass + stage.get_mass_at_time(current_time - rocket.stage_start_time, altitude)
+
+    def test_current_mass_tracks_stage_separation(self):
+        """Test the memoized fixed mass is rebuilt when the active stage changes"""
+        rocket = create_saturn_v_rocket()
+        self.assertAlmostEqual(rocket.get_current_mass(0.0, 0.0), rocket.total_mass)
+
+        for t in (60.0, 200.0, 400.0):
+            self.assertAlmostEqual(rocket.get_current_mass(t, 10e3), self._expected_mass(rocket, t, 10e3))
+            rocket.separate_stage(t)
+            self.assertAlmostEqual(rocket.get_current_mass(t, 10e3), self._expected_mass(rocket, t, 10e3))
+
+    def test_current_mass_follows_direct_stage_assignment(self):
+        """Test assigning current_stage directly invalidates the memo"""
+        rocket = create_saturn_v_rocket()
+        rocket.get_current_mass(0.0, 0.0)
+
+        rocket.current_stage = 2
+
+        self.assertAlmostEqual(rocket.get_current_mass(0.0, 0.0), self._expected_mass(rocket, 0.0, 0.0))
+
+
+class TestVector3(unittest.TestCase):
+    """Test suite for the Vector3 arithmetic helpers"""
+
+    def test_dot_matches_numpy(self):
+        """Test the scalar dot product agrees with the array product"""
+        a, b = Vector3(1.5, -2.0, 3.25), Vector3(-4.0, 5.5, 0.75)
+        self.assertAlmostEqual(a.dot(b), a.data @ b.data, places=12)
+
+    def test_arithmetic_returns_new_vectors(self):
+        """Test +, - and scalar * produce independent vectors with the expected components"""
+        a, b = Vector3(1.0, 2.0, 3.0), Vector3(0.5, 0.25, 0.125)
+
+        total, difference, scaled = a + b, a - b, a * 2.0
+
+        np.testing.assert_array_equal(total.data, [1.5, 2.25, 3.125])
+        np.testing.assert_array_equal(difference.data, [0.5, 1.75, 2.875])
+        np.testing.assert_array_equal(scaled.data, [2.0, 4.0, 6.0])
+        scaled.data[0] = 99.0
+        np.testing.assert_array_equal(a.data, [1.0, 2.0, 3.0])
+
+    def test_iadd_scaled_updates_in_place(self):
+        """Test iadd_scaled mutates the existing array and leaves the operand alone"""
+        a, b = Vector3(1.0, 2.0, 3.0), Vector3(0.5, -0.25, 2.0)
+        data = a.data
+
+        a.iadd_scaled(b, 4.0)
+
+        self.assertIs(a.data, data)
+        np.testing.assert_array_equal(a.data, [3.0, 1.0, 11.0])
+        np.testing.assert_array_equal(b.data, [0.5, -0.25, 2.0])
+
+
+class TestRocketThrusting(unittest.TestCase):
+    """Test suite for Rocket.is_thrusting"""
+
+    def test_is_thrusting_follows_phase_and_stage_changes(self):
+        """Test the memoized burning stage is rebuilt on phase changes and staging"""
+        rocket = create_saturn_v_rocket()
+        rocket.phase = MissionPhase.LAUNCH
+        self.assertTrue(rocket.is_thrusting(10.0, 0.0))
+        self.assertFalse(rocket.is_thrusting(rocket.stages[0].burn_time, 0.0))
+
+        rocket.phase = MissionPhase.LEO_STABLE
+        self.assertFalse(rocket.is_thrusting(10.0, 0.0))
+
+        rocket.phase = MissionPhase.GRAVITY_TURN
+        rocket.separate_stage(200.0)
+        self.assertTrue(rocket.is_thrusting(200.0 + rocket.stages[1].burn_time - 1.0, 0.0))
+
+        rocket.current_stage = len(rocket.stages)
+        self.assertFalse(rocket.is_thrusting(200.0, 0.0))
+
+
+if __name__ == '__main__':
+    unittest.main()